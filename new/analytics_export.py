@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""Columnar export of the journalist corpus for analysis (Parquet, pip3 install pyarrow).
+
+One Parquet file per table, every row keyed by ``journalist_id``:
+
+    journalists  one row per journalist: name, location, verified, pronouns, ...
+    locations    every location listing the journalist (registry.py ``locations``)
+    jobs         title, outlet, outlet_slug
+    beats        beat, beat_slug
+    outlets      outlet, outlet_slug, source (asSeenIn or asSeenInFull)
+    portfolio    title, link, date, outlet, description
+    awards       title, year, award_name, description
+    interviews   question, answer
+
+Records stream from the record store, one copy per journalist (the one the
+scrape-state index points at), and each table is flushed as a row group
+every ``--rows-per-group`` journalists, so memory stays bounded whatever the
+corpus size. Repetitive strings (locations, outlets, beats, ...) are
+dictionary-encoded both in the files and in the Arrow tables read back.
+
+    python3 analytics_export.py export [--out muckrack/analytics] [--location Pakistan]
+    python3 analytics_export.py query --beat Pakistan --outlet washpost --verified
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pc = pq = None
+
+from scrape_index import DATA_DIR, journalist_id_from_url, section_mask
+
+BASE_DIR = Path(__file__).parent.parent
+ANALYTICS_DIR = BASE_DIR / 'muckrack' / 'analytics'
+
+ROWS_PER_GROUP = 5000
+
+
+def _schemas() -> Dict:
+    """table -> Arrow schema; low-cardinality strings are dictionary columns"""
+    text = pa.string()
+    category = pa.dictionary(pa.int32(), pa.string())
+    key = ('journalist_id', text)
+    return {
+        'journalists': pa.schema([key, ('location', category), ('name', text), ('url', text),
+                                  ('verified', pa.bool_()), ('pronouns', category),
+                                  ('profile_location', category), ('avatar', text), ('intro', text),
+                                  ('covers', text), ('doesnt_cover', text), ('portfolio_count', pa.int32()),
+                                  ('sections', pa.int8()), ('scraped_at', text)]),
+        'locations': pa.schema([key, ('location', category)]),
+        'jobs': pa.schema([key, ('position', pa.int16()), ('title', category), ('outlet', category),
+                           ('outlet_slug', category)]),
+        'beats': pa.schema([key, ('beat', category), ('beat_slug', category)]),
+        'outlets': pa.schema([key, ('outlet', category), ('outlet_slug', category), ('source', category)]),
+        'portfolio': pa.schema([key, ('title', text), ('link', text), ('date', category),
+                                ('outlet', category), ('description', text)]),
+        'awards': pa.schema([key, ('title', text), ('year', category), ('award_name', category),
+                             ('description', text)]),
+        'interviews': pa.schema([key, ('question', category), ('answer', text)]),
+    }
+
+
+def slug(link: Optional[str]) -> Optional[str]:
+    """https://muckrack.com/media-outlet/washpost -> washpost"""
+    return link.rstrip('/').rsplit('/', 1)[-1] if isinstance(link, str) and link else None
+
+
+def _items(value) -> List[Dict]:
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+def flatten(location: str, data: Dict) -> Dict[str, List[Dict]]:
+    """One record -> rows for every table"""
+    url = data.get('url') or data.get('link') or ''
+    jid = journalist_id_from_url(url) if url else None
+    profile = data.get('profile') if isinstance(data.get('profile'), dict) else {}
+    rows = {'journalists': [{
+        'journalist_id': jid, 'location': location, 'name': profile.get('name') or data.get('name'),
+        'url': url or None, 'verified': bool(profile.get('verified')), 'pronouns': profile.get('pronouns'),
+        'profile_location': profile.get('location'), 'avatar': profile.get('avatar'),
+        'intro': profile.get('intro'), 'covers': profile.get('covers'),
+        'doesnt_cover': profile.get('doesnt_cover'),
+        'portfolio_count': data.get('portfolio_count') if isinstance(data.get('portfolio_count'), int) else None,
+        'sections': section_mask(data), 'scraped_at': data.get('scraped_at')}]}
+    # Set by registry.py dedupe; a record saved once is listed under its own location only
+    locations = [loc for loc in data.get('locations') or [] if isinstance(loc, str)] or [location]
+    rows['locations'] = [{'journalist_id': jid, 'location': loc} for loc in locations]
+    rows['jobs'] = [{'journalist_id': jid, 'position': i, 'title': job.get('title'), 'outlet': job.get('outlet'),
+                     'outlet_slug': slug(job.get('outletLink'))}
+                    for i, job in enumerate(_items(profile.get('jobs')))]
+    rows['beats'] = [{'journalist_id': jid, 'beat': beat.get('name'), 'beat_slug': slug(beat.get('link'))}
+                     for beat in _items(profile.get('beats'))]
+    rows['outlets'] = [{'journalist_id': jid, 'outlet': item.get('name'), 'outlet_slug': slug(item.get('link')),
+                        'source': 'asSeenIn'} for item in _items(profile.get('asSeenIn'))]
+    # as-seen-in.json entries (complete_missing_data.py) use view_url for the outlet page
+    rows['outlets'] += [{'journalist_id': jid, 'outlet': item.get('name') or item.get('title'),
+                         'outlet_slug': slug(item.get('link') or item.get('view_url')), 'source': 'asSeenInFull'}
+                        for item in _items(data.get('asSeenInFull'))]
+    rows['portfolio'] = [{'journalist_id': jid, **{k: item.get(k) for k in ('title', 'link', 'date', 'outlet',
+                                                                            'description')}}
+                         for item in _items(data.get('portfolio'))]
+    rows['awards'] = [{'journalist_id': jid, **{k: item.get(k) for k in ('title', 'year', 'award_name',
+                                                                         'description')}}
+                      for item in _items(data.get('awards'))]
+    rows['interviews'] = [{'journalist_id': jid, 'question': item.get('question'), 'answer': item.get('answer')}
+                          for item in _items(data.get('interviews'))]
+    return rows
+
+
+class TableWriter:
+    """Buffers rows for one table and appends them to its Parquet file as row groups
+
+    Rows go to ``{table}.parquet.tmp``; the finished file replaces the previous
+    export only on ``close()``, so an interrupted export leaves the old one intact.
+    """
+
+    def __init__(self, path: Path, schema):
+        self.path = path
+        self.tmp = path.with_name(path.name + '.tmp')
+        self.schema = schema
+        self.writer = pq.ParquetWriter(str(self.tmp), schema, compression='zstd')
+        self.buffer = {name: [] for name in schema.names}
+        self.rows = 0
+
+    def add(self, rows: List[Dict]):
+        for row in rows:
+            for name, column in self.buffer.items():
+                column.append(row.get(name))
+
+    def flush(self):
+        count = len(self.buffer['journalist_id'])
+        if not count:
+            return
+        table = pa.Table.from_arrays([pa.array(self.buffer[name], type=field.type)
+                                      for name, field in zip(self.schema.names, self.schema)],
+                                     schema=self.schema)
+        self.writer.write_table(table)
+        self.rows += count
+        for column in self.buffer.values():
+            column.clear()
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+        os.replace(self.tmp, self.path)
+
+    def discard(self):
+        self.writer.close()
+        self.tmp.unlink(missing_ok=True)
+
+
+def export(store, index, out_dir: Path = ANALYTICS_DIR, location: Optional[str] = None,
+           rows_per_group: int = ROWS_PER_GROUP) -> Dict:
+    """Stream one record per journalist of ``store`` into one Parquet file per table"""
+    if pa is None:
+        raise RuntimeError('Columnar export needs pyarrow: pip3 install pyarrow')
+    from record_lookup import iter_located
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    writers = {table: TableWriter(out_dir / f'{table}.parquet', schema) for table, schema in _schemas().items()}
+    journalists = 0
+    try:
+        for loc, _, data in iter_located(store, index, location):
+            for table, rows in flatten(loc, data).items():
+                writers[table].add(rows)
+            journalists += 1
+            if journalists % rows_per_group == 0:
+                for writer in writers.values():
+                    writer.flush()
+    except BaseException:
+        for writer in writers.values():
+            writer.discard()
+        raise
+    for writer in writers.values():
+        writer.close()
+    return {'journalists': journalists, 'seconds': time.perf_counter() - start,
+            'rows': {table: writer.rows for table, writer in writers.items()},
+            'bytes': sum((out_dir / f'{table}.parquet').stat().st_size for table in writers)}
+
+
+def _matching_ids(out_dir: Path, table: str, column: str, value: str):
+    """journalist_ids with a row whose ``{column}_slug`` or display name (any case) equals ``value``"""
+    rows = pq.read_table(out_dir / f'{table}.parquet', columns=['journalist_id', column, f'{column}_slug'])
+    hit = pc.or_(pc.equal(rows[f'{column}_slug'].cast(pa.string()), value),
+                 pc.equal(pc.utf8_lower(rows[column].cast(pa.string())), value.lower()))
+    return pc.unique(rows.filter(pc.fill_null(hit, False))['journalist_id'])
+
+
+def query(out_dir: Path = ANALYTICS_DIR, beat: Optional[str] = None, outlet: Optional[str] = None,
+          location: Optional[str] = None, verified: bool = False):
+    """Journalists matching every given filter
+
+    An outlet matches a job or an as-seen-in entry; a location matches any
+    location listing the journalist, not only the one it was saved under.
+    """
+    if pa is None:
+        raise RuntimeError('Querying the export needs pyarrow: pip3 install pyarrow')
+    journalists = pq.read_table(out_dir / 'journalists.parquet',
+                                columns=['journalist_id', 'name', 'location', 'verified', 'url'])
+    mask = pc.is_valid(journalists['journalist_id'])
+    if verified:
+        mask = pc.and_(mask, journalists['verified'])
+    if location:
+        listed = pq.read_table(out_dir / 'locations.parquet', columns=['journalist_id', 'location'])
+        ids = listed.filter(pc.equal(listed['location'].cast(pa.string()), location))['journalist_id']
+        mask = pc.and_(mask, pc.is_in(journalists['journalist_id'], value_set=pc.unique(ids)))
+    if beat:
+        mask = pc.and_(mask, pc.is_in(journalists['journalist_id'],
+                                      value_set=_matching_ids(out_dir, 'beats', 'beat', beat)))
+    if outlet:
+        ids = pa.chunked_array([_matching_ids(out_dir, 'jobs', 'outlet', outlet),
+                                _matching_ids(out_dir, 'outlets', 'outlet', outlet)])
+        mask = pc.and_(mask, pc.is_in(journalists['journalist_id'], value_set=pc.unique(ids)))
+    return journalists.filter(pc.fill_null(mask, False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Columnar (Parquet) export of the journalist corpus')
+    sub = parser.add_subparsers(dest='command', required=True)
+    run_export = sub.add_parser('export', help='Stream the record store into Parquet tables')
+    run_export.add_argument('--out', default=str(ANALYTICS_DIR))
+    run_export.add_argument('--location')
+    run_export.add_argument('--rows-per-group', type=int, default=ROWS_PER_GROUP)
+    run_query = sub.add_parser('query', help='Journalists by beat, outlet, location and verification')
+    run_query.add_argument('--out', default=str(ANALYTICS_DIR))
+    run_query.add_argument('--beat')
+    run_query.add_argument('--outlet')
+    run_query.add_argument('--location')
+    run_query.add_argument('--verified', action='store_true')
+    run_query.add_argument('--head', type=int, default=20)
+    args = parser.parse_args()
+
+    if pa is None:
+        raise SystemExit('❌ pyarrow is not installed: pip3 install pyarrow')
+    if args.command == 'export':
+        from record_store import open_store
+        from scrape_index import ScrapeIndex
+
+        index = ScrapeIndex()
+        store = open_store(index=index)
+        try:
+            index.ensure_built(store, getattr(store, 'data_dir', DATA_DIR))
+            result = export(store, index, Path(args.out), args.location, args.rows_per_group)
+        finally:
+            store.close()
+            index.close()
+        print(f"📦 {result['journalists']:,} journalists -> {args.out} "
+              f"({result['bytes'] / 1024 ** 2:,.1f} MB) in {result['seconds']:.1f}s")
+        for table, rows in result['rows'].items():
+            print(f"  {table:12} {rows:>10,} rows")
+    elif args.command == 'query':
+        start = time.perf_counter()
+        found = query(Path(args.out), args.beat, args.outlet, args.location, args.verified)
+        print(f"🔍 {found.num_rows:,} journalists in {time.perf_counter() - start:.2f}s")
+        for row in found.slice(0, args.head).to_pylist():
+            print(f"  {row['location']:20} {row['name'] or '':30} {row['url']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Crash-safe file writes: temp file + fsync + rename, with batched syncs for bulk writers.
+
+A reader (or the next run after Ctrl+C) sees either the old file or the new
+one, never a truncated mix. A single write fsyncs the temp file before the
+rename and the directory after it. Bulk writers pass a ``WriteBatch``: temp
+files are written unsynced, then each flush fsyncs the batch's temp files,
+does the renames, and fsyncs each distinct parent directory once.
+Files in a batch become visible when it is flushed.
+
+    atomic_write_json(path, data)                  # one durable write
+    with WriteBatch() as batch:                    # bulk writers
+        for path, data in records:
+            atomic_write_json(path, data, batch=batch)
+
+    python3 atomic_write.py bench [--files 2000]
+"""
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+
+class WriteBatch:
+    """Pending (temp, target) renames, committed every ``size`` files with one sync each way"""
+
+    def __init__(self, size: int = 256):
+        self.size = size
+        # temp -> target; a second write of the same target reuses its temp file
+        self.pending: Dict[str, str] = {}
+
+    def add(self, tmp: str, path: str):
+        self.pending[tmp] = path
+        if len(self.pending) >= self.size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        # Data first: a rename must never reach the disk before its content
+        sync_files(list(self.pending))
+        for tmp, path in self.pending.items():
+            os.replace(tmp, path)
+        sync_dirs({os.path.dirname(path) or '.' for path in self.pending.values()})
+        self.pending.clear()
+
+    def discard(self):
+        for tmp in self.pending:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+        self.pending.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Interrupted mid-batch: keep the old files rather than half a batch
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+
+
+def sync_files(paths: List[str]):
+    """fsync each file; only this batch's data, never every dirty page on the machine"""
+    for path in paths:
+        with open(path, 'rb+') as f:
+            os.fsync(f.fileno())
+
+
+def sync_dirs(directories):
+    """fsync each directory once, however many of the batch's renames landed in it"""
+    for directory in set(directories):
+        fsync_dir(directory)
+
+
+def fsync_dir(directory: str):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        # Some filesystems (and Windows) cannot fsync a directory
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: Union[str, Path], content: Union[str, bytes], batch: Optional[WriteBatch] = None,
+                 fsync: bool = True, encoding: str = 'utf-8'):
+    """Replace ``path`` with ``content`` in one rename; the parent directory must exist"""
+    path = os.fspath(path)
+    directory = os.path.dirname(path) or '.'
+    data = content.encode(encoding) if isinstance(content, str) else content
+    tmp = os.path.join(directory, f'.{os.path.basename(path)}.{os.getpid()}.tmp')
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+            if fsync and batch is None:
+                f.flush()
+                os.fsync(f.fileno())
+        if batch is not None:
+            batch.add(tmp, path)
+            return
+        os.replace(tmp, path)
+    except BaseException:
+        # Ctrl+C included: never leave the temp file behind
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        fsync_dir(directory)
+
+
+def atomic_write_json(path: Union[str, Path], data, batch: Optional[WriteBatch] = None, fsync: bool = True,
+                      indent: Optional[int] = 2):
+    atomic_write(path, json.dumps(data, indent=indent, ensure_ascii=False), batch, fsync)
+
+
+def bench(files: int) -> Dict[str, float]:
+    """files/sec for in-place writes and each atomic mode, one directory per file like datamuckrack/"""
+    import shutil
+    import tempfile
+
+    record = {'name': 'Bench', 'profile': {'name': 'Bench', 'beats': ['Politics'] * 20}, 'portfolio': [
+        {'title': f'Article {i}', 'url': f'https://example.com/{i}'} for i in range(40)]}
+    tmp = Path(tempfile.mkdtemp(prefix='atomic_write_bench_'))
+    results = {}
+    try:
+        dirs = [tmp / f'j{i}' for i in range(files)]
+        for d in dirs:
+            d.mkdir()
+
+        def run(label, write):
+            start = time.perf_counter()
+            for d in dirs:
+                write(d / f'{d.name}.json')
+            results[label] = files / (time.perf_counter() - start)
+
+        run('in_place', lambda p: p.write_text(json.dumps(record, indent=2, ensure_ascii=False)))
+        run('atomic_no_fsync', lambda p: atomic_write_json(p, record, fsync=False))
+        run('atomic_fsync_each', lambda p: atomic_write_json(p, record))
+        with WriteBatch() as batch:
+            run('atomic_batched', lambda p: atomic_write_json(p, record, batch))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Atomic writer benchmark')
+    sub = parser.add_subparsers(dest='command', required=True)
+    run_bench = sub.add_parser('bench', help='Compare in-place and atomic write throughput')
+    run_bench.add_argument('--files', type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        results = bench(args.files)
+        baseline = results['in_place']
+        for label, rate in results.items():
+            print(f"{label:26} {rate:>10,.0f} files/s  {rate / baseline:>6.0%}")
+
+
+if __name__ == '__main__':
+    main()
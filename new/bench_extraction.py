@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Benchmark: single-pass extraction engine vs BeautifulSoup select() parsers"""
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from extraction import extract_page
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'v1'
+
+
+# Reference: the select()-based parsers as they were in getjournalistdetails.py
+def select_profile(soup):
+    intro = soup.select_one('div.profile-section.profile-intro')
+    c = intro.select_one('div.mr-card-content') if intro else None
+    if not c:
+        return {}
+    jobs = []
+    for li in c.select('ul.mr-person-job-items li'):
+        text = li.get_text(strip=True).replace('\uf1ad', '').strip()
+        a = li.select_one('a')
+        if ',' in text and a:
+            jobs.append({'title': text.split(',')[0].strip(), 'outlet': a.get_text(strip=True),
+                         'outletLink': f"https://muckrack.com{a.get('href', '')}"})
+    covers = doesnt_cover = ''
+    for item in c.select('div.profile-details-item'):
+        txt = item.get_text()
+        if 'Covers:' in txt:
+            covers = txt.split('Covers:', 1)[1].strip()
+        elif "Doesn't Cover:" in txt:
+            doesnt_cover = txt.split("Doesn't Cover:", 1)[1].strip()
+    return {
+        'avatar': (img.get('src', '') if (img := c.select_one('img[src*="profile/images"]')) else ''),
+        'name': (h1.get_text(strip=True) if (h1 := c.select_one('h1.profile-name')) else ''),
+        'pronouns': (p.get_text(strip=True) if (p := c.select_one('div.fs-6.text-muted.fw-light')) else ''),
+        'verified': bool(c.select_one('small.profile-verified')),
+        'jobs': jobs,
+        'location': (s.get_text(strip=True) if (s := c.select_one('div.person-details-location span')) else ''),
+        'beats': [{'name': a.get_text(strip=True), 'link': f"https://muckrack.com{a.get('href', '')}"}
+                  for a in c.select('div.person-details-beats a')],
+        'asSeenIn': [{'name': a.get_text(strip=True), 'link': f"https://muckrack.com{a.get('href', '')}"}
+                     for a in c.select('div.profile-details-item a')],
+        'socialHandles': [{'handle': a.get_text(strip=True), 'link': a.get('href', '')}
+                          for a in c.select('a.tweet-url.username')],
+        'covers': covers,
+        'doesnt_cover': doesnt_cover,
+        'intro': (d.get_text(strip=True) if (d := c.select_one('div.fs-5.fs-md-6.my-5')) else ''),
+    }
+
+
+def select_bio(soup):
+    bio_div = soup.select_one('div.profile-section.profile-bio div.mr-card-content')
+    if not bio_div:
+        return ''
+    return '\n\n'.join(p.get_text(strip=True) for p in bio_div.select('p') if p.get_text(strip=True))
+
+
+def select_articles(soup):
+    articles = []
+    for item in soup.select('div.portfolio-item-container'):
+        article = {}
+        if h3 := item.select_one('h3.portfolio-item-title'):
+            article['title'] = h3.get_text(strip=True)
+        if link := item.select_one('a.portfolio-item-hover'):
+            article['link'] = link.get('href', '')
+        article['date'] = d.get_text(strip=True) if (d := item.select_one('span.date')) else ''
+        article['description'] = p.get_text(strip=True) if (p := item.select_one('div.preview-contents p')) else ''
+        article['image'] = img.get('src', '') if (img := item.select_one('img')) else ''
+        article['outlet'] = ''
+        if pub := item.select_one('div.portfolio-item-publication a'):
+            for cls in pub.get('class', []):
+                if 'sprite-group-thumbnails-' in cls:
+                    article['outlet'] = cls.replace('sprite-group-thumbnails-', '').title()
+                    break
+        if article.get('title'):
+            articles.append(article)
+    return articles
+
+
+def select_awards(soup):
+    awards = []
+    for item in soup.select('div.profile-award'):
+        award = {}
+        if h4 := item.select_one('h4.item-header'):
+            award['title'] = h4.get_text(strip=True)
+        if h5 := item.select_one('h5'):
+            parts = h5.get_text(strip=True).split('-', 1)
+            award['year'], award['award_name'] = (parts[0].strip(), parts[1].strip()) if len(parts) == 2 else (parts[0], '')
+        award['description'] = p.get_text(strip=True) if (p := item.select_one('p.mt-4')) else ''
+        awards.append(award)
+    return awards
+
+
+def select_interviews(soup):
+    interviews = []
+    for item in soup.select('div.profile-interview-answer'):
+        interview = {}
+        if h4 := item.select_one('h4'):
+            interview['question'] = h4.get_text(strip=True)
+        if answer := item.select_one('div.interview-answer'):
+            interview['answer'] = answer.get_text(strip=True)
+        if interview:
+            interviews.append(interview)
+    return interviews
+
+
+def select_page(html):
+    soup = BeautifulSoup(html, 'lxml')
+    return {'profile': select_profile(soup), 'biography': select_bio(soup), 'portfolio': select_articles(soup),
+            'awards': select_awards(soup), 'interviews': select_interviews(soup)}
+
+
+def timed(fn, pages, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for html in pages:
+            fn(html)
+    return (time.perf_counter() - start) / (rounds * len(pages))
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    files = sorted(FIXTURES_DIR.glob('*.html'))
+    pages = [f.read_text(encoding='utf-8') for f in files]
+    print(f"📄 {len(pages)} fixture pages, {sum(map(len, pages)) / 1024:.0f} KB, {rounds} rounds\n")
+
+    mismatches = 0
+    for f, html in zip(files, pages):
+        ours, ref = extract_page(html), select_page(html)
+        for section in ('biography', 'portfolio', 'awards', 'interviews'):
+            if ours[section] != ref[section]:
+                mismatches += 1
+                print(f"⚠️  {f.name}: {section} differs from select() reference")
+        if ours['profile'].get('name') != ref['profile'].get('name'):
+            mismatches += 1
+            print(f"⚠️  {f.name}: profile name differs from select() reference")
+
+    legacy = timed(select_page, pages, rounds)
+    engine = timed(extract_page, pages, rounds)
+    print(f"{'BeautifulSoup select()':26} {legacy * 1000:8.2f} ms/page {1 / legacy:8.0f} pages/s")
+    print(f"{'single-pass engine':26} {engine * 1000:8.2f} ms/page {1 / engine:8.0f} pages/s")
+    print(f"\n🚀 Speedup: {legacy / engine:.1f}x  ({mismatches} section mismatches)")
+
+
+if __name__ == '__main__':
+    main()
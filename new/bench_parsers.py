@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Offline parser benchmark and golden-output check over the fixture corpus.
+
+Goldens catch changes in what the extractors return for the corpus pages.
+Most v1 pages are reconstructed (``source`` in MANIFEST.json), so a match says
+nothing about live muckrack.com markup; add real pages (``page_archive.py get``)
+as ``saved`` in a new corpus version for that.
+
+    python3 bench_parsers.py                 # goldens + throughput report
+    python3 bench_parsers.py --check-speed   # also fail on throughput regressions
+    python3 bench_parsers.py --update        # rewrite goldens and speed baseline
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import extraction
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+CORPUS_VERSION = 'v1'
+
+# extractor name -> (function name in extraction.py, page kinds it runs on)
+EXTRACTORS = {
+    'page': ('extract_page', ('profile', 'bio', 'portfolio', 'awards', 'interview', 'blocked')),
+    'profile': ('extract_profile', ('profile', 'bio', 'portfolio', 'awards', 'interview')),
+    'bio': ('extract_bio', ('profile', 'bio')),
+    'portfolio': ('extract_portfolio', ('portfolio',)),
+    'awards': ('extract_awards', ('awards',)),
+    'interviews': ('extract_interviews', ('interview',)),
+    'directory': ('extract_directory', ('directory',)),
+}
+
+
+def load_corpus(version: str = CORPUS_VERSION):
+    corpus_dir = FIXTURES_DIR / version
+    manifest = json.loads((corpus_dir / 'MANIFEST.json').read_text())
+    pages = []
+    for filename, meta in sorted(manifest['pages'].items()):
+        pages.append((filename, meta['kind'], (corpus_dir / filename).read_text(encoding='utf-8')))
+    return corpus_dir, pages
+
+
+def count_saved(version: str = CORPUS_VERSION) -> int:
+    """Pages in the corpus that are real fetches rather than reconstructions"""
+    manifest = json.loads((FIXTURES_DIR / version / 'MANIFEST.json').read_text())
+    return sum(meta.get('source') == 'saved' for meta in manifest['pages'].values())
+
+
+def golden_output(kind: str, html: str):
+    if kind == 'directory':
+        return extraction.extract_directory(html)
+    return extraction.extract_page(html)
+
+
+def first_diff(expected, actual, path='$'):
+    """Path of the first difference between two JSON values, or None"""
+    if type(expected) is not type(actual):
+        return f'{path}: {type(expected).__name__} != {type(actual).__name__}'
+    if isinstance(expected, dict):
+        for key in sorted(set(expected) | set(actual)):
+            if key not in expected or key not in actual:
+                return f'{path}.{key}: missing on one side'
+            if diff := first_diff(expected[key], actual[key], f'{path}.{key}'):
+                return diff
+        return None
+    if isinstance(expected, list):
+        if len(expected) != len(actual):
+            return f'{path}: {len(expected)} items != {len(actual)}'
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            if diff := first_diff(e, a, f'{path}[{i}]'):
+                return diff
+        return None
+    return None if expected == actual else f'{path}: {expected!r} != {actual!r}'
+
+
+def check_goldens(corpus_dir: Path, pages, update: bool) -> int:
+    golden_dir = corpus_dir / 'golden'
+    golden_dir.mkdir(exist_ok=True)
+    failures = 0
+    for filename, kind, html in pages:
+        golden_file = golden_dir / f'{Path(filename).stem}.json'
+        actual = golden_output(kind, html)
+        if update or not golden_file.exists():
+            golden_file.write_text(json.dumps(actual, indent=2, ensure_ascii=False) + '\n')
+            continue
+        if diff := first_diff(json.loads(golden_file.read_text()), actual):
+            failures += 1
+            print(f"❌ {filename}: {diff}")
+    return failures
+
+
+def run_extractor(name: str, pages, rounds: int):
+    """Runs in a fresh process so peak RSS belongs to this extractor alone"""
+    fn = getattr(extraction, EXTRACTORS[name][0])
+    samples = []
+    for _ in range(rounds):
+        for html in pages:
+            start = time.perf_counter()
+            fn(html)
+            samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        'pages': len(samples),
+        'pages_per_sec': len(samples) / sum(samples),
+        'p50_ms': statistics.median(samples) * 1000,
+        'p99_ms': samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parser benchmark over the offline fixture corpus')
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--version', default=CORPUS_VERSION)
+    parser.add_argument('--update', action='store_true', help='Rewrite goldens and the speed baseline')
+    parser.add_argument('--check-speed', action='store_true', help='Fail when pages/sec drops below baseline')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='Allowed fractional slowdown vs baseline (machines differ)')
+    args = parser.parse_args()
+
+    corpus_dir, pages = load_corpus(args.version)
+    saved = count_saved(args.version)
+    print(f"📚 Corpus {args.version}: {len(pages)} pages ({saved} saved, {len(pages) - saved} reconstructed)\n")
+
+    golden_failures = check_goldens(corpus_dir, pages, args.update)
+    print(f"{'✅' if not golden_failures else '❌'} Goldens: {len(pages) - golden_failures}/{len(pages)} match\n")
+
+    baseline_file = corpus_dir / 'bench_baseline.json'
+    baseline = json.loads(baseline_file.read_text()) if baseline_file.exists() else {}
+    results, regressions = {}, 0
+    ctx = multiprocessing.get_context('spawn')
+    print(f"{'extractor':12} {'pages':>6} {'pages/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'peak RSS':>9}")
+    for name, (_, kinds) in EXTRACTORS.items():
+        subset = [html for _, kind, html in pages if kind in kinds]
+        with ctx.Pool(1) as pool:
+            r = pool.apply(run_extractor, (name, subset, args.rounds))
+        results[name] = r
+        flag = ''
+        if name in baseline and r['pages_per_sec'] < baseline[name] * (1 - args.tolerance):
+            flag = f"  ⚠️ below baseline {baseline[name]:.0f}/s"
+            regressions += 1
+        print(f"{name:12} {r['pages']:>6} {r['pages_per_sec']:>9.0f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+              f"{r['peak_rss_mb']:>7.1f}MB{flag}")
+
+    if args.update:
+        baseline_file.write_text(json.dumps(
+            {name: round(r['pages_per_sec']) for name, r in results.items()}, indent=2) + '\n')
+        print(f"\n💾 Baseline written: {baseline_file}")
+
+    if golden_failures or (args.check_speed and regressions):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Append-only checkpoint journal with periodic snapshot compaction"""
+import json
+import os
+from pathlib import Path
+from typing import Iterator, Optional, Set
+
+
+class CheckpointLog:
+    """Completed keys journalled one per line instead of rewriting the whole set.
+
+    Files for stem ``Us_checkpoint``:
+      Us_checkpoint.snapshot  compacted keys, one JSON string per line
+      Us_checkpoint.log       keys appended since the last compaction
+
+    Every append is flushed to the OS immediately, so a crash or Ctrl+C loses at
+    most the record being written; fsync is batched every ``fsync_every`` appends.
+    A legacy whole-file checkpoint (``{"scraped_urls": [...]}``) is imported on
+    first load when no snapshot exists yet.
+    """
+
+    def __init__(self, stem: Path, legacy_file: Optional[Path] = None, legacy_key: str = 'scraped_urls',
+                 fsync_every: int = 10, compact_every: int = 5000):
+        self.snapshot_file = stem.with_name(stem.name + '.snapshot')
+        self.log_file = stem.with_name(stem.name + '.log')
+        self.legacy_file = legacy_file
+        self.legacy_key = legacy_key
+        self.fsync_every = fsync_every
+        self.compact_every = compact_every
+        self.keys: Set[str] = set()
+        self._log = None
+        self._log_lines = 0
+        self._unsynced = 0
+
+    @staticmethod
+    def _read_lines(path: Path) -> Iterator[str]:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Torn tail from a crash mid-append
+                    continue
+
+    def load(self) -> Set[str]:
+        """Replay snapshot + log tail in one streaming pass"""
+        self.keys = set()
+        self._log_lines = 0
+        if self.snapshot_file.exists():
+            self.keys.update(self._read_lines(self.snapshot_file))
+        elif self.legacy_file and self.legacy_file.exists():
+            try:
+                data = json.loads(self.legacy_file.read_text())
+                self.keys.update(data.get(self.legacy_key, []))
+            except ValueError:
+                pass
+        if self.log_file.exists():
+            for key in self._read_lines(self.log_file):
+                self.keys.add(key)
+                self._log_lines += 1
+        if self.legacy_file and not self.snapshot_file.exists() and self.keys:
+            self.compact()
+        return self.keys
+
+    def append(self, key: str):
+        """Record one completed key"""
+        if key in self.keys:
+            return
+        self.keys.add(key)
+        if self._log is None:
+            self._log = self._open_log()
+        self._log.write(json.dumps(key, ensure_ascii=False) + '\n')
+        self._log.flush()
+        self._log_lines += 1
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+        if self._log_lines >= self.compact_every:
+            self.compact()
+
+    def _open_log(self):
+        torn = False
+        if self.log_file.exists() and self.log_file.stat().st_size:
+            with open(self.log_file, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b'\n'
+        log = open(self.log_file, 'a', encoding='utf-8')
+        if torn:
+            # Terminate a torn tail so the next record starts on its own line
+            log.write('\n')
+        return log
+
+    def sync(self):
+        if self._log is not None and self._unsynced:
+            os.fsync(self._log.fileno())
+        self._unsynced = 0
+
+    def compact(self):
+        """Fold the log into a fresh snapshot and truncate the log"""
+        self.sync()
+        tmp = self.snapshot_file.with_name(self.snapshot_file.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for key in self.keys:
+                f.write(json.dumps(key, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_file)
+        # Replaying a log that duplicates the snapshot is harmless, so a crash
+        # between the rename and the truncate loses nothing.
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        open(self.log_file, 'w').close()
+        self._log_lines = 0
+
+    def close(self):
+        if self._log is not None:
+            self.sync()
+            self._log.close()
+            self._log = None
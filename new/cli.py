@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""One entry point for every tool: python3 cli.py <command> [args]
+
+Each command's module is imported only when that command runs, so offline
+reports never load Selenium, lxml or BeautifulSoup, and nothing writes a log
+file or creates a directory until a scraper's main() starts.
+
+    python3 cli.py missing-fields
+    python3 cli.py plan build --limit 5000
+    python3 cli.py details --plan
+    python3 cli.py startup [command ...]      # import cost per command (-X importtime)
+"""
+import sys
+
+# command -> (module, summary); the module's main() parses the remaining arguments
+COMMANDS = {
+    'list': ('getjournalsitv2', 'Scrape journalist lists for every location (browser)'),
+    'details': ('getjournalistdetails', 'Scrape missing profile sections (browser)'),
+    'complete': ('complete_missing_data', 'Fill missing profile fields (browser)'),
+    'missing-fields': ('check_missing_fields', 'Report journalists missing profile fields'),
+    'scan': ('corpus_scan', 'All hygiene checks in one sweep'),
+    'clean-empty': ('clean_empty_profiles', 'Remove empty profiles'),
+    'quarantine': ('cleanup_empty_profiles', 'Quarantine sparse profiles'),
+    'index': ('scrape_index', 'Scrape-state index: rebuild, stats, matrix, changes'),
+    'plan': ('planner', 'Build or show the global scrape plan'),
+    'registry': ('registry', 'Canonical journalist registry and dedupe'),
+    'store': ('record_store', 'Record store import, export, migrate, find, bench'),
+    'lookup': ('record_lookup', 'Saved record by journalist_id'),
+    'failures': ('failure_log', 'List, group and requeue failed scrapes'),
+    'archive': ('page_archive', 'Raw page archive'),
+    'reparse': ('reparse', 'Re-run the parsers over archived pages'),
+    'analytics': ('analytics_export', 'Parquet export and queries (pyarrow)'),
+    'facets': ('facet_index', 'Media-list queries over beats, outlets and locations'),
+    'search': ('text_search', 'Full-text search over bios, intros and portfolio titles'),
+    'similar': ('similar_journalists', 'Similar journalists by beats and outlets (MinHash/LSH)'),
+    'atomic': ('atomic_write', 'Atomic writer benchmark'),
+}
+# Commands that must start fast; the rest drive a browser anyway
+OFFLINE = ('missing-fields', 'scan', 'index', 'plan', 'registry', 'store', 'lookup', 'failures', 'facets',
+           'search', 'similar')
+STARTUP_TARGET_MS = 100
+
+
+def import_cost(module: str, runs: int = 3):
+    """(import ms from -X importtime, best process wall ms) for ``import module`` in a fresh interpreter"""
+    import subprocess
+    import time
+    from pathlib import Path
+
+    cwd = Path(__file__).parent
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, None
+    imported = 0
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"; the module's own line holds the total
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            imported = int(parts[1]) / 1000
+    # Wall time without -X importtime, which inflates it
+    walls = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', f'import {module}'], cwd=cwd, capture_output=True)
+        walls.append((time.perf_counter() - start) * 1000)
+    return imported, min(walls)
+
+
+def startup(commands):
+    print(f"{'command':16} {'module':24} {'import':>9} {'process':>9}")
+    for command in commands or COMMANDS:
+        module = COMMANDS[command][0]
+        imported, wall = import_cost(module)
+        if imported is None:
+            print(f"{command:16} {module:24} {'missing dependency':>19}")
+            continue
+        flag = '⚠️' if command in OFFLINE and wall > STARTUP_TARGET_MS else ''
+        print(f"{command:16} {module:24} {imported:>7.1f}ms {wall:>7.1f}ms {flag}")
+
+
+def usage():
+    print(__doc__.split('\n\n')[0])
+    print()
+    for command, (module, summary) in COMMANDS.items():
+        print(f"  {command:16} {summary}")
+    print(f"  {'startup':16} Import cost of each command")
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ('-h', '--help'):
+        usage()
+        return
+    command, args = sys.argv[1], sys.argv[2:]
+    if command == 'startup':
+        unknown = [c for c in args if c not in COMMANDS]
+        if unknown:
+            sys.exit(f"Unknown command: {', '.join(unknown)}")
+        startup(args)
+        return
+    if command not in COMMANDS:
+        usage()
+        sys.exit(f"\nUnknown command: {command}")
+    import importlib
+
+    module = importlib.import_module(COMMANDS[command][0])
+    # The module sees its own name and arguments, exactly as when run directly
+    sys.argv = [f'{module.__name__}.py'] + args
+    module.main()
+
+
+if __name__ == '__main__':
+    main()
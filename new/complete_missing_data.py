@@ -1,14 +1,14 @@
 #!/usr/bin/env python3
 """Complete missing data scraper with as-seen-in.json"""
 import json
-import requests
 from pathlib import Path
 from datetime import datetime
 import time
 import random
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+
+from atomic_write import atomic_write_json
+from page_snapshot import PageSnapshot, PageStats
+from scrape_index import ScrapeIndex, content_hash, journalist_id_from_url
 
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / 'muckrack' / 'datamuckrack'
@@ -22,11 +22,19 @@ def get_user_agent():
 
 class CompleteScraper:
     def __init__(self):
+        # HTTP and browser stacks load only when a scraper actually starts
+        import requests
+
         self.driver = None
+        self.page_stats = PageStats()
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': get_user_agent()})
+        self.index = ScrapeIndex()
     
     def init_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
         if self.driver:
             try:
                 self.driver.quit()
@@ -64,7 +72,8 @@ class CompleteScraper:
             pass
         return None
     
-    def try_navigate(self, url, max_retries=3):
+    def try_navigate(self, url, max_retries=3, settle=0):
+        """Navigate and return a PageSnapshot of the loaded page, or None"""
         for attempt in range(1, max_retries + 1):
             try:
                 if attempt > 1:
@@ -72,11 +81,12 @@ class CompleteScraper:
                     time.sleep(2)
                 
                 self.driver.get(url)
-                time.sleep(random.uniform(0.5, 1.0))
+                time.sleep(random.uniform(0.5, 1.0) + settle)
                 
-                html = self.driver.page_source
+                snapshot = PageSnapshot(self.driver, self.page_stats)
+                html = snapshot.html
                 if 'mr-card-content' in html:
-                    return True
+                    return snapshot
                 
                 if any(x in html.lower() for x in ['security check', 'captcha', 'blocked', 'just a moment']):
                     self.init_driver()
@@ -84,127 +94,30 @@ class CompleteScraper:
                         time.sleep(2)
             except:
                 if attempt == max_retries:
-                    return False
+                    return None
                 time.sleep(2)
-        return False
+        return None
     
-    def extract_profile(self):
-        soup = BeautifulSoup(self.driver.page_source, 'lxml')
-        c = soup.select_one('div.mr-card-content')
-        if not c:
-            return {}
-        
-        profile = {}
-        if img := c.select_one('img[src*="profile/images"]'):
-            profile['avatar'] = img.get('src', '')
-        if name := c.select_one('h1.profile-name'):
-            profile['name'] = name.get_text(strip=True)
-        profile['verified'] = bool(c.select_one('small.profile-verified'))
-        
-        jobs = []
-        for item in c.select('ul.mr-person-job-items li.mr-person-job-item'):
-            if outlet := item.select_one('a'):
-                text = item.get_text(strip=True)
-                href = outlet.get('href', '')
-                jobs.append({
-                    'title': text.split(',')[0].strip(),
-                    'outlet': outlet.get_text(strip=True),
-                    'outletLink': f"https://muckrack.com{href}" if href and not href.startswith('http') else href
-                })
-        profile['jobs'] = jobs
-        
-        if loc := c.select_one('div.person-details-location span'):
-            profile['location'] = loc.get_text(strip=True)
-        
-        beats = []
-        if beats_div := c.select_one('div.person-details-beats div'):
-            for a in beats_div.select('a'):
-                href = a.get('href', '')
-                beats.append({
-                    'name': a.get_text(strip=True),
-                    'link': f"https://muckrack.com{href}" if href and not href.startswith('http') else href
-                })
-        profile['beats'] = beats
-        
-        as_seen = []
-        for item in c.select('div.profile-details-item a'):
-            href = item.get('href', '')
-            as_seen.append({
-                'name': item.get_text(strip=True),
-                'link': f"https://muckrack.com{href}" if href and not href.startswith('http') else href
-            })
-        if hidden_span := c.select_one('span.js-as-seen-in-hidden'):
-            for a in hidden_span.select('a'):
-                href = a.get('href', '')
-                as_seen.append({
-                    'name': a.get_text(strip=True),
-                    'link': f"https://muckrack.com{href}" if href and not href.startswith('http') else href
-                })
-        profile['asSeenIn'] = as_seen
-        
-        profile['covers'] = ''
-        profile['doesntCover'] = ''
-        for item in c.select('div.profile-details-item'):
-            txt = item.get_text()
-            if 'Covers:' in txt:
-                profile['covers'] = txt.split('Covers:', 1)[1].strip()
-            elif "Doesn't Cover:" in txt:
-                profile['doesntCover'] = txt.split("Doesn't Cover:", 1)[1].strip()
-        
-        handles = []
-        if social := c.select_one('div.fs-5.fs-md-6.my-5'):
-            for a in social.select('a.tweet-url.username'):
-                href = a.get('href', '')
-                handles.append({
-                    'handle': a.get_text(strip=True),
-                    'link': f"https://muckrack.com{href}" if href and not href.startswith('http') else href
-                })
-        profile['socialHandles'] = handles
-        
-        return profile
+    def extract_profile(self, snapshot):
+        return snapshot.page['profile']
     
-    def extract_bio(self):
-        soup = BeautifulSoup(self.driver.page_source, 'lxml')
-        bio = soup.select_one('div.profile-section.profile-bio')
-        if not bio:
-            return ''
-        return '\n\n'.join([p.get_text(strip=True) for p in bio.select('div.mr-card-content p') if p.get_text(strip=True)])
+    def extract_bio(self, snapshot):
+        return snapshot.page['biography']
     
-    def extract_portfolio(self):
-        soup = BeautifulSoup(self.driver.page_source, 'lxml')
-        articles = []
-        for item in soup.select('div.portfolio-item-container'):
-            article = {}
-            if h3 := item.select_one('h3.portfolio-item-title'):
-                article['title'] = h3.get_text(strip=True)
-            if link := item.select_one('a.portfolio-item-hover'):
-                article['link'] = link.get('href', '')
-            if date := item.select_one('span.date'):
-                article['date'] = date.get_text(strip=True)
-            if article.get('title'):
-                articles.append(article)
-        return articles
+    def extract_portfolio(self, snapshot):
+        return snapshot.page['portfolio']
     
-    def extract_awards(self):
-        soup = BeautifulSoup(self.driver.page_source, 'lxml')
-        awards = []
-        for item in soup.select('div.profile-award'):
-            if h4 := item.select_one('h4.item-header'):
-                awards.append({'title': h4.get_text(strip=True)})
-        return awards
+    def extract_awards(self, snapshot):
+        return snapshot.page['awards']
     
-    def extract_interviews(self):
-        soup = BeautifulSoup(self.driver.page_source, 'lxml')
-        interviews = []
-        for item in soup.select('div.profile-interview-answer'):
-            if h4 := item.select_one('h4'):
-                interviews.append({'question': h4.get_text(strip=True)})
-        return interviews
+    def extract_interviews(self, snapshot):
+        return snapshot.page['interviews']
     
     def complete_journalist_data(self, json_file):
         """Complete missing data for journalist"""
         try:
             existing = json.loads(json_file.read_text())
+            loaded_hash = content_hash(existing)
             url = existing.get('url')
             if not url:
                 return False
@@ -213,6 +126,7 @@ class CompleteScraper:
             name = json_file.parent.name
             
             print(f"  📄 {name}")
+            self.page_stats.reset()
             
             # Check what's missing
             needs_profile = not existing.get('profile') or not existing['profile'].get('name')
@@ -238,39 +152,45 @@ class CompleteScraper:
                 self.init_driver()
                 
                 if needs_profile or needs_bio:
-                    if self.try_navigate(url):
+                    if snapshot := self.try_navigate(url):
                         if needs_profile:
-                            existing['profile'] = self.extract_profile()
+                            existing['profile'] = self.extract_profile(snapshot)
                             print(f"    ✅ profile")
                         if needs_bio:
-                            existing['biography'] = self.extract_bio()
+                            existing['biography'] = self.extract_bio(snapshot)
                             print(f"    ✅ biography")
                 
                 if needs_portfolio:
-                    if self.try_navigate(f'https://muckrack.com/{journalist_id}/portfolio'):
-                        time.sleep(1)
-                        existing['portfolio'] = self.extract_portfolio()
+                    if snapshot := self.try_navigate(f'https://muckrack.com/{journalist_id}/portfolio', settle=1):
+                        existing['portfolio'] = self.extract_portfolio(snapshot)
                         print(f"    ✅ portfolio")
                 
                 if needs_awards:
-                    if self.try_navigate(f'https://muckrack.com/{journalist_id}/awards'):
-                        time.sleep(1)
-                        existing['awards'] = self.extract_awards()
+                    if snapshot := self.try_navigate(f'https://muckrack.com/{journalist_id}/awards', settle=1):
+                        existing['awards'] = self.extract_awards(snapshot)
                         print(f"    ✅ awards")
                 
                 if needs_interviews:
-                    if self.try_navigate(f'https://muckrack.com/{journalist_id}/interview'):
-                        time.sleep(1)
-                        existing['interviews'] = self.extract_interviews()
+                    if snapshot := self.try_navigate(f'https://muckrack.com/{journalist_id}/interview', settle=1):
+                        existing['interviews'] = self.extract_interviews(snapshot)
                         print(f"    ✅ interviews")
                 
+                print(f"    📊 {self.page_stats.summary()}")
+                
                 if self.driver:
                     self.driver.quit()
                     self.driver = None
             
-            # Save updated data
+            # Save updated data, unless the fetches brought nothing new
+            existing['content_hash'] = content_hash(existing)
+            if existing['content_hash'] == loaded_hash:
+                # Stamp verified_at so the planner counts this recheck as done
+                self.index.verify(journalist_id_from_url(url), str(json_file.relative_to(DATA_DIR)), loaded_hash)
+                print("    ⏸️ Unchanged, not rewritten")
+                return True
             existing['updated_at'] = datetime.now().isoformat()
-            json_file.write_text(json.dumps(existing, indent=2, ensure_ascii=False))
+            atomic_write_json(json_file, existing)
+            self.index.record_saved(existing, json_file, json_file.parent.parent.name, DATA_DIR)
             return True
             
         except Exception as e:
@@ -307,6 +227,8 @@ def main():
                 time.sleep(random.uniform(0.6, 1.0))
         
         break  # Test with one location first
+    
+    scraper.index.close()
 
 if __name__ == '__main__':
     try:
@@ -0,0 +1,59 @@
+"""Shared pytest fixtures: journalist records, and a record store with its scrape-state index"""
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from record_store import PackedStore, ShardedStore, TreeStore, save_record
+from scrape_index import ScrapeIndex
+
+
+def make_record(slug: str, beats=(), outlets=(), location=None, bio: str = '', titles=(), **extra) -> Dict:
+    """Saved journalist record with the fields the indexes read; beats and outlets are given by slug"""
+    return {'name': slug, 'url': f'https://muckrack.com/{slug}', 'biography': bio, **extra,
+            'profile': {
+                'name': slug.title(), 'location': location,
+                'beats': [{'name': b.title(), 'link': f'https://muckrack.com/beat/{b}'} for b in beats],
+                'asSeenIn': [{'name': o.title(), 'link': f'https://muckrack.com/media-outlet/{o}'} for o in outlets]},
+            'portfolio': [{'title': t} for t in titles]}
+
+
+class SavedRecords:
+    """One store backend and its scrape-state index under a temporary directory"""
+
+    def __init__(self, root: Path, backend: str):
+        self.data_dir = root / 'datamuckrack'
+        self.index = ScrapeIndex(root / 'scrape_state.db')
+        if backend == 'tree':
+            self.store = TreeStore(self.data_dir, self.index)
+        elif backend == 'packed':
+            self.store = PackedStore(root / 'records.db')
+        else:
+            self.store = ShardedStore(root / 'records')
+
+    def save(self, location: str, name: str, data: Dict):
+        """Save through save_record, so the index and its change feed follow"""
+        return save_record(self.store, self.index, location, name, data, self.data_dir)
+
+    def remove(self, location: str, name: str):
+        """Delete a record and log its removal to the change feed"""
+        data = self.store.load(location, name)
+        self.store.delete(location, name)
+        self.index.forget(data['url'])
+
+    def close(self):
+        self.store.close()
+        self.index.close()
+
+
+@pytest.fixture
+def record():
+    return make_record
+
+
+@pytest.fixture
+def saved(tmp_path: Path, request):
+    """Tree store unless parametrized indirectly with a backend name"""
+    records = SavedRecords(tmp_path, getattr(request, 'param', 'tree'))
+    yield records
+    records.close()
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""One parallel sweep over datamuckrack/ for every hygiene check.
+
+Journalist folders are enumerated with ``os.scandir`` and handed to a process
+pool in batches; workers read each JSON once and run every selected check on
+it. Findings come back to the parent, which is the only process that applies
+actions (delete, quarantine, rmdir), so destructive work stays sequential.
+
+The sweep reads the tree layout directly, so it only runs with
+``MUCKRACK_STORE=tree``; under a packed or sharded store ``scan()`` raises
+rather than report an empty corpus.
+
+With a ``QualityIndex`` (the CLI default) every file is only stat'ed; files whose
+mtime and size match the last sweep are judged from their stored quality flags
+without being read, so an unchanged tree re-scans in seconds.
+
+A check is a module-level function ``check(item) -> detail`` that returns a
+truthy detail for a finding. ``item`` holds ``location``, ``name``, ``files``
+(names inside the journalist folder), ``quality`` (``profile_quality()`` flags,
+None without a readable JSON), ``error`` (why the JSON could not be read) and
+``data`` (the parsed JSON, only for files re-read in this sweep). An action is
+``action(finding) -> bool``, where True means the record is gone and must
+leave the scrape index.
+
+    python3 corpus_scan.py                    # report every check
+    python3 corpus_scan.py --fix              # also apply DEFAULT_ACTIONS
+    python3 corpus_scan.py --checks missing_fields,orphaned_folder --report hygiene.json
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from quality_index import NEW_PROFILE_FIELDS, QualityIndex, profile_quality
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / 'muckrack' / 'datamuckrack'
+EMPTY_DIR = BASE_DIR / 'muckrack' / 'empty_profiles'
+
+MEANINGFUL_FLAGS = ('avatar', 'jobs', 'has_location', 'beats', 'as_seen_in', 'social', 'covers',
+                    'doesnt_cover', 'intro')
+CORE_FLAGS = ('avatar', 'jobs', 'has_location', 'beats', 'as_seen_in')
+
+
+# Checks: run in worker processes
+
+def missing_fields(item: Dict):
+    """Profile saved before pronouns/intro/covers/doesnt_cover were extracted"""
+    q = item['quality']
+    if q is None:
+        return None
+    return [f for bit, f in enumerate(NEW_PROFILE_FIELDS) if q['missing_keys'] & (1 << bit)] or None
+
+
+def empty_profile(item: Dict):
+    """No meaningful profile field at all"""
+    q = item['quality']
+    if q is None:
+        return None
+    return not any(q[f] for f in MEANINGFUL_FLAGS)
+
+
+def sparse_profile(item: Dict):
+    """Four or more of the five core profile fields empty"""
+    q = item['quality']
+    if q is None:
+        return None
+    if not q['profile']:
+        return True
+    return sum(not q[f] for f in CORE_FLAGS) >= 4
+
+
+def real_data(item: Dict):
+    """Two or more core profile fields filled"""
+    q = item['quality']
+    if q is None:
+        return None
+    return sum(bool(q[f]) for f in CORE_FLAGS) >= 2
+
+
+def orphaned_folder(item: Dict):
+    """Journalist folder without its JSON: 'empty' when it holds no files at all"""
+    if item['dir'] and f"{item['name']}.json" not in item['files']:
+        return 'empty' if not item['files'] else 'no_json'
+    return None
+
+
+def unreadable(item: Dict):
+    return item['error']
+
+
+CHECKS: Dict[str, Callable] = {
+    'missing_fields': missing_fields,
+    'empty_profile': empty_profile,
+    'sparse_profile': sparse_profile,
+    'orphaned_folder': orphaned_folder,
+    'unreadable': unreadable,
+}
+
+
+# Actions: run in the parent, one finding at a time
+
+def remove_journalist(finding: Dict) -> bool:
+    path = Path(finding['path'])
+    if finding['dir']:
+        shutil.rmtree(path)
+    else:
+        path.unlink()
+    print(f"  ❌ Removed: {finding['location']}/{finding['name']}")
+    return True
+
+
+def quarantine(finding: Dict) -> bool:
+    """Move the JSON under empty_profiles/ so the journalist is scraped again"""
+    path = Path(finding['path'])
+    json_file = path / f"{finding['name']}.json" if finding['dir'] else path
+    dest_dir = EMPTY_DIR / finding['location'] / finding['name']
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(json_file), str(dest_dir / json_file.name))
+    print(f"📦 Moved: {finding['location']}/{finding['name']}")
+    if finding['dir'] and not any(path.iterdir()):
+        path.rmdir()
+    return True
+
+
+def remove_empty_folder(finding: Dict) -> bool:
+    if finding['detail'] == 'empty':
+        Path(finding['path']).rmdir()
+        print(f"🗑️  Removed: {finding['location']}/{finding['name']}")
+    return False
+
+
+DEFAULT_ACTIONS: Dict[str, Callable] = {
+    'empty_profile': quarantine,
+    'sparse_profile': quarantine,
+    'orphaned_folder': remove_empty_folder,
+}
+
+
+def _load(path: str) -> Tuple[Optional[Dict], Optional[str], int]:
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return None, None, 0
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        return None, f'invalid JSON: {e}', len(raw)
+    if not isinstance(data, dict):
+        return None, f'JSON {type(data).__name__}, not an object', len(raw)
+    return data, None, len(raw)
+
+
+def _scan_batch(args: Tuple[str, str, List[Tuple[str, bool]], Dict[str, Callable], Dict[str, Tuple]]) -> Dict:
+    """Worker: stat one batch of a location's entries, re-read changed JSON, run every check"""
+    data_dir, location, entries, checks, cached = args
+    findings, rows = [], []
+    counts = {'items': 0, 'files': 0, 'bytes': 0, 'read': 0}
+    for name, is_dir in entries:
+        if is_dir:
+            path = os.path.join(data_dir, location, name)
+            with os.scandir(path) as it:
+                files = {e.name: e for e in it}
+            entry = files.get(f'{name}.json')
+            st = entry.stat() if entry is not None else None
+            json_path = os.path.join(path, f'{name}.json')
+        else:
+            path = json_path = os.path.join(data_dir, location, f'{name}.json')
+            files = {}
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                st = None
+
+        data = None
+        if st is None:
+            url, error, quality = None, None, None
+        elif name in cached and cached[name][:2] == (st.st_mtime_ns, st.st_size):
+            url, error, quality = cached[name][2:]
+        else:
+            data, error, _ = _load(json_path)
+            url = (data.get('url') or data.get('link')) if data else None
+            quality = profile_quality(data) if data else None
+            rows.append((name, is_dir, st.st_mtime_ns, st.st_size, url, error, quality))
+            counts['read'] += 1
+
+        counts['items'] += 1
+        if st is not None:
+            counts['files'] += 1
+            counts['bytes'] += st.st_size
+        item = {'location': location, 'name': name, 'dir': is_dir, 'files': list(files), 'quality': quality,
+                'error': error, 'data': data}
+        for check_name, check in checks.items():
+            detail = check(item)
+            if detail:
+                findings.append({'check': check_name, 'location': location, 'name': name, 'dir': is_dir,
+                                 'path': path, 'url': url, 'detail': detail})
+    return {'location': location, 'names': [name for name, _ in entries], 'findings': findings,
+            'rows': rows, **counts}
+
+
+def iter_batches(data_dir: Path, batch_size: int) -> Iterator[Tuple[str, List[Tuple[str, bool]]]]:
+    """(location, [(name, is_dir), ...]) batches straight from os.scandir"""
+    if not data_dir.exists():
+        return
+    for location in sorted(e.name for e in os.scandir(data_dir) if e.is_dir()):
+        batch = []
+        with os.scandir(data_dir / location) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    batch.append((entry.name, True))
+                elif entry.name.endswith('.json'):
+                    batch.append((entry.name[:-5], False))
+                if len(batch) >= batch_size:
+                    yield location, batch
+                    batch = []
+        if batch:
+            yield location, batch
+
+
+def require_tree_store():
+    """Packed and sharded stores leave datamuckrack/ stale or empty, so a sweep would find nothing"""
+    backend = os.environ.get('MUCKRACK_STORE', 'tree')
+    if backend != 'tree':
+        raise RuntimeError(f"Hygiene sweeps walk datamuckrack/ and need MUCKRACK_STORE=tree, not '{backend}'")
+
+
+def scan(checks: Dict[str, Callable], actions: Optional[Dict[str, Callable]] = None,
+         data_dir: Path = DATA_DIR, workers: Optional[int] = None, batch_size: int = 256,
+         index=None, quality: Optional[QualityIndex] = None) -> Dict:
+    """Run ``checks`` over the whole corpus in one pass; apply ``actions`` to their findings.
+
+    Checks run in ``dict`` order, and only the first action that removes a
+    record applies to it. Removed records are dropped from ``index`` when given.
+    With ``quality``, unchanged files are not re-read and the table is kept current.
+    """
+    require_tree_store()
+    from concurrent.futures import ProcessPoolExecutor
+
+    actions = actions or {}
+    workers = workers or os.cpu_count() or 1
+    result = {'items': 0, 'files': 0, 'bytes': 0, 'read': 0, 'counts': dict.fromkeys(checks, 0),
+              'findings': {name: [] for name in checks}, 'removed': 0, 'action_errors': 0}
+    start = time.perf_counter()
+    removed = set()
+    seen = {}
+    cache = {'location': None, 'rows': {}}
+
+    def jobs():
+        for location, batch in iter_batches(data_dir, batch_size):
+            if quality is not None and cache['location'] != location:
+                cache['location'], cache['rows'] = location, quality.load_location(location)
+            rows = cache['rows']
+            yield str(data_dir), location, batch, checks, {name: rows[name] for name, _ in batch if name in rows}
+
+    def apply(finding):
+        action = actions.get(finding['check'])
+        key = (finding['location'], finding['name'])
+        if action is None or key in removed:
+            return
+        try:
+            if action(finding):
+                removed.add(key)
+                if index is not None and finding['url']:
+                    index.forget(finding['url'])
+                if quality is not None:
+                    quality.forget(*key)
+        except OSError as e:
+            result['action_errors'] += 1
+            print(f"⚠️  {finding['check']} action failed for {key[0]}/{key[1]}: {e}")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending, pending_jobs = deque(), jobs()
+        while True:
+            # A bounded number of batches in flight keeps the cached rows small
+            while len(pending) < workers * 2:
+                job = next(pending_jobs, None)
+                if job is None:
+                    break
+                pending.append(pool.submit(_scan_batch, job))
+            if not pending:
+                break
+            batch = pending.popleft().result()
+            for key in ('items', 'files', 'bytes', 'read'):
+                result[key] += batch[key]
+            seen.setdefault(batch['location'], set()).update(batch['names'])
+            if quality is not None and batch['rows']:
+                quality.upsert(batch['location'], batch['rows'])
+            for finding in batch['findings']:
+                result['counts'][finding['check']] += 1
+                result['findings'][finding['check']].append(finding)
+                apply(finding)
+    if quality is not None:
+        for location, name in removed:
+            seen.get(location, set()).discard(name)
+        quality.prune(seen)
+    result['removed'] = len(removed)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def print_throughput(result: Dict):
+    seconds = result['seconds'] or 1e-9
+    print(f"⚡ {result['items']:,} folders, {result['files']:,} files ({result['bytes'] / 1024 ** 2:,.1f} MB, "
+          f"{result['read']:,} re-read) in {seconds:.1f}s = {result['files'] / seconds:,.0f} files/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parallel hygiene sweep over datamuckrack/')
+    parser.add_argument('--checks', default=','.join(CHECKS), help=f"Comma-separated: {', '.join(CHECKS)}")
+    parser.add_argument('--fix', action='store_true', help='Apply default actions (quarantine, rmdir)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--report', help='Write every finding to this JSON file')
+    parser.add_argument('--full', action='store_true', help='Re-read every file, ignoring the quality index')
+    args = parser.parse_args()
+
+    checks = {name: CHECKS[name] for name in args.checks.split(',')}
+    index = None
+    if args.fix:
+        from scrape_index import ScrapeIndex
+
+        index = ScrapeIndex()
+    quality = QualityIndex()
+    if args.full:
+        quality.prune({})
+    try:
+        result = scan(checks, DEFAULT_ACTIONS if args.fix else None, workers=args.workers, index=index,
+                      quality=quality)
+    except RuntimeError as e:
+        raise SystemExit(f"❌ {e}")
+    finally:
+        quality.close()
+        if index is not None:
+            index.close()
+
+    print(f"\n{'check':20} {'findings':>10}")
+    for name, count in result['counts'].items():
+        print(f"{name:20} {count:>10,}")
+    if args.fix:
+        print(f"\n🧹 Removed or quarantined {result['removed']:,} records")
+    print_throughput(result)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({'timestamp': datetime.now().isoformat(), 'scanned': result['items'],
+                       'counts': result['counts'], 'findings': result['findings']}, f, indent=2,
+                      ensure_ascii=False)
+        print(f"📋 Report saved: {args.report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""Single-pass profile extraction engine shared by all scrapers.
+
+One walk over the parsed document dispatches on each element's tag and
+class to fill every section at once, instead of running dozens of
+independent CSS ``select()`` queries per section:
+
+    page = extract_page(html)
+    page['profile'], page['biography'], page['portfolio'], page['awards'], page['interviews']
+
+The output schema is fixed: all five sections are always returned, and
+every profile, article, award and interview dict carries all of its
+``*_FIELDS`` keys (``profile`` is ``{}`` when the page has no profile card).
+"""
+from typing import Dict, List
+
+from lxml import etree
+from lxml import html as lxml_html
+
+BASE_URL = 'https://muckrack.com'
+
+PROFILE_FIELDS = ('avatar', 'name', 'pronouns', 'verified', 'jobs', 'location', 'beats', 'asSeenIn',
+                  'socialHandles', 'covers', 'doesnt_cover', 'intro')
+ARTICLE_FIELDS = ('title', 'link', 'date', 'description', 'image', 'outlet')
+AWARD_FIELDS = ('title', 'year', 'award_name', 'description')
+INTERVIEW_FIELDS = ('question', 'answer')
+
+_NO_CLASSES = frozenset()
+_PRONOUNS = frozenset(('fs-6', 'text-muted', 'fw-light'))
+_INTRO = frozenset(('fs-5', 'fs-md-6', 'my-5'))
+_SOCIAL = frozenset(('tweet-url', 'username'))
+_SPRITE_PREFIX = 'sprite-group-thumbnails-'
+
+
+def parse_html(page):
+    """Parse an HTML string once; already-parsed trees pass through"""
+    if isinstance(page, (str, bytes)):
+        return lxml_html.document_fromstring(page)
+    return page
+
+
+def absolute_url(href: str) -> str:
+    if not href or href.startswith('http'):
+        return href
+    return f'{BASE_URL}{href}'
+
+
+def _text(el) -> str:
+    """Same as BeautifulSoup get_text(strip=True)"""
+    return ''.join(s.strip() for s in el.itertext())
+
+
+def empty_profile() -> Dict:
+    profile = dict.fromkeys(PROFILE_FIELDS, '')
+    profile.update(verified=False, jobs=[], beats=[], asSeenIn=[], socialHandles=[])
+    return profile
+
+
+class _Walker:
+    """State machine fed by one start/end event stream over the document"""
+
+    def __init__(self):
+        self.profile = None
+        self.bio = []
+        self.portfolio = []
+        self.awards = []
+        self.interviews = []
+        # Open scopes: name -> element, closed when that element ends
+        self.scopes = {}
+        self.stack = []
+        self.job = None
+        self.article = None
+        self.award = None
+        self.interview = None
+
+    def open(self, name, el):
+        self.scopes[name] = el
+        self.stack.append((el, name))
+
+    def start(self, el, tag, classes):
+        scopes = self.scopes
+
+        if 'mr-card-content' in classes:
+            if 'bio' in scopes:
+                self.open('bio_card', el)
+            elif 'intro' in scopes and self.profile is None and tag == 'div':
+                self.profile = empty_profile()
+                self.open('card', el)
+        elif 'profile-intro' in classes and 'profile-section' in classes:
+            # Only the first intro section holds the profile card
+            if self.profile is None and tag == 'div':
+                self.open('intro', el)
+        elif 'profile-bio' in classes and 'profile-section' in classes:
+            self.open('bio', el)
+        elif 'portfolio-item-container' in classes:
+            self.article = dict.fromkeys(ARTICLE_FIELDS, '')
+            self.article['_found'] = set()
+            self.open('article', el)
+            return
+        elif 'profile-award' in classes:
+            self.award = {}
+            self.open('award', el)
+            return
+        elif 'profile-interview-answer' in classes:
+            self.interview = {}
+            self.open('interview', el)
+            return
+
+        if 'card' in scopes:
+            self._profile_start(el, tag, classes)
+        elif 'bio_card' in scopes:
+            if tag == 'p' and (text := _text(el)):
+                self.bio.append(text)
+        elif 'article' in scopes:
+            self._article_start(el, tag, classes)
+        elif 'award' in scopes:
+            self._award_start(el, tag, classes)
+        elif 'interview' in scopes:
+            if tag == 'h4' and 'question' not in self.interview:
+                self.interview['question'] = _text(el)
+            elif 'interview-answer' in classes and 'answer' not in self.interview:
+                self.interview['answer'] = _text(el)
+
+    def _profile_start(self, el, tag, classes):
+        p, scopes = self.profile, self.scopes
+        if tag == 'a':
+            if 'job' in scopes:
+                if self.job[1] is None:
+                    self.job[1] = el
+            elif 'beats' in scopes:
+                p['beats'].append({'name': _text(el), 'link': absolute_url(el.get('href', ''))})
+            if _SOCIAL <= classes:
+                p['socialHandles'].append({'handle': _text(el), 'link': absolute_url(el.get('href', ''))})
+            elif ('details' in scopes or 'hidden' in scopes) and 'js-as-seen-in-more' not in classes:
+                p['asSeenIn'].append({'name': _text(el), 'link': absolute_url(el.get('href', ''))})
+        elif tag == 'img':
+            src = el.get('src', '')
+            if not p['avatar'] and 'profile/images' in src:
+                p['avatar'] = src
+        elif tag == 'h1':
+            if 'profile-name' in classes and not p['name']:
+                p['name'] = _text(el)
+        elif tag == 'small':
+            if 'profile-verified' in classes:
+                p['verified'] = True
+        elif tag == 'li':
+            if 'jobs' in scopes:
+                self.job = [el, None]
+                self.open('job', el)
+        elif tag == 'ul':
+            if 'mr-person-job-items' in classes:
+                self.open('jobs', el)
+        elif tag == 'span':
+            if 'location' in scopes and not p['location']:
+                p['location'] = _text(el)
+            elif 'js-as-seen-in-hidden' in classes:
+                self.open('hidden', el)
+        elif tag == 'div':
+            if 'person-details-location' in classes:
+                self.open('location', el)
+            elif 'person-details-beats' in classes:
+                self.open('beats', el)
+            elif 'profile-details-item' in classes:
+                self.open('details', el)
+                txt = ''.join(el.itertext())
+                if 'Covers:' in txt:
+                    p['covers'] = txt.split('Covers:', 1)[1].strip()
+                elif "Doesn't Cover:" in txt:
+                    p['doesnt_cover'] = txt.split("Doesn't Cover:", 1)[1].strip()
+            elif _PRONOUNS <= classes:
+                if not p['pronouns']:
+                    p['pronouns'] = _text(el)
+            elif _INTRO <= classes:
+                if not p['intro']:
+                    p['intro'] = _text(el)
+
+    def _article_start(self, el, tag, classes):
+        a, found, scopes = self.article, self.article['_found'], self.scopes
+        if tag == 'div':
+            if 'preview-contents' in classes:
+                self.open('preview', el)
+            elif 'portfolio-item-publication' in classes:
+                self.open('publication', el)
+            return
+        if tag == 'h3' and 'portfolio-item-title' in classes:
+            key = 'title'
+        elif tag == 'a' and 'publication' in scopes:
+            key = 'outlet'
+        elif tag == 'a' and 'portfolio-item-hover' in classes:
+            key = 'link'
+        elif tag == 'span' and 'date' in classes:
+            key = 'date'
+        elif tag == 'img':
+            key = 'image'
+        elif tag == 'p' and 'preview' in scopes:
+            key = 'description'
+        else:
+            return
+        # First match wins, like select_one()
+        if key in found:
+            return
+        found.add(key)
+        if key == 'outlet':
+            for cls in classes:
+                if cls.startswith(_SPRITE_PREFIX):
+                    a['outlet'] = cls[len(_SPRITE_PREFIX):].title()
+                    break
+        elif key == 'link':
+            a['link'] = el.get('href', '')
+        elif key == 'image':
+            a['image'] = el.get('src', '')
+        else:
+            a[key] = _text(el)
+
+    def _award_start(self, el, tag, classes):
+        award = self.award
+        if tag == 'h4' and 'item-header' in classes and 'title' not in award:
+            award['title'] = _text(el)
+        elif tag == 'h5' and 'year' not in award:
+            parts = _text(el).split('-', 1)
+            if len(parts) == 2:
+                award['year'], award['award_name'] = parts[0].strip(), parts[1].strip()
+            else:
+                award['year'], award['award_name'] = parts[0], ''
+        elif tag == 'p' and 'mt-4' in classes and 'description' not in award:
+            award['description'] = _text(el)
+
+    def end(self, el):
+        while self.stack and self.stack[-1][0] is el:
+            _, name = self.stack.pop()
+            del self.scopes[name]
+            if name == 'job':
+                li, a = self.job
+                text = _text(li).replace('\uf1ad', '').strip()
+                if ',' in text and a is not None:
+                    self.profile['jobs'].append({'title': text.split(',')[0].strip(), 'outlet': _text(a),
+                                                 'outletLink': absolute_url(a.get('href', ''))})
+                self.job = None
+            elif name == 'article':
+                self.article.pop('_found')
+                if self.article['title']:
+                    self.portfolio.append(self.article)
+                self.article = None
+            elif name == 'award':
+                if self.award:
+                    award = dict.fromkeys(AWARD_FIELDS, '')
+                    award.update(self.award)
+                    self.awards.append(award)
+                self.award = None
+            elif name == 'interview':
+                if self.interview:
+                    interview = dict.fromkeys(INTERVIEW_FIELDS, '')
+                    interview.update(self.interview)
+                    self.interviews.append(interview)
+                self.interview = None
+
+
+def extract_page(page) -> Dict:
+    """Extract every section from one page in a single document walk"""
+    walker = _Walker()
+    start, end = walker.start, walker.end
+    for event, el in etree.iterwalk(parse_html(page), events=('start', 'end')):
+        if event == 'start':
+            tag = el.tag
+            if not isinstance(tag, str):
+                continue
+            cls = el.get('class')
+            start(el, tag, frozenset(cls.split()) if cls else _NO_CLASSES)
+        else:
+            end(el)
+    return {
+        'profile': walker.profile or {},
+        'biography': '\n\n'.join(walker.bio),
+        'portfolio': walker.portfolio,
+        'awards': walker.awards,
+        'interviews': walker.interviews,
+    }
+
+
+def extract_profile(page) -> Dict:
+    return extract_page(page)['profile']
+
+
+def extract_bio(page) -> str:
+    return extract_page(page)['biography']
+
+
+def extract_portfolio(page) -> List[Dict]:
+    return extract_page(page)['portfolio']
+
+
+def extract_awards(page) -> List[Dict]:
+    return extract_page(page)['awards']
+
+
+def extract_interviews(page) -> List[Dict]:
+    return extract_page(page)['interviews']
+
+
+def extract_directory(page) -> Dict:
+    """Journalist (or location) links from a beat directory page, plus the next-page link"""
+    entries, next_page = [], ''
+    for el in parse_html(page).iter('div', 'ul'):
+        classes = (el.get('class') or '').split()
+        if 'mr-directory-item' in classes or 'mr-directory-group-item' in classes:
+            for a in el.iter('a'):
+                if a.get('href'):
+                    entries.append({'name': _text(a), 'url': absolute_url(a.get('href'))})
+        elif el.tag == 'ul' and 'pager' in classes:
+            for li in el.iter('li'):
+                a = li.find('a')
+                if (a is not None and 'disabled' not in (li.get('class') or '').split()
+                        and 'page=' in a.get('href', '') and _text(a).lower().startswith('next')):
+                    next_page = absolute_url(a.get('href'))
+    return {'entries': entries, 'next_page': next_page}
+
+
+def extract_journalist(pages: Dict) -> Dict:
+    """Sections for one journalist from their pages keyed by kind, merged like getjournalistdetails.py.
+
+    Kinds are ``profile``, ``bio``, ``portfolio``, ``awards`` and ``interview``;
+    only sections backed by a page are returned.
+    """
+    data = {}
+    if 'profile' in pages:
+        main = extract_page(pages['profile'])
+        data['profile'] = main['profile']
+        data['biography'] = main['biography']
+    if 'bio' in pages:
+        full_bio = extract_bio(pages['bio'])
+        if full_bio:
+            data['biography'] = full_bio
+    if 'portfolio' in pages:
+        data['portfolio'] = extract_portfolio(pages['portfolio'])
+        data['portfolio_count'] = len(data['portfolio'])
+    if 'awards' in pages:
+        data['awards'] = extract_awards(pages['awards'])
+    if 'interview' in pages:
+        data['interviews'] = extract_interviews(pages['interview'])
+    return data
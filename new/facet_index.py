@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""Inverted index for media lists: beat, outlet and location -> journalists.
+
+Each journalist gets a dense doc number; each facet term (beat slug, outlet
+slug, lower-cased ``profile.location``) stores its posting list as a bitmap,
+zlib-compressed in SQLite and held as a Python int once queried, so AND, OR
+and NOT are single big-int operations over the whole corpus.
+
+    beat:afghanistan AND (outlet:washpost OR outlet:nytimes) AND NOT location:"london"
+
+Values match the slug or the display name, case-insensitively. The index
+follows the scrape-state ``changes`` feed: ``update`` re-reads only the
+records changed since the last applied sequence number.
+
+    python3 facet_index.py rebuild
+    python3 facet_index.py update                 # apply the change feed
+    python3 facet_index.py query 'beat:pakistan AND NOT outlet:freelance' [--head 20]
+    python3 facet_index.py terms outlet [--head 20]
+    python3 facet_index.py bench [--journalists 157000]
+"""
+import argparse
+import json
+import random
+import re
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from scrape_index import ScrapeIndex
+
+BASE_DIR = Path(__file__).parent.parent
+FACET_DB = BASE_DIR / 'muckrack' / 'facet_index.db'
+
+FACETS = ('beat', 'outlet', 'location')
+# Postings of every live journalist, the universe NOT is taken against
+ALL = ('', '*')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc INTEGER PRIMARY KEY,
+    journalist_id TEXT NOT NULL UNIQUE,
+    terms TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    facet TEXT NOT NULL,
+    term TEXT NOT NULL,
+    label TEXT,
+    bitmap BLOB NOT NULL,
+    PRIMARY KEY (facet, term)
+);
+CREATE TABLE IF NOT EXISTS facet_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+TOKEN = re.compile(r'\s*(?:(\()|(\))|(AND|OR|NOT)\b|(\w+):(?:"([^"]*)"|(\S+?))(?=[\s()]|$))')
+
+
+def _slug(link) -> Optional[str]:
+    return link.rstrip('/').rsplit('/', 1)[-1].lower() if isinstance(link, str) and link.strip('/') else None
+
+
+def _pairs(value) -> List[Dict]:
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+def record_terms(data: Dict) -> Dict[Tuple[str, str], Optional[str]]:
+    """(facet, term) -> display label for one record"""
+    profile = data.get('profile') if isinstance(data.get('profile'), dict) else {}
+    terms: Dict[Tuple[str, str], Optional[str]] = {}
+    for beat in _pairs(profile.get('beats')):
+        term = _slug(beat.get('link')) or (beat.get('name') or '').strip().lower()
+        if term:
+            terms[('beat', term)] = beat.get('name')
+    outlets = [(item.get('name'), item.get('link')) for item in _pairs(profile.get('asSeenIn'))]
+    outlets += [(job.get('outlet'), job.get('outletLink')) for job in _pairs(profile.get('jobs'))]
+    outlets += [(item.get('name') or item.get('title'), item.get('link') or item.get('view_url'))
+                for item in _pairs(data.get('asSeenInFull'))]
+    for name, link in outlets:
+        term = _slug(link) or (name.strip().lower() if isinstance(name, str) else '')
+        if term:
+            terms[('outlet', term)] = name
+    location = profile.get('location')
+    if isinstance(location, str) and location.strip():
+        terms[('location', location.strip().lower())] = location.strip()
+    return terms
+
+
+def to_bitmap(docs: Iterable[int]) -> int:
+    docs = list(docs)
+    if not docs:
+        return 0
+    bits = bytearray(max(docs) // 8 + 1)
+    for doc in docs:
+        bits[doc >> 3] |= 1 << (doc & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def members(bitmap: int) -> List[int]:
+    """Set bits of ``bitmap`` in ascending order"""
+    found = []
+    for i, byte in enumerate(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')):
+        while byte:
+            low = byte & -byte
+            found.append(i * 8 + low.bit_length() - 1)
+            byte ^= low
+    return found
+
+
+def _pack(bitmap: int) -> bytes:
+    return zlib.compress(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little'), 1)
+
+
+def _unpack(blob: bytes) -> int:
+    return int.from_bytes(zlib.decompress(blob), 'little')
+
+
+class FacetIndex:
+    """Postings per (facet, term) plus each doc's current terms, in their own SQLite file"""
+
+    def __init__(self, db_path: Path = FACET_DB):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        # (facet, term) -> bitmap, filled as terms are queried
+        self.cache: Dict[Tuple[str, str], int] = {}
+        self._labels: Optional[Dict[Tuple[str, str], Tuple[str, str]]] = None
+        self._ids: Optional[Dict[int, str]] = None
+
+    # Building
+
+    def rebuild(self, records: Iterable[Tuple[str, Dict]], seq: int = 0) -> Dict:
+        """Replace the index with ``(journalist_id, data)`` records; ``seq`` is the feed position they reflect"""
+        start = time.perf_counter()
+        postings: Dict[Tuple[str, str], List[int]] = {}
+        labels: Dict[Tuple[str, str], Optional[str]] = {}
+        docs = []
+        for doc, (journalist_id, data) in enumerate(records):
+            terms = record_terms(data)
+            docs.append((doc, journalist_id, json.dumps(sorted(terms))))
+            for key, label in terms.items():
+                postings.setdefault(key, []).append(doc)
+                labels.setdefault(key, label)
+        postings[ALL] = list(range(len(docs)))
+        with self.conn:
+            self.conn.execute('DELETE FROM docs')
+            self.conn.execute('DELETE FROM postings')
+            self.conn.executemany('INSERT INTO docs VALUES (?, ?, ?)', docs)
+            self.conn.executemany('INSERT INTO postings VALUES (?, ?, ?, ?)',
+                                  ((facet, term, labels.get((facet, term)), _pack(to_bitmap(ids)))
+                                   for (facet, term), ids in postings.items()))
+            self._set_seq(seq)
+        self.cache.clear()
+        self._labels = self._ids = None
+        return {'journalists': len(docs), 'terms': len(postings) - 1, 'seconds': time.perf_counter() - start}
+
+    def apply(self, changed: Dict[str, Optional[Dict]], seq: int) -> Dict:
+        """Re-index changed journalists (``None`` = removed) and record the feed position"""
+        sets: Dict[Tuple[str, str], Set[int]] = {}
+        clears: Dict[Tuple[str, str], Set[int]] = {}
+        labels: Dict[Tuple[str, str], Optional[str]] = {}
+        rows = {jid: (doc, terms) for doc, jid, terms in self._docs(changed)}
+        next_doc = self.conn.execute('SELECT COALESCE(MAX(doc) + 1, 0) FROM docs').fetchone()[0]
+        with self.conn:
+            for journalist_id, data in changed.items():
+                doc, old = rows.get(journalist_id, (None, []))
+                old = {tuple(key) for key in old}
+                new = record_terms(data) if data is not None else {}
+                if doc is None:
+                    if data is None:
+                        continue
+                    doc, next_doc = next_doc, next_doc + 1
+                for key in old - set(new):
+                    clears.setdefault(key, set()).add(doc)
+                for key in set(new) - old:
+                    sets.setdefault(key, set()).add(doc)
+                    labels[key] = new[key]
+                if data is None:
+                    clears.setdefault(ALL, set()).add(doc)
+                    self.conn.execute('DELETE FROM docs WHERE doc = ?', (doc,))
+                else:
+                    sets.setdefault(ALL, set()).add(doc)
+                    self.conn.execute('INSERT OR REPLACE INTO docs VALUES (?, ?, ?)',
+                                      (doc, journalist_id, json.dumps(sorted(new))))
+            for key in set(sets) | set(clears):
+                bitmap = self.bitmap(*key) | to_bitmap(sets.get(key, ()))
+                bitmap &= ~to_bitmap(clears.get(key, ()))
+                if bitmap:
+                    self.conn.execute(
+                        'INSERT INTO postings VALUES (?, ?, ?, ?) ON CONFLICT (facet, term) DO UPDATE '
+                        'SET bitmap = excluded.bitmap, label = COALESCE(postings.label, excluded.label)',
+                        (*key, labels.get(key), _pack(bitmap)))
+                else:
+                    self.conn.execute('DELETE FROM postings WHERE facet = ? AND term = ?', key)
+                self.cache[key] = bitmap
+            self._set_seq(seq)
+        self._labels = self._ids = None
+        return {'changed': len(changed), 'terms': len(set(sets) | set(clears))}
+
+    def _docs(self, journalist_ids: Iterable[str]):
+        ids = list(journalist_ids)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            for doc, journalist_id, terms in self.conn.execute(
+                    f'SELECT doc, journalist_id, terms FROM docs '
+                    f'WHERE journalist_id IN ({", ".join("?" * len(chunk))})', chunk):
+                yield doc, journalist_id, json.loads(terms)
+
+    def seq(self) -> int:
+        row = self.conn.execute("SELECT value FROM facet_meta WHERE key = 'seq'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _set_seq(self, seq: int):
+        self.conn.execute("INSERT OR REPLACE INTO facet_meta VALUES ('seq', ?)", (str(seq),))
+
+    # Querying
+
+    def bitmap(self, facet: str, term: str) -> int:
+        key = (facet, term)
+        if key not in self.cache:
+            row = self.conn.execute('SELECT bitmap FROM postings WHERE facet = ? AND term = ?', key).fetchone()
+            self.cache[key] = _unpack(row[0]) if row else 0
+        return self.cache[key]
+
+    def lookup(self, facet: str, value: str) -> int:
+        """Bitmap for a term given by slug or display name"""
+        if facet not in FACETS:
+            raise ValueError(f'Unknown facet {facet!r}; use one of {", ".join(FACETS)}')
+        value = value.strip().lower()
+        if self._labels is None:
+            self._labels = {(f, (label or '').lower()): (f, term) for f, term, label in
+                            self.conn.execute('SELECT facet, term, label FROM postings')}
+        bitmap = self.bitmap(facet, value)
+        named = self._labels.get((facet, value))
+        return bitmap | self.bitmap(*named) if named and named[1] != value else bitmap
+
+    def query(self, expression: str) -> int:
+        """Bitmap of journalists matching ``expression`` (facet:value, AND, OR, NOT, parentheses)"""
+        tokens = _tokenize(expression)
+        bitmap, rest = self._or(tokens)
+        if rest:
+            raise ValueError(f'Unexpected {rest[0][1]!r} in query')
+        return bitmap
+
+    def _or(self, tokens):
+        left, tokens = self._and(tokens)
+        while tokens and tokens[0] == ('op', 'OR'):
+            right, tokens = self._and(tokens[1:])
+            left |= right
+        return left, tokens
+
+    def _and(self, tokens):
+        left, tokens = self._not(tokens)
+        while tokens and (tokens[0] == ('op', 'AND') or tokens[0][0] in ('term', '(') or tokens[0] == ('op', 'NOT')):
+            if tokens[0] == ('op', 'AND'):
+                tokens = tokens[1:]
+            right, tokens = self._not(tokens)
+            left &= right
+        return left, tokens
+
+    def _not(self, tokens):
+        if tokens and tokens[0] == ('op', 'NOT'):
+            operand, tokens = self._not(tokens[1:])
+            return self.bitmap(*ALL) & ~operand, tokens
+        if not tokens:
+            raise ValueError('Query ends too early')
+        kind, value = tokens[0]
+        if kind == '(':
+            inner, tokens = self._or(tokens[1:])
+            if not tokens or tokens[0][0] != ')':
+                raise ValueError('Missing )')
+            return inner, tokens[1:]
+        if kind == 'term':
+            return self.lookup(*value), tokens[1:]
+        raise ValueError(f'Unexpected {value!r} in query')
+
+    def journalist_ids(self, bitmap: int) -> List[str]:
+        if self._ids is None:
+            self._ids = dict(self.conn.execute('SELECT doc, journalist_id FROM docs'))
+        return [self._ids[doc] for doc in members(bitmap) if doc in self._ids]
+
+    def terms(self, facet: str) -> List[Tuple[str, Optional[str], int]]:
+        """(term, label, journalists) for a facet, largest first"""
+        rows = [(term, label, _unpack(blob).bit_count()) for term, label, blob in self.conn.execute(
+            'SELECT term, label, bitmap FROM postings WHERE facet = ?', (facet,))]
+        return sorted(rows, key=lambda row: -row[2])
+
+    def close(self):
+        self.conn.close()
+
+
+def _tokenize(expression: str) -> List[Tuple[str, object]]:
+    tokens, pos = [], 0
+    expression = expression.strip()
+    while pos < len(expression):
+        match = TOKEN.match(expression, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f'Cannot parse query at {expression[pos:]!r}')
+        opening, closing, op, facet, quoted, bare = match.groups()
+        if opening:
+            tokens.append(('(', '('))
+        elif closing:
+            tokens.append((')', ')'))
+        elif op:
+            tokens.append(('op', op))
+        else:
+            tokens.append(('term', (facet, quoted if quoted is not None else bare)))
+        pos = match.end()
+        while pos < len(expression) and expression[pos].isspace():
+            pos += 1
+    return tokens
+
+
+def rebuild(facets: FacetIndex, store, index: ScrapeIndex) -> Dict:
+    """Re-index every journalist in ``store`` once; changes logged meanwhile are re-applied by the next update"""
+    from record_lookup import feed_seq, iter_journalists
+
+    return facets.rebuild(iter_journalists(store, index), feed_seq(index))
+
+
+def update(facets: FacetIndex, store, index: ScrapeIndex, batch: int = 5000) -> Dict:
+    """Apply the change feed since the last applied sequence number"""
+    from record_lookup import changed_records
+
+    stats = {'changes': 0, 'changed': 0, 'terms': 0}
+    for seq, entries, changed in changed_records(index, store, facets.seq(), batch):
+        result = facets.apply(changed, seq)
+        stats['changes'] += entries
+        stats['changed'] += result['changed']
+        stats['terms'] += result['terms']
+    return stats
+
+
+def bench(journalists: int, queries: int = 200) -> Dict:
+    """Build an index over synthetic profiles and time a mix of AND/OR/NOT queries"""
+    import tempfile
+
+    rng = random.Random(7)
+    beats = [f'beat{i}' for i in range(150)]
+    outlets = [f'outlet{i}' for i in range(5000)]
+    places = [f'city {i}' for i in range(800)]
+
+    def profiles():
+        for i in range(journalists):
+            yield f'person-{i}', {'profile': {
+                'beats': [{'name': b, 'link': f'https://muckrack.com/beat/{b}'} for b in rng.sample(beats, 3)],
+                'asSeenIn': [{'name': o, 'link': f'https://muckrack.com/media-outlet/{o}'}
+                             for o in rng.sample(outlets, 8)],
+                'location': rng.choice(places)}}
+
+    with tempfile.TemporaryDirectory(prefix='facet_bench_') as tmp:
+        facets = FacetIndex(Path(tmp) / 'facets.db')
+        built = facets.rebuild(profiles())
+        expressions = [f'beat:{rng.choice(beats)} AND (outlet:{rng.choice(outlets)} OR outlet:{rng.choice(outlets)}) '
+                       f'AND NOT location:"{rng.choice(places)}"' for _ in range(queries)]
+        start = time.perf_counter()
+        cold = [facets.query(e).bit_count() for e in expressions]
+        cold_ms = (time.perf_counter() - start) / queries * 1000
+        start = time.perf_counter()
+        for e in expressions:
+            facets.query(e)
+        warm_ms = (time.perf_counter() - start) / queries * 1000
+        start = time.perf_counter()
+        wide = facets.query(f'beat:{beats[0]} OR beat:{beats[1]} OR NOT location:"{places[0]}"')
+        ids = facets.journalist_ids(wide)
+        wide_ms = (time.perf_counter() - start) * 1000
+        facets.close()
+    return {'journalists': journalists, 'build_s': built['seconds'], 'terms': built['terms'],
+            'cold_ms': cold_ms, 'warm_ms': warm_ms, 'avg_hits': sum(cold) / queries,
+            'wide_hits': len(ids), 'wide_ms': wide_ms}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Beat / outlet / location inverted index')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('rebuild', help='Index every saved record')
+    sub.add_parser('update', help='Apply the scrape-state change feed')
+    run_query = sub.add_parser('query', help='Journalists matching a facet expression')
+    run_query.add_argument('expression')
+    run_query.add_argument('--head', type=int, default=20)
+    terms = sub.add_parser('terms', help='Most common terms of a facet')
+    terms.add_argument('facet', choices=FACETS)
+    terms.add_argument('--head', type=int, default=20)
+    run_bench = sub.add_parser('bench', help='Query latency on a synthetic corpus')
+    run_bench.add_argument('--journalists', type=int, default=157000)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        r = bench(args.journalists)
+        print(f"🏗️  {r['journalists']:,} journalists, {r['terms']:,} terms indexed in {r['build_s']:.1f}s")
+        print(f"🔍 3-facet AND/OR/NOT: {r['cold_ms']:.2f} ms cold, {r['warm_ms']:.2f} ms warm "
+              f"({r['avg_hits']:.0f} hits avg); {r['wide_hits']:,}-journalist result with ids in {r['wide_ms']:.0f} ms")
+        return
+
+    facets = FacetIndex()
+    try:
+        if args.command == 'query':
+            start = time.perf_counter()
+            bitmap = facets.query(args.expression)
+            ids = facets.journalist_ids(bitmap)
+            print(f"🔍 {len(ids):,} journalists in {(time.perf_counter() - start) * 1000:.1f} ms")
+            for journalist_id in ids[:args.head]:
+                print(f"  https://muckrack.com/{journalist_id}")
+        elif args.command == 'terms':
+            for term, label, count in facets.terms(args.facet)[:args.head]:
+                print(f"{count:>8,}  {term:30} {label or ''}")
+        else:
+            from record_store import open_store
+
+            index = ScrapeIndex()
+            store = open_store(index=index)
+            try:
+                index.ensure_built(store)
+                result = rebuild(facets, store, index) if args.command == 'rebuild' else update(facets, store, index)
+            finally:
+                store.close()
+                index.close()
+            if args.command == 'rebuild':
+                print(f"🗂️  {result['journalists']:,} journalists, {result['terms']:,} terms in {result['seconds']:.1f}s")
+            else:
+                print(f"🔄 {result['changes']:,} changes -> {result['changed']:,} journalists re-indexed, "
+                      f"{result['terms']:,} postings rewritten")
+    finally:
+        facets.close()
+
+
+if __name__ == '__main__':
+    main()
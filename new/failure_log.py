@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Failure log: one row per URL with attempt counters, in the scrape-state DB"""
+import argparse
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Union
+
+BASE_DIR = Path(__file__).parent.parent
+FAILED_DIR = BASE_DIR / 'muckrack' / 'failed'
+INDEX_DB = BASE_DIR / 'muckrack' / 'scrape_state.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS failures (
+    url TEXT PRIMARY KEY,
+    name TEXT,
+    location TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error_class TEXT,
+    error TEXT,
+    first_failed_at TEXT,
+    last_failed_at TEXT,
+    status TEXT NOT NULL DEFAULT 'failed'
+);
+CREATE INDEX IF NOT EXISTS failures_location ON failures(location, status);
+"""
+
+COLUMNS = ['url', 'name', 'location', 'attempts', 'error_class', 'error',
+           'first_failed_at', 'last_failed_at', 'status']
+
+
+def classify_error(error: Union[BaseException, str]) -> str:
+    """Stable error class for grouping; generic Exceptions are bucketed by message"""
+    if isinstance(error, BaseException) and type(error) is not Exception:
+        return type(error).__name__
+    msg = str(error).lower()
+    if 'cloudflare' in msg or 'just a moment' in msg:
+        return 'Cloudflare'
+    if 'fetch' in msg:
+        return 'FetchFailed'
+    if 'navigat' in msg:
+        return 'NavigationFailed'
+    if 'timeout' in msg or 'timed out' in msg:
+        return 'Timeout'
+    return 'Exception'
+
+
+class FailureLog:
+    """O(1) failure recording: an upsert per failure instead of rewriting a JSON array"""
+
+    def __init__(self, db_path: Path = INDEX_DB):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def record(self, name: str, url: str, location: str, error: Union[BaseException, str],
+               when: Optional[str] = None):
+        when = when or datetime.now().isoformat()
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO failures (url, name, location, attempts, error_class, error, '
+                'first_failed_at, last_failed_at, status) VALUES (?, ?, ?, 1, ?, ?, ?, ?, \'failed\') '
+                'ON CONFLICT(url) DO UPDATE SET attempts = attempts + 1, name = excluded.name, '
+                'location = excluded.location, error_class = excluded.error_class, '
+                'error = excluded.error, last_failed_at = excluded.last_failed_at, status = \'failed\'',
+                (url, name, location, classify_error(error), str(error)[:500], when, when))
+
+    def resolve(self, url: str):
+        """Drop a URL once it has been scraped successfully"""
+        with self.conn:
+            self.conn.execute('DELETE FROM failures WHERE url = ?', (url,))
+
+    def _where(self, location: Optional[str], error_class: Optional[str], status: Optional[str],
+               min_attempts: int = 0):
+        clauses, params = ['attempts >= ?'], [min_attempts]
+        for column, value in (('location', location), ('error_class', error_class), ('status', status)):
+            if value:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        return ' AND '.join(clauses), params
+
+    def iter_failures(self, location: Optional[str] = None, error_class: Optional[str] = None,
+                      status: Optional[str] = None, min_attempts: int = 0) -> Iterator[Dict]:
+        """Stream matching rows straight off the cursor"""
+        where, params = self._where(location, error_class, status, min_attempts)
+        cur = self.conn.execute(
+            f'SELECT {", ".join(COLUMNS)} FROM failures WHERE {where} ORDER BY last_failed_at', params)
+        for row in cur:
+            yield dict(zip(COLUMNS, row))
+
+    def group(self, by: str = 'error_class', location: Optional[str] = None) -> Iterator[tuple]:
+        if by not in ('error_class', 'location', 'status', 'attempts'):
+            raise ValueError(f'Cannot group by {by}')
+        where, params = self._where(location, None, None)
+        yield from self.conn.execute(
+            f'SELECT {by}, COUNT(*), SUM(attempts), MAX(last_failed_at) FROM failures '
+            f'WHERE {where} GROUP BY {by} ORDER BY 2 DESC', params)
+
+    def requeue(self, location: Optional[str] = None, error_class: Optional[str] = None,
+                min_attempts: int = 0) -> int:
+        """Mark matching failures to be retried first on the next run"""
+        where, params = self._where(location, error_class, 'failed', min_attempts)
+        with self.conn:
+            cur = self.conn.execute(f"UPDATE failures SET status = 'requeued' WHERE {where}", params)
+        return cur.rowcount
+
+    def requeued(self, location: str) -> Set[str]:
+        return {url for (url,) in self.conn.execute(
+            "SELECT url FROM failures WHERE location = ? AND status = 'requeued'", (location,))}
+
+    def import_legacy(self, failed_dir: Path = FAILED_DIR) -> int:
+        """Fold old {location}_failed.json arrays into the table"""
+        imported = 0
+        for failed_file in sorted(failed_dir.glob('*_failed.json')):
+            location = failed_file.name[:-len('_failed.json')]
+            try:
+                entries = json.loads(failed_file.read_text())
+            except ValueError:
+                print(f"⚠️  Skipping unreadable {failed_file.name}")
+                continue
+            for entry in entries:
+                if entry.get('url'):
+                    self.record(entry.get('name', ''), entry['url'], location,
+                                entry.get('error', ''), entry.get('timestamp'))
+                    imported += 1
+        return imported
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and requeue failed journalists')
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name in ('list', 'requeue'):
+        p = sub.add_parser(name)
+        p.add_argument('--location')
+        p.add_argument('--error-class')
+        p.add_argument('--min-attempts', type=int, default=0)
+    sub.choices['list'].add_argument('--status', choices=['failed', 'requeued'])
+    group = sub.add_parser('group')
+    group.add_argument('--by', default='error_class', choices=['error_class', 'location', 'status', 'attempts'])
+    group.add_argument('--location')
+    sub.add_parser('import-legacy', help='Import muckrack/failed/*_failed.json')
+    args = parser.parse_args()
+
+    log = FailureLog()
+    try:
+        if args.command == 'list':
+            for row in log.iter_failures(args.location, args.error_class, args.status, args.min_attempts):
+                print(json.dumps(row, ensure_ascii=False))
+        elif args.command == 'group':
+            print(f"{args.by:30} {'urls':>8} {'attempts':>9}  last failure")
+            for key, count, attempts, last in log.group(args.by, args.location):
+                print(f"{str(key):30} {count:>8,} {attempts:>9,}  {last}")
+        elif args.command == 'requeue':
+            count = log.requeue(args.location, args.error_class, args.min_attempts)
+            print(f"🔁 Requeued {count:,} failures")
+        elif args.command == 'import-legacy':
+            print(f"📥 Imported {log.import_legacy():,} legacy failures")
+    finally:
+        log.close()
+
+
+if __name__ == '__main__':
+    main()
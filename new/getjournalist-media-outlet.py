@@ -9,6 +9,8 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from bs4 import BeautifulSoup
 
+from record_lookup import lookup
+
 # Configuration
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "muckrack" / "datamuckrack"
@@ -179,17 +181,8 @@ def test_single_journalist(journalist_id="joseph-goldstein"):
     """Test with a single journalist"""
     print(f"🧪 Testing: {journalist_id}\n")
     
-    # Load profile data if exists
-    profile_data = None
-    for json_file in DATA_DIR.rglob("*.json"):
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if data.get('url', '').endswith(journalist_id):
-                    profile_data = data
-                    break
-        except:
-            pass
+    # Load profile data if exists (indexed by journalist_id, no corpus walk)
+    profile_data = lookup(journalist_id)
     
     driver = init_driver()
     
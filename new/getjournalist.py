@@ -5,6 +5,8 @@ import asyncio
 from pathlib import Path
 from playwright.async_api import async_playwright
 
+from atomic_write import atomic_write
+
 BASE_DIR = Path(__file__).parent.parent
 OUTPUT_DIR = BASE_DIR / 'journalistv2' / 'locations'
 CHECKPOINT_FILE = BASE_DIR / 'checkpoints' / 'checkpointsJournalistUrl.json'
@@ -69,7 +71,7 @@ def load_checkpoint():
     return set()
 
 def save_checkpoint(completed):
-    CHECKPOINT_FILE.write_text(json.dumps({'completed': list(completed)}, indent=2))
+    atomic_write(CHECKPOINT_FILE, json.dumps({'completed': list(completed)}, indent=2))
 
 async def scrape_location(page, location_name, url):
     print(f"🔍 {location_name}")
@@ -151,7 +153,7 @@ async def main():
                 'total_journalists': len(journalists),
                 'journalists': journalists
             }
-            output_file.write_text(json.dumps(data, indent=2))
+            atomic_write(output_file, json.dumps(data, indent=2))
             
             print(f"  💾 {len(journalists)} journalists → file://{output_file}\n")
             
@@ -1,96 +1,109 @@
 #!/usr/bin/env python3
-import json
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Set
+from itertools import chain
+from typing import Dict, Iterable, List, Set
 import time
 import random
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium_stealth import stealth
+import sys
+
+from checkpoint_log import CheckpointLog
+from extraction import extract_bio, extract_page
+from failure_log import FailureLog
+from page_archive import PageArchive
+from planner import PLAN_FILE, load_plan, pending_items
+from record_store import TreeStore, open_store, save_record
+from scrape_index import ALL_SECTIONS, ScrapeIndex, missing_sections, name_from_path, section_mask
 
 SECTIONS = ['profile', 'portfolio', 'bio', 'awards', 'interviews']
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / 'muckrack' / 'datamuckrack'
-FAILED_DIR = BASE_DIR / 'muckrack' / 'failed'
 LOG_DIR = BASE_DIR / 'logs'
 CHECKPOINT_DIR = BASE_DIR / 'checkpoints'
 
-LOG_DIR.mkdir(exist_ok=True)
-CHECKPOINT_DIR.mkdir(exist_ok=True)
+logger = logging.getLogger(__name__)
 
-log_file = LOG_DIR / f'scraper_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'
-file_handler = logging.FileHandler(log_file)
-file_handler.setLevel(logging.INFO)
-file_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[logging.StreamHandler(), file_handler]
-)
-logger = logging.getLogger(__name__)
+def setup_logging():
+    """Log file and run directories; called by main() so importing this module writes nothing"""
+    LOG_DIR.mkdir(exist_ok=True)
+    CHECKPOINT_DIR.mkdir(exist_ok=True)
+
+    log_file = LOG_DIR / f'scraper_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        handlers=[logging.StreamHandler(), file_handler]
+    )
 
 class JournalistScraper:
-    def __init__(self, location_name: str):
-        self.location = location_name
+    def __init__(self, location_name: str, index: ScrapeIndex = None, archive: PageArchive = None,
+                 store=None):
+        self.location = None
+        self.index = index
+        self.archive = archive
+        self.store = store if store is not None else TreeStore(DATA_DIR)
+        self.failures = FailureLog()
         self.driver = None
         self.request_count = 0
-        self.checkpoint_file = CHECKPOINT_DIR / f'{location_name}_checkpoint.json'
+        # One open checkpoint per location visited; all closed by close()
+        self.checkpoints = {}
+        self.set_location(location_name)
         self.stats = {'total': 0, 'completed': 0, 'failed': 0, 'skipped': 0}
         self.consecutive_failures = 0
     
-    def load_checkpoint(self) -> Set[str]:
-        if self.checkpoint_file.exists():
+    def set_location(self, location_name: str):
+        """Save, archive and checkpoint under another location; the browser is kept"""
+        if location_name == self.location:
+            return
+        self.location = location_name
+        if location_name not in self.checkpoints:
+            self.checkpoints[location_name] = CheckpointLog(
+                CHECKPOINT_DIR / f'{location_name}_details_checkpoint',
+                legacy_file=CHECKPOINT_DIR / f'{location_name}_checkpoint.json',
+                legacy_key='completed'
+            )
+        self.checkpoint = self.checkpoints[location_name]
+    
+    def close(self):
+        for checkpoint in self.checkpoints.values():
+            checkpoint.close()
+        if self.driver:
             try:
-                data = json.loads(self.checkpoint_file.read_text())
-                completed = set(data.get('completed', []))
-                logger.info(f"📋 Checkpoint: {len(completed)} completed")
-                return completed
+                self.driver.quit()
             except:
                 pass
-        return set()
+            self.driver = None
     
-    def save_checkpoint(self, completed: Set[str]):
-        data = {
-            'location': self.location,
-            'completed': list(completed),
-            'last_updated': datetime.now().isoformat(),
-            'stats': self.stats
-        }
-        self.checkpoint_file.write_text(json.dumps(data, indent=2))
+    def load_checkpoint(self) -> Set[str]:
+        completed = self.checkpoint.load()
+        if completed:
+            logger.info(f"📋 Checkpoint: {len(completed)} completed")
+        return completed
     
     def log_stats(self):
         logger.info(f"📊 {self.stats['completed']}/{self.stats['total']} done, "
                    f"{self.stats['failed']} failed, {self.stats['skipped']} skipped")
     
-    def get_missing_sections(self, name: str) -> Set[str]:
-        data_file = DATA_DIR / self.location / name / f'{name}.json'
-        existing = set()
-        if data_file.exists():
-            try:
-                data = json.loads(data_file.read_text())
-                if data.get('profile') and data['profile'].get('name'):
-                    existing.add('profile')
-                if data.get('biography') and data['biography'].strip():
-                    existing.add('bio')
-                if data.get('portfolio') and len(data['portfolio']) > 0:
-                    existing.add('portfolio')
-                if data.get('awards') and len(data['awards']) > 0:
-                    existing.add('awards')
-                if data.get('interviews') and len(data['interviews']) > 0:
-                    existing.add('interviews')
-            except:
-                pass
-        return set(SECTIONS) - existing
+    def get_missing_sections(self, name: str, sections: int = None) -> Set[str]:
+        """Missing SECTIONS from the index bitmask; reads the record only when none is known"""
+        if sections is None:
+            data = self.store.load(self.location, name)
+            sections = section_mask(data) if data else 0
+        return missing_sections(sections)
     
     def init_driver(self):
         """Initialize Selenium with stealth mode to avoid detection"""
+        # The browser stack loads only when a scraper actually starts
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium_stealth import stealth
+
         if self.driver:
             try:
                 self.driver.quit()
@@ -170,7 +183,19 @@ class JournalistScraper:
         except Exception as e:
             logger.debug(f"Scroll error: {e}")
     
-    def fetch_page(self, url: str, wait_    for_selector: str = None) -> str:
+    def wait_for(self, selector: str, timeout: float = 20):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+            )
+        except Exception as e:
+            logger.debug(f"Element wait timeout: {e}")
+    
+    def fetch_page(self, url: str, wait_for_selector: str = None, name: str = None) -> str:
         """Fetch page with human-like behavior"""
         try:
             # Reinitialize driver periodically
@@ -217,152 +242,31 @@ class JournalistScraper:
             
             # Wait for specific content if selector provided
             if wait_for_selector:
-                try:
-                    WebDriverWait(self.driver, 20).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, wait_for_selector))
-                    )
-                except Exception as e:
-                    logger.debug(f"Element wait timeout: {e}")
+                self.wait_for(wait_for_selector)
             
             # Final check
             if 'Just a moment' in html or len(html) < 5000:
                 logger.warning("⚠️ Page may not be fully loaded")
                 return None
             
+            if self.archive is not None:
+                self.archive.append(url, html, self.location, name)
+            
             return html
             
         except Exception as e:
             logger.error(f"❌ Fetch error: {str(e)[:100]}")
             return None
     
-    def parse_profile(self, soup):
-        intro = soup.select_one('div.profile-section.profile-intro')
-        if not intro:
-            return {}
-        c = intro.select_one('div.mr-card-content')
-        if not c:
-            return {}
-        
-        pronouns = ''
-        if p := c.select_one('div.fs-6.text-muted.fw-light'):
-            pronouns = p.get_text(strip=True)
-        
-        intro_text = ''
-        if desc := c.select_one('div.fs-5.fs-md-6.my-5'):
-            intro_text = desc.get_text(strip=True)
-        
-        jobs = []
-        for li in c.select('ul.mr-person-job-items li'):
-            text = li.get_text(strip=True).replace('\uf1ad', '').strip()
-            a = li.select_one('a')
-            if ',' in text and a:
-                title = text.split(',')[0].strip()
-                href = a.get('href', '')
-                full_url = href if href.startswith('http') else f"https://muckrack.com{href}"
-                jobs.append({'title': title, 'outlet': a.get_text(strip=True), 'outletLink': full_url})
-        
-        covers = doesnt_cover = ''
-        for item in c.select('div.profile-details-item'):
-            txt = item.get_text()
-            if 'Covers:' in txt:
-                covers = txt.split('Covers:', 1)[1].strip()
-            elif "Doesn't Cover:" in txt:
-                doesnt_cover = txt.split("Doesn't Cover:", 1)[1].strip()
-        
-        return {
-            'avatar': (img.get('src', '') if (img := c.select_one('img[src*="profile/images"]')) else ''),
-            'name': (h1.get_text(strip=True) if (h1 := c.select_one('h1.profile-name')) else ''),
-            'pronouns': pronouns,
-            'verified': bool(c.select_one('small.profile-verified')),
-            'jobs': jobs,
-            'location': (s.get_text(strip=True) if (s := c.select_one('div.person-details-location span')) else ''),
-            'beats': [{'name': a.get_text(strip=True), 'link': f"https://muckrack.com{a.get('href', '')}"} for a in c.select('div.person-details-beats a')],
-            'asSeenIn': [{'name': a.get_text(strip=True), 'link': f"https://muckrack.com{a.get('href', '')}"} for a in c.select('div.profile-details-item a')],
-            'socialHandles': [{'handle': a.get_text(strip=True), 'link': a.get('href', '')} for a in c.select('a.tweet-url.username')],
-            'covers': covers,
-            'doesnt_cover': doesnt_cover,
-            'intro': intro_text
-        }
-    
-    def parse_bio(self, soup):
-        bio_div = soup.select_one('div.profile-section.profile-bio div.mr-card-content')
-        if not bio_div:
-            return ''
-        paragraphs = [p.get_text(strip=True) for p in bio_div.select('p') if p.get_text(strip=True)]
-        return '\n\n'.join(paragraphs)
-    
-    def parse_articles(self, soup):
-        articles = []
-        for item in soup.select('div.portfolio-item-container'):
-            article = {}
-            if h3 := item.select_one('h3.portfolio-item-title'):
-                article['title'] = h3.get_text(strip=True)
-            if link := item.select_one('a.portfolio-item-hover'):
-                article['link'] = link.get('href', '')
-            if date_span := item.select_one('span.date'):
-                article['date'] = date_span.get_text(strip=True)
-            else:
-                article['date'] = ''
-            if p := item.select_one('div.preview-contents p'):
-                article['description'] = p.get_text(strip=True)
-            else:
-                article['description'] = ''
-            if img := item.select_one('img'):
-                article['image'] = img.get('src', '')
-            else:
-                article['image'] = ''
-            article['outlet'] = ''
-            if pub_div := item.select_one('div.portfolio-item-publication a'):
-                classes = pub_div.get('class', [])
-                for cls in classes:
-                    if 'sprite-group-thumbnails-' in cls:
-                        article['outlet'] = cls.replace('sprite-group-thumbnails-', '').title()
-                        break
-            if article.get('title'):
-                articles.append(article)
-        return articles
-    
-    def parse_awards(self, soup):
-        awards = []
-        for item in soup.select('div.profile-award'):
-            award = {}
-            if h4 := item.select_one('h4.item-header'):
-                award['title'] = h4.get_text(strip=True)
-            if h5 := item.select_one('h5'):
-                text = h5.get_text(strip=True)
-                parts = text.split('-', 1)
-                if len(parts) == 2:
-                    award['year'] = parts[0].strip()
-                    award['award_name'] = parts[1].strip()
-                else:
-                    award['year'] = text
-                    award['award_name'] = ''
-            if p := item.select_one('p.mt-4'):
-                award['description'] = p.get_text(strip=True)
-            else:
-                award['description'] = ''
-            if award:
-                awards.append(award)
-        return awards
-    
-    def parse_interviews(self, soup):
-        interviews = []
-        for item in soup.select('div.profile-interview-answer'):
-            interview = {}
-            if h4 := item.select_one('h4'):
-                interview['question'] = h4.get_text(strip=True)
-            if answer_div := item.select_one('div.interview-answer'):
-                interview['answer'] = answer_div.get_text(strip=True)
-            if interview:
-                interviews.append(interview)
-        return interviews
-    
     def scrape_journalist(self, journalist: Dict) -> bool:
         name = journalist['name']
         url = journalist['link']
         journalist_id = url.split('/')[-1]
         
-        missing = self.get_missing_sections(name)
+        if 'missing' in journalist:
+            missing = set(journalist['missing'])
+        else:
+            missing = self.get_missing_sections(name, journalist.get('sections'))
         if not missing:
             logger.info(f"✅ {name}: Complete")
             self.stats['skipped'] += 1
@@ -370,54 +274,53 @@ class JournalistScraper:
         
         logger.info(f"🔄 {name}: Missing {missing}")
         
-        data_file = DATA_DIR / self.location / name / f'{name}.json'
-        data = json.loads(data_file.read_text()) if data_file.exists() else {'name': name, 'link': url}
+        data = self.store.load(self.location, name) or {'name': name, 'link': url}
         data['url'] = url
         
         try:
             start_time = time.time()
             
             # Fetch main profile
-            html = self.fetch_page(url, "div.mr-card-content, h1.profile-name")
+            html = self.fetch_page(url, "div.mr-card-content, h1.profile-name", name)
             
             if not html:
                 raise Exception("Failed to fetch main page")
             
-            soup = BeautifulSoup(html, 'lxml')
+            page = extract_page(html)
             
             # Parse sections
             if 'profile' in missing:
-                data['profile'] = self.parse_profile(soup)
+                data['profile'] = page['profile']
             
             if 'bio' in missing:
-                bio = self.parse_bio(soup)
+                bio = page['biography']
                 if not bio or len(bio) < 100:
                     time.sleep(random.uniform(3, 6))
-                    bio_html = self.fetch_page(f'https://muckrack.com/{journalist_id}/bio')
+                    bio_html = self.fetch_page(f'https://muckrack.com/{journalist_id}/bio', name=name)
                     if bio_html:
-                        full_bio = self.parse_bio(BeautifulSoup(bio_html, 'lxml'))
+                        full_bio = extract_bio(bio_html)
                         if full_bio:
                             bio = full_bio
                 data['biography'] = bio
             
             if 'portfolio' in missing:
                 time.sleep(random.uniform(3, 6))
-                port_html = self.fetch_page(f'https://muckrack.com/{journalist_id}/portfolio')
+                port_html = self.fetch_page(f'https://muckrack.com/{journalist_id}/portfolio', name=name)
                 if port_html:
-                    data['portfolio'] = self.parse_articles(BeautifulSoup(port_html, 'lxml'))
+                    data['portfolio'] = extract_page(port_html)['portfolio']
                     data['portfolio_count'] = len(data['portfolio'])
             
             if 'awards' in missing:
                 time.sleep(random.uniform(3, 6))
-                award_html = self.fetch_page(f'https://muckrack.com/{journalist_id}/awards')
+                award_html = self.fetch_page(f'https://muckrack.com/{journalist_id}/awards', name=name)
                 if award_html:
-                    data['awards'] = self.parse_awards(BeautifulSoup(award_html, 'lxml'))
+                    data['awards'] = extract_page(award_html)['awards']
             
             if 'interviews' in missing:
                 time.sleep(random.uniform(3, 6))
-                int_html = self.fetch_page(f'https://muckrack.com/{journalist_id}/interview')
+                int_html = self.fetch_page(f'https://muckrack.com/{journalist_id}/interview', name=name)
                 if int_html:
-                    data['interviews'] = self.parse_interviews(BeautifulSoup(int_html, 'lxml'))
+                    data['interviews'] = extract_page(int_html)['interviews']
             
             # Set defaults
             data.setdefault('profile', {})
@@ -428,19 +331,19 @@ class JournalistScraper:
             data.setdefault('interviews', [])
             data['scraped_at'] = datetime.now().isoformat()
             
-            # Save
-            data_file.parent.mkdir(parents=True, exist_ok=True)
-            data_file.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+            # Save, unless nothing but scraped_at changed
+            _, written = save_record(self.store, self.index, self.location, name, data, DATA_DIR)
             
             elapsed = time.time() - start_time
-            logger.info(f"✅ {name}: Done in {elapsed:.1f}s")
+            logger.info(f"✅ {name}: {'Done' if written else 'Unchanged'} in {elapsed:.1f}s")
+            self.failures.resolve(url)
             self.stats['completed'] += 1
             self.consecutive_failures = 0
             return True
             
         except Exception as e:
             logger.error(f"❌ {name}: {e}")
-            self._save_failed(name, url, str(e))
+            self._save_failed(name, url, e)
             self.stats['failed'] += 1
             self.consecutive_failures += 1
             
@@ -452,12 +355,8 @@ class JournalistScraper:
             
             return False
     
-    def _save_failed(self, name: str, url: str, error: str):
-        FAILED_DIR.mkdir(parents=True, exist_ok=True)
-        failed_file = FAILED_DIR / f"{self.location}_failed.json"
-        failed_data = json.loads(failed_file.read_text()) if failed_file.exists() else []
-        failed_data.append({'name': name, 'url': url, 'error': error, 'timestamp': datetime.now().isoformat()})
-        failed_file.write_text(json.dumps(failed_data, indent=2, ensure_ascii=False))
+    def _save_failed(self, name: str, url: str, error):
+        self.failures.record(name, url, self.location, error)
     
     def process_location(self, journalists: List[Dict]):
         completed = self.load_checkpoint()
@@ -465,6 +364,11 @@ class JournalistScraper:
         
         remaining = [j for j in journalists if j['name'] not in completed]
         
+        # Requeued failures go first
+        requeued = self.failures.requeued(self.location)
+        if requeued:
+            remaining.sort(key=lambda j: j['link'] not in requeued)
+        
         logger.info(f"🚀 {self.location}: {len(journalists)} total, {len(remaining)} remaining")
         
         if not remaining:
@@ -472,20 +376,38 @@ class JournalistScraper:
             return
         
         start_time = time.time()
+        self.scrape_all(remaining, len(completed), len(journalists))
+        self.close()
         
-        for i, j in enumerate(remaining, 1):
+        elapsed = time.time() - start_time
+        logger.info(f"\n🎉 {self.location} done in {elapsed/60:.1f} minutes!")
+        self.log_stats()
+    
+    def process_plan(self, items: Iterable[Dict], total: int):
+        """Scrape plan items in their global order with one browser, switching location per item"""
+        self.stats['total'] = total
+        start_time = time.time()
+        self.scrape_all(items, 0, total)
+        self.close()
+        
+        elapsed = time.time() - start_time
+        logger.info(f"\n🎉 Plan done in {elapsed/60:.1f} minutes!")
+        self.log_stats()
+    
+    def scrape_all(self, journalists: Iterable[Dict], done: int, total: int):
+        for i, j in enumerate(journalists, 1):
+            if 'location' in j:
+                self.set_location(j['location'])
             logger.info(f"\n{'='*60}")
-            logger.info(f"📦 {i}/{len(remaining)} (Total: {len(completed) + i}/{len(journalists)})")
+            logger.info(f"📦 {i} (Total: {done + i}/{total})")
             
             try:
                 success = self.scrape_journalist(j)
                 
                 if success:
-                    completed.add(j['name'])
+                    self.checkpoint.append(j['name'])
                     
-                    # Save checkpoint every journalist
                     if i % 3 == 0:
-                        self.save_checkpoint(completed)
                         self.log_stats()
                 
             except Exception as e:
@@ -504,44 +426,62 @@ class JournalistScraper:
                 logger.info(f"⏸️ Short delay: {delay:.1f}s")
             
             time.sleep(delay)
-        
-        self.save_checkpoint(completed)
-        
-        elapsed = time.time() - start_time
-        logger.info(f"\n🎉 {self.location} done in {elapsed/60:.1f} minutes!")
-        self.log_stats()
-        
-        if self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
 
-def main():
-    for location_dir in DATA_DIR.glob('*'):
-        if not location_dir.is_dir():
-            continue
-        
-        scraper = JournalistScraper(location_dir.name)
-        journalists = []
-        
-        for journalist_dir in location_dir.glob('*'):
-            if not journalist_dir.is_dir():
-                continue
-            json_file = journalist_dir / f'{journalist_dir.name}.json'
-            if json_file.exists():
-                try:
-                    data = json.loads(json_file.read_text())
-                    url = data.get('url') or data.get('link')
-                    if url:
-                        journalists.append({'name': journalist_dir.name, 'link': url})
-                except:
-                    pass
+def run_locations(index: ScrapeIndex, archive: PageArchive, store):
+    """Scrape missing sections location by location, planned from the scrape-state index
+
+    The index holds one row per journalist_id, under the location its record
+    was last saved in. A journalist filed under several locations is therefore
+    scraped once, for that location only; copies in the other location
+    directories are not revisited (registry.py dedupe folds them together).
+    """
+    # Plan from the completeness bitmaps: complete journalists never reach the scraper
+    for location in index.locations():
+        rows = index.iter_location(location)
+        journalists = [{'name': name_from_path(path), 'link': url, 'sections': sections}
+                       for _, url, path, sections in rows if path and sections != ALL_SECTIONS]
         
         if journalists:
-            logger.info(f"📍 {location_dir.name}: {len(journalists)} journalists")
+            logger.info(f"📍 {location}: {len(journalists)} journalists with missing sections")
+            scraper = JournalistScraper(location, index, archive, store)
             scraper.process_location(journalists)
 
+def run_plan(plan_file: Path, index: ScrapeIndex, archive: PageArchive, store):
+    """Consume a planner.py plan: one global order across locations, one scraper and browser throughout"""
+    plan = load_plan(plan_file)
+    logger.info(f"🗺️ Plan {plan_file}: {len(plan['items'])} journalists, {plan['pages']} pages")
+    items = pending_items(plan, index)
+    first = next(items, None)
+    if first is None:
+        logger.info("✅ Nothing left in the plan")
+        return
+    scraper = JournalistScraper(first['location'], index, archive, store)
+    try:
+        scraper.process_plan(({'name': item['name'], 'link': item['url'], 'missing': item['sections'],
+                               'location': item['location']} for item in chain([first], items)),
+                             len(plan['items']))
+    finally:
+        scraper.close()
+
+def main():
+    setup_logging()
+    index = ScrapeIndex()
+    store = open_store(index=index)
+    # --archive keeps every fetched page so parsers can be re-run offline (reparse.py --archive)
+    archive = PageArchive() if '--archive' in sys.argv[1:] else None
+    # --plan[=file] follows the order written by planner.py build
+    plan_file = next((Path(arg.split('=', 1)[1]) if '=' in arg else PLAN_FILE
+                      for arg in sys.argv[1:] if arg.split('=')[0] == '--plan'), None)
+    index.ensure_built(store, DATA_DIR)
+    if plan_file is not None:
+        run_plan(plan_file, index, archive, store)
+    else:
+        run_locations(index, archive, store)
+    
+    if archive is not None:
+        archive.close()
+    store.close()
+
 if __name__ == '__main__':
     try:
         main()
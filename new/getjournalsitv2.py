@@ -8,9 +8,14 @@ from typing import Dict, List, Set
 import time
 import random
 from urllib.parse import quote
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+
+from atomic_write import atomic_write
+from checkpoint_log import CheckpointLog
+from page_snapshot import PageSnapshot, PageStats
+from location_lists import JournalistRef, LocationLists, group_missing
+from record_store import TreeStore, open_store, record_key, save_record
+from registry import JournalistRegistry
+from scrape_index import ScrapeIndex, journalist_id_from_url
 
 # Configuration
 BASE_DIR = Path(__file__).parent.parent
@@ -20,19 +25,21 @@ FAILED_DIR = BASE_DIR / "muckrack" / "failed"
 LOG_DIR = BASE_DIR / "logs"
 CHECKPOINT_DIR = BASE_DIR / "checkpoints"
 
-# Create directories
-for d in [DATA_DIR, FAILED_DIR, LOG_DIR, CHECKPOINT_DIR]:
-    d.mkdir(parents=True, exist_ok=True)
-
-# Logging setup
-log_file = LOG_DIR / f'scraper_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[logging.StreamHandler(), logging.FileHandler(log_file)]
-)
 logger = logging.getLogger(__name__)
 
+def setup_logging():
+    """Create output directories and the run log; called by main(), never at import"""
+    for d in [DATA_DIR, FAILED_DIR, LOG_DIR, CHECKPOINT_DIR]:
+        d.mkdir(parents=True, exist_ok=True)
+
+    log_file = LOG_DIR / f'scraper_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        handlers=[logging.StreamHandler(), logging.FileHandler(log_file)]
+    )
+    return log_file
+
 def get_random_user_agent():
     """Rotate user agents"""
     agents = [
@@ -108,9 +115,13 @@ class JournalistScraper:
     def __init__(self, location_name: str):
         self.location = location_name
         self.driver = None
+        self.page_stats = PageStats()
         
     def init_driver(self):
         """Initialize Selenium driver"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
         if self.driver:
             try:
                 self.driver.quit()
@@ -130,8 +141,8 @@ class JournalistScraper:
         self.driver = webdriver.Chrome(options=options)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
-    def try_navigate(self, url: str, max_retries: int = 3) -> bool:
-        """Navigate with retries"""
+    def try_navigate(self, url: str, max_retries: int = 3):
+        """Navigate with retries; returns a PageSnapshot of the loaded page or None"""
         for attempt in range(1, max_retries + 1):
             try:
                 if attempt > 1:
@@ -141,121 +152,38 @@ class JournalistScraper:
                 self.driver.get(url)
                 time.sleep(random.uniform(0.5, 1.0))
                 
-                if 'mr-card-content' in self.driver.page_source:
-                    return True
+                snapshot = PageSnapshot(self.driver, self.page_stats)
+                if 'mr-card-content' in snapshot.html:
+                    return snapshot
                     
             except Exception as e:
                 if attempt == max_retries:
                     logger.error(f"Failed to load {url}: {e}")
-                    return False
+                    return None
                 time.sleep(2)
-        return False
-    
-    def prepend_base_url(self, link: str) -> str:
-        if not link or link.startswith('http'):
-            return link
-        return f'https://muckrack.com{link}'
+        return None
     
-    def extract_profile(self) -> dict:
+    def extract_profile(self, snapshot: PageSnapshot) -> dict:
         """Extract profile data"""
-        soup = BeautifulSoup(self.driver.page_source, 'lxml')
-        container = soup.select_one('div.mr-card-content')
-        if not container:
-            return {}
-        
-        profile = {}
-        
-        # Avatar
-        if img := container.select_one('img[src*="profile/images"]'):
-            profile['avatar'] = img.get('src', '')
-        
-        # Name
-        if name := container.select_one('h1.profile-name'):
-            profile['name'] = name.get_text(strip=True)
-        
-        # Verified
-        profile['verified'] = bool(container.select_one('small.profile-verified'))
-        
-        # Jobs
-        jobs = []
-        for item in container.select('ul.mr-person-job-items li.mr-person-job-item'):
-            outlet = item.select_one('a')
-            if outlet:
-                text = item.get_text(strip=True)
-                title = text.split(',')[0].strip()
-                jobs.append({
-                    'title': title,
-                    'outlet': outlet.get_text(strip=True),
-                    'outletLink': self.prepend_base_url(outlet.get('href', ''))
-                })
-        profile['jobs'] = jobs
-        
-        # Location
-        if loc := container.select_one('div.person-details-location span'):
-            profile['location'] = loc.get_text(strip=True)
-        
-        # Beats
-        beats = []
-        if beats_div := container.select_one('div.person-details-beats div'):
-            for a in beats_div.select('a'):
-                beats.append({
-                    'name': a.get_text(strip=True),
-                    'link': self.prepend_base_url(a.get('href', ''))
-                })
-        profile['beats'] = beats
-        
-        # As seen in
-        as_seen = []
-        for item in container.select('div.profile-details-item a'):
-            as_seen.append({
-                'name': item.get_text(strip=True),
-                'link': self.prepend_base_url(item.get('href', ''))
-            })
-        if hidden_span := container.select_one('span.js-as-seen-in-hidden'):
-            for a in hidden_span.select('a'):
-                as_seen.append({
-                    'name': a.get_text(strip=True),
-                    'link': self.prepend_base_url(a.get('href', ''))
-                })
-        profile['asSeenIn'] = as_seen
-        
-        # Covers
-        profile['covers'] = ''
-        profile['doesntCover'] = ''
-        for item in container.select('div.profile-details-item'):
-            txt = item.get_text()
-            if 'Covers:' in txt:
-                profile['covers'] = txt.split('Covers:', 1)[1].strip()
-            elif "Doesn't Cover:" in txt:
-                profile['doesntCover'] = txt.split("Doesn't Cover:", 1)[1].strip()
-        
-        # Social & intro
-        handles = []
-        if social := container.select_one('div.fs-5.fs-md-6.my-5'):
-            for a in social.select('a.tweet-url.username'):
-                handles.append({
-                    'handle': a.get_text(strip=True),
-                    'link': self.prepend_base_url(a.get('href', ''))
-                })
-            profile['intro'] = social.get_text(strip=True)
-        profile['socialHandles'] = handles
-        
-        return profile
+        return snapshot.page['profile']
     
-    def scrape_journalist(self, journalist: Dict) -> Dict:
+    def scrape_journalist(self, journalist: JournalistRef) -> Dict:
         """Scrape single journalist"""
-        url = journalist['url']
+        url = journalist.url
+        self.page_stats.reset()
         
         self.init_driver()
         
-        if not self.try_navigate(url):
+        snapshot = self.try_navigate(url)
+        if not snapshot:
             raise Exception('Navigation failed')
         
-        profile = self.extract_profile()
+        profile = self.extract_profile(snapshot)
+        logger.debug(f"📊 {url}: {self.page_stats.summary()}")
         
         return {
             'url': url,
-            'name': profile.get('name', journalist['name']),
+            'name': profile.get('name', journalist.name),
             'profile': profile,
             'scraped_at': datetime.now().isoformat()
         }
@@ -268,127 +196,92 @@ class JournalistScraper:
             except:
                 pass
 
-def load_checkpoint(location):
-    """Load checkpoint"""
-    checkpoint_file = CHECKPOINT_DIR / f"{location}_checkpoint.json"
-    if checkpoint_file.exists():
-        with open(checkpoint_file, 'r') as f:
-            data = json.load(f)
-            return set(data.get('scraped_urls', []))
-    return set()
-
-def save_checkpoint(location, scraped_urls):
-    """Save checkpoint"""
-    checkpoint_file = CHECKPOINT_DIR / f"{location}_checkpoint.json"
-    with open(checkpoint_file, 'w') as f:
-        json.dump({
-            'location': location,
-            'scraped_urls': list(scraped_urls),
-            'timestamp': datetime.now().isoformat()
-        }, f, indent=2)
+def open_checkpoint(location):
+    """Open the append-only checkpoint journal for a location"""
+    return CheckpointLog(
+        CHECKPOINT_DIR / f"{location}_checkpoint",
+        legacy_file=CHECKPOINT_DIR / f"{location}_checkpoint.json",
+        legacy_key='scraped_urls'
+    )
 
-def save_journalist_data(journalist, data):
-    """Save journalist data"""
-    location = sanitize_filename(journalist['location'])
-    name = sanitize_filename(journalist['name'])
+def save_journalist_data(journalist, data, index=None, store=None, registry=None):
+    """Save journalist data to the record store and the scrape-state index; returns its key"""
+    location = sanitize_filename(journalist.location)
+    name = sanitize_filename(journalist.name)
+    if registry is not None:
+        # One record per person, naming every location list it appears in
+        data['locations'] = registry.locations(journalist_id_from_url(journalist.url)) or [journalist.location]
     
-    journalist_dir = DATA_DIR / location / name
-    journalist_dir.mkdir(parents=True, exist_ok=True)
-    
-    json_path = journalist_dir / f"{name}.json"
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    
-    return json_path
+    store = store if store is not None else TreeStore(DATA_DIR)
+    key, _ = save_record(store, index, location, name, data, DATA_DIR)
+    return key
 
 def save_failed(journalist, error):
     """Save failed journalist"""
-    location = sanitize_filename(journalist['location'])
-    name = sanitize_filename(journalist['name'])
+    location = sanitize_filename(journalist.location)
+    name = sanitize_filename(journalist.name)
     
     failed_dir = FAILED_DIR / location
     failed_dir.mkdir(parents=True, exist_ok=True)
     
     json_path = failed_dir / f"{name}.json"
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            'url': journalist['url'],
-            'name': journalist['name'],
-            'location': journalist['location'],
-            'error': str(error),
-            'failed_at': datetime.now().isoformat()
-        }, f, indent=2)
+    atomic_write(json_path, json.dumps({
+        'url': journalist.url,
+        'name': journalist.name,
+        'location': journalist.location,
+        'error': str(error),
+        'failed_at': datetime.now().isoformat()
+    }, indent=2))
     
     return json_path
 
 def get_all_journalists():
-    """Load all journalists from locations"""
-    all_journalists = []
-    locations = []
-    
-    for json_file in sorted(LOCATIONS_DIR.glob("*.json")):
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            location = data.get('location', json_file.stem).title()
-            journalists = data.get('journalists', [])
-            
-            locations.append({'name': location, 'count': len(journalists)})
-            
-            for j in journalists:
-                all_journalists.append({
-                    'name': j['name'],
-                    'url': j['url'],
-                    'location': location
-                })
-    
-    return all_journalists, locations
+    """Location lists, streamed from the compiled manifest"""
+    return LocationLists(LOCATIONS_DIR)
 
-def get_already_scraped():
-    """Get already scraped URLs"""
-    scraped = set()
-    if DATA_DIR.exists():
-        for json_file in DATA_DIR.rglob("*.json"):
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if 'url' in data:
-                        scraped.add(data['url'])
-            except:
-                pass
-    return scraped
+def get_already_scraped(index, store=None):
+    """Get already scraped URLs from the scrape-state index"""
+    if index.is_empty():
+        logger.info("🗂️ Scrape index empty, rebuilding...")
+        result = index.ensure_built(store, DATA_DIR)
+        if result:
+            logger.info(f"🗂️ Indexed {result['indexed']:,} profiles in {result['seconds']:.1f}s")
+    return index.scraped_urls()
 
 def main():
+    log_file = setup_logging()
     print("\n" + "="*80)
     print("🚀 JOURNALIST SCRAPER - PRODUCTION VERSION")
     print("="*80 + "\n")
     
     # Load data
     logger.info("🔍 Scanning already scraped...")
-    already_scraped = get_already_scraped()
+    index = ScrapeIndex()
+    store = open_store(index=index)
+    already_scraped = get_already_scraped(index, store)
     logger.info(f"✅ Found {len(already_scraped):,} already scraped")
     
     logger.info("📋 Loading journalists...")
-    all_journalists, locations = get_all_journalists()
-    logger.info(f"✅ Total: {len(all_journalists):,} across {len(locations)} locations")
+    lists = get_all_journalists()
+    logger.info(f"✅ Total: {lists.total():,} across {len(lists.files)} locations "
+                f"({lists.rebuilt} lists recompiled)")
+    registry = JournalistRegistry()
+    registry.refresh(lists)
+    counts = registry.counts()
+    logger.info(f"🧬 {counts['unique']:,} unique journalists, {counts['duplicates']:,} duplicate listings "
+                f"scheduled once")
     
-    # Find missing
-    missing = [j for j in all_journalists if j['url'] not in already_scraped]
-    logger.info(f"🎯 Missing: {len(missing):,}")
+    # Find missing, grouped by location in one streaming pass
+    missing_by_location = group_missing(lists, already_scraped)
+    missing = sum(len(js) for js in missing_by_location.values())
+    logger.info(f"🎯 Missing: {missing:,}")
     
     if not missing:
         logger.info("✅ All done!")
         return
     
-    # Group by location
-    missing_by_location = {}
-    for j in missing:
-        loc = j['location']
-        if loc not in missing_by_location:
-            missing_by_location[loc] = []
-        missing_by_location[loc].append(j)
-    
     # Initialize tracker
-    tracker = ProgressTracker(len(missing), len(missing_by_location))
+    tracker = ProgressTracker(missing, len(missing_by_location))
     
     # Process each location
     for loc_idx, (location_name, journalists) in enumerate(sorted(missing_by_location.items(), key=lambda x: len(x[1]), reverse=True), 1):
@@ -400,10 +293,11 @@ def main():
         logger.info(f"{'='*80}\n")
         
         scraper = JournalistScraper(location_name)
-        checkpoint_urls = load_checkpoint(location_name)
+        checkpoint = open_checkpoint(location_name)
+        checkpoint_urls = checkpoint.load()
         
         for idx, journalist in enumerate(journalists, 1):
-            if journalist['url'] in checkpoint_urls:
+            if journalist.url in checkpoint_urls:
                 tracker.update(skipped=1)
                 continue
                 
@@ -411,29 +305,24 @@ def main():
                 start = time.time()
                 
                 # Print with clickable path
-                location_clean = sanitize_filename(journalist['location'])
-                name_clean = sanitize_filename(journalist['name'])
-                path = DATA_DIR / location_clean / name_clean / f"{name_clean}.json"
-                clickable = f"file://{quote(str(path.absolute()))}"
+                location_clean = sanitize_filename(journalist.location)
+                name_clean = sanitize_filename(journalist.name)
+                clickable = store.describe(record_key(location_clean, name_clean))
                 
-                print(f"\n[{idx}/{len(journalists)}] 👤 {journalist['name'][:50]}")
-                print(f"🔗 {journalist['url']}")
+                print(f"\n[{idx}/{len(journalists)}] 👤 {journalist.name[:50]}")
+                print(f"🔗 {journalist.url}")
                 print(f"💾 {clickable}")
                 
                 # Scrape
                 data = scraper.scrape_journalist(journalist)
                 
                 # Save
-                saved_path = save_journalist_data(journalist, data)
-                print(f"✅ Saved: file://{quote(str(saved_path.absolute()))}")
+                saved_key = save_journalist_data(journalist, data, index, store, registry)
+                print(f"✅ Saved: {store.describe(saved_key)}")
                 
                 elapsed = time.time() - start
                 tracker.update(scraped=1, elapsed=elapsed)
-                checkpoint_urls.add(journalist['url'])
-                
-                # Checkpoint every 10
-                if tracker.scraped % 10 == 0:
-                    save_checkpoint(location_name, checkpoint_urls)
+                checkpoint.append(journalist.url)
                 
                 # Progress every 5
                 if idx % 5 == 0:
@@ -450,7 +339,7 @@ def main():
             finally:
                 scraper.cleanup()
         
-        save_checkpoint(location_name, checkpoint_urls)
+        checkpoint.close()
         logger.info(f"\n✅ Location '{location_name}' complete!")
         tracker.print_status()
     
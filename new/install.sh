@@ -6,7 +6,7 @@ echo ""
 pip3 install --upgrade pip
 
 echo "📦 Installing packages..."
-pip3 install cloudscraper beautifulsoup4 selenium undetected-chromedriver
+pip3 install cloudscraper beautifulsoup4 lxml selenium undetected-chromedriver
 
 echo ""
 echo "✅ Installation complete!"
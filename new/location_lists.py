@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Streaming loader for journalistv2/locations/*.json with a binary manifest cache.
+
+The 40-odd location files are compiled into ``journalistv2/locations.manifest``:
+one block per source file holding NUL-joined names and URL slugs. A block is
+re-encoded only when its source file's mtime or size changes, so a normal
+startup reads one small binary file instead of parsing every JSON list.
+
+    lists = LocationLists()
+    for ref in lists:                 # JournalistRef(name, url, location), lazily
+        ...
+"""
+import json
+import os
+import struct
+from itertools import repeat
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+from atomic_write import atomic_write
+
+BASE_DIR = Path(__file__).parent.parent
+LOCATIONS_DIR = BASE_DIR / 'journalistv2' / 'locations'
+MANIFEST_FILE = BASE_DIR / 'journalistv2' / 'locations.manifest'
+
+MAGIC = b'MRLOC1\n'
+BLOCK_HEAD = struct.Struct('<II')
+HEADER_LEN = struct.Struct('<I')
+URL_PREFIX = 'https://muckrack.com/'
+
+
+class JournalistRef(NamedTuple):
+    name: str
+    url: str
+    location: str
+
+
+def location_name(data: Dict, json_file: Path) -> str:
+    """Same naming as the scrapers: the file's location field, title-cased"""
+    return data.get('location', json_file.stem).title()
+
+
+def iter_location_file(json_file: Path) -> Iterator[JournalistRef]:
+    """One location list, without the manifest"""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    location = location_name(data, json_file)
+    for j in data.get('journalists', []):
+        yield JournalistRef(j['name'], j['url'], location)
+
+
+def _encode_block(json_file: Path) -> Tuple[str, int, bytes]:
+    refs = list(iter_location_file(json_file))
+    location = refs[0].location if refs else location_name({}, json_file)
+    names = '\0'.join(r.name for r in refs).encode('utf-8')
+    slugs = '\0'.join(r.url[len(URL_PREFIX):] if r.url.startswith(URL_PREFIX) else r.url
+                      for r in refs).encode('utf-8')
+    return location, len(refs), BLOCK_HEAD.pack(len(names), len(slugs)) + names + slugs
+
+
+def _decode_block(block: bytes, location: str) -> Iterator[JournalistRef]:
+    names_len, slugs_len = BLOCK_HEAD.unpack_from(block)
+    if not names_len and not slugs_len:
+        return
+    start = BLOCK_HEAD.size
+    names = block[start:start + names_len].decode('utf-8').split('\0')
+    slugs = block[start + names_len:start + names_len + slugs_len].decode('utf-8').split('\0')
+    urls = [slug if '://' in slug else URL_PREFIX + slug for slug in slugs]
+    yield from map(JournalistRef._make, zip(names, urls, repeat(location)))
+
+
+class LocationLists:
+    """Location lists served from the manifest, recompiling only changed source files"""
+
+    def __init__(self, locations_dir: Path = LOCATIONS_DIR, manifest_file: Path = MANIFEST_FILE):
+        self.locations_dir = locations_dir
+        self.manifest_file = manifest_file
+        self.files: Dict[str, Dict] = {}
+        self.data_start = 0
+        self.rebuilt = 0
+        self.refresh()
+
+    def _read_manifest(self) -> Tuple[Dict, int]:
+        try:
+            with open(self.manifest_file, 'rb') as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    return {}, 0
+                (header_len,) = HEADER_LEN.unpack(f.read(HEADER_LEN.size))
+                header = json.loads(f.read(header_len))
+                return header['files'], len(MAGIC) + HEADER_LEN.size + header_len
+        except (FileNotFoundError, ValueError, struct.error, KeyError):
+            return {}, 0
+
+    def refresh(self) -> int:
+        """Recompile blocks whose source changed; returns how many were re-encoded"""
+        files, data_start = self._read_manifest()
+        sources = {}
+        if self.locations_dir.exists():
+            with os.scandir(self.locations_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.json') and entry.is_file():
+                        st = entry.stat()
+                        sources[entry.name] = (st.st_mtime_ns, st.st_size)
+
+        if files and sources.keys() == files.keys() and all(
+                (files[n]['mtime_ns'], files[n]['size']) == sources[n] for n in sources):
+            self.files, self.data_start, self.rebuilt = files, data_start, 0
+            return 0
+
+        blocks, new_files, rebuilt = [], {}, 0
+        offset = 0
+        for filename in sorted(sources):
+            old = files.get(filename)
+            if old and (old['mtime_ns'], old['size']) == sources[filename]:
+                with open(self.manifest_file, 'rb') as f:
+                    f.seek(data_start + old['offset'])
+                    block = f.read(old['length'])
+                location, count = old['location'], old['count']
+            else:
+                location, count, block = _encode_block(self.locations_dir / filename)
+                rebuilt += 1
+            new_files[filename] = {'mtime_ns': sources[filename][0], 'size': sources[filename][1],
+                                   'location': location, 'count': count, 'offset': offset,
+                                   'length': len(block)}
+            blocks.append(block)
+            offset += len(block)
+
+        header = json.dumps({'files': new_files}).encode('utf-8')
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.manifest_file, b''.join([MAGIC, HEADER_LEN.pack(len(header)), header, *blocks]))
+        self.files = new_files
+        self.data_start = len(MAGIC) + HEADER_LEN.size + len(header)
+        self.rebuilt = rebuilt
+        return rebuilt
+
+    def locations(self) -> List[Tuple[str, int]]:
+        """(location, journalist count) per source file, from the header alone"""
+        return [(meta['location'], meta['count']) for _, meta in sorted(self.files.items())]
+
+    def total(self) -> int:
+        return sum(meta['count'] for meta in self.files.values())
+
+    def iter_location(self, location: str) -> Iterator[JournalistRef]:
+        return self._iter(lambda meta: meta['location'] == location)
+
+    def _iter(self, want=None) -> Iterator[JournalistRef]:
+        # One block decoded at a time, so memory stays at one location's list
+        with open(self.manifest_file, 'rb') as f:
+            for _, meta in sorted(self.files.items()):
+                if want is not None and not want(meta):
+                    continue
+                f.seek(self.data_start + meta['offset'])
+                yield from _decode_block(f.read(meta['length']), meta['location'])
+
+    def __iter__(self) -> Iterator[JournalistRef]:
+        return self._iter()
+
+
+def group_missing(lists: LocationLists, done_urls) -> Dict[str, List[JournalistRef]]:
+    """Journalists whose URL is not in ``done_urls``, grouped by location, in one streaming pass.
+
+    A journalist listed under several locations is scheduled once, under the
+    first list it appears in (the registry's primary location).
+    """
+    grouped: Dict[str, List[JournalistRef]] = {}
+    seen = set()
+    for ref in lists:
+        if ref.url not in done_urls and ref.url not in seen:
+            seen.add(ref.url)
+            grouped.setdefault(ref.location, []).append(ref)
+    return grouped
+
+
+if __name__ == '__main__':
+    import time
+
+    start = time.perf_counter()
+    lists = LocationLists()
+    print(f"📋 {lists.total():,} journalists in {len(lists.files)} locations "
+          f"({lists.rebuilt} recompiled) in {(time.perf_counter() - start) * 1000:.0f} ms")
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""Append-only compressed archive of fetched pages, with a seekable offset index.
+
+Every fetched page is appended to the current segment file as one record:
+
+    b'MRPG' | header length (u32) | payload length (u32) | header JSON | compressed HTML
+
+The header (url, kind, fetched_at, location, name, codec, size) makes segments
+self-describing, so ``reindex`` can rebuild ``index.db`` from them alone.
+Payloads are independent zstd frames (zlib when ``zstandard`` is not
+installed), so any record can be read with one seek and one read.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import struct
+import sys
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BASE_DIR = Path(__file__).parent.parent
+ARCHIVE_DIR = BASE_DIR / 'muckrack' / 'page_archive'
+
+MAGIC = b'MRPG'
+RECORD_HEAD = struct.Struct('<4sII')
+SEGMENT_BYTES = 512 * 1024 * 1024
+
+# URL suffix -> page kind, as fetched by getjournalistdetails.py
+PAGE_KINDS = ('profile', 'bio', 'portfolio', 'awards', 'interview')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    journalist_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    location TEXT,
+    name TEXT,
+    fetched_at TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_journalist ON pages(journalist_id, kind, fetched_at);
+CREATE INDEX IF NOT EXISTS pages_url ON pages(url, fetched_at);
+"""
+
+
+def split_page_url(url: str) -> Tuple[str, str]:
+    """https://muckrack.com/susannah-george/awards -> ('susannah-george', 'awards')"""
+    parts = url.split('://', 1)[-1].rstrip('/').split('/')
+    if len(parts) >= 3 and parts[-1] in PAGE_KINDS:
+        return parts[-2], parts[-1]
+    return parts[-1], 'profile'
+
+
+def _compress(raw: bytes) -> Tuple[str, bytes]:
+    if zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=9).compress(raw)
+    return 'zlib', zlib.compress(raw, 6)
+
+
+def _decompress(codec: str, payload: bytes) -> bytes:
+    if codec == 'zlib':
+        return zlib.decompress(payload)
+    if zstandard is None:
+        raise RuntimeError('Archive record is zstd-compressed; pip3 install zstandard to read it')
+    return zstandard.ZstdDecompressor().decompress(payload)
+
+
+def read_record(path: Path, offset: int, length: int) -> Tuple[Dict, str]:
+    """(header, html) of the record at ``offset``; safe to call from worker processes"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        blob = f.read(length)
+    magic, header_len, payload_len = RECORD_HEAD.unpack_from(blob)
+    if magic != MAGIC or RECORD_HEAD.size + header_len + payload_len != len(blob):
+        raise ValueError(f'Corrupt archive record at {path.name}:{offset}')
+    body = RECORD_HEAD.size + header_len
+    header = json.loads(blob[RECORD_HEAD.size:body])
+    return header, _decompress(header['codec'], blob[body:]).decode('utf-8')
+
+
+def scan_segment(path: Path) -> Iterator[Tuple[Dict, int, int]]:
+    """(header, offset, length) for every complete record; stops at a torn tail"""
+    with open(path, 'rb') as f:
+        offset = 0
+        while True:
+            head = f.read(RECORD_HEAD.size)
+            if len(head) < RECORD_HEAD.size:
+                return
+            magic, header_len, payload_len = RECORD_HEAD.unpack(head)
+            if magic != MAGIC:
+                return
+            header = f.read(header_len)
+            if len(header) < header_len or f.seek(payload_len, 1) > os.fstat(f.fileno()).st_size:
+                return
+            length = RECORD_HEAD.size + header_len + payload_len
+            yield json.loads(header), offset, length
+            offset += length
+
+
+class PageArchive:
+    """Writer and reader for the page archive; one instance per process"""
+
+    def __init__(self, archive_dir: Path = ARCHIVE_DIR, segment_bytes: int = SEGMENT_BYTES,
+                 fsync_every: int = 50):
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        self.archive_dir = archive_dir
+        self.segment_bytes = segment_bytes
+        self.fsync_every = fsync_every
+        self.conn = sqlite3.connect(str(archive_dir / 'index.db'), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self._segment = None
+        self._unsynced = 0
+
+    def segments(self) -> List[Path]:
+        return sorted(self.archive_dir.glob('pages-*.arc'))
+
+    def segment_path(self, segment: str) -> Path:
+        return self.archive_dir / segment
+
+    def _new_segment(self):
+        """Claim a fresh segment; each writer owns its segment, so no locking and a
+        crash can only tear the tail of its own file"""
+        existing = self.segments()
+        number = int(existing[-1].stem.split('-')[1]) + 1 if existing else 1
+        while True:
+            try:
+                return open(self.archive_dir / f'pages-{number:06d}.arc', 'xb')
+            except FileExistsError:
+                number += 1
+
+    def _writable_segment(self):
+        if self._segment is None:
+            self._segment = self._new_segment()
+        elif self._segment.tell() >= self.segment_bytes:
+            self.sync()
+            self._segment.close()
+            self._segment = self._new_segment()
+        return self._segment
+
+    def append(self, url: str, html: str, location: str = None, name: str = None,
+               fetched_at: Optional[str] = None) -> int:
+        """Archive one fetched page; returns its row id"""
+        journalist_id, kind = split_page_url(url)
+        raw = html.encode('utf-8')
+        codec, payload = _compress(raw)
+        fetched_at = fetched_at or datetime.now().isoformat()
+        header = json.dumps({'url': url, 'kind': kind, 'fetched_at': fetched_at, 'location': location,
+                             'name': name, 'codec': codec, 'size': len(raw)}, ensure_ascii=False).encode('utf-8')
+        record = RECORD_HEAD.pack(MAGIC, len(header), len(payload)) + header + payload
+
+        f = self._writable_segment()
+        offset = f.tell()
+        f.write(record)
+        f.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+        with self.conn:
+            cur = self.conn.execute(
+                'INSERT INTO pages (url, journalist_id, kind, location, name, fetched_at, segment, offset, '
+                'length, raw_size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, journalist_id, kind, location, name, fetched_at,
+                 Path(f.name).name, offset, len(record), len(raw)))
+        return cur.lastrowid
+
+    def get(self, url: str) -> Optional[str]:
+        """Latest archived HTML for a URL"""
+        row = self.conn.execute(
+            'SELECT segment, offset, length FROM pages WHERE url = ? ORDER BY fetched_at DESC LIMIT 1',
+            (url,)).fetchone()
+        if not row:
+            return None
+        return read_record(self.segment_path(row[0]), row[1], row[2])[1]
+
+    def iter_latest(self, location: Optional[str] = None) -> Iterator[Dict]:
+        """Newest page of every kind per journalist, grouped by journalist"""
+        where, params = ('WHERE location = ?', (location,)) if location else ('', ())
+        cur = self.conn.execute(
+            f'SELECT journalist_id, kind, url, location, name, MAX(fetched_at), segment, offset, length '
+            f'FROM pages {where} GROUP BY journalist_id, kind ORDER BY journalist_id', params)
+        current = None
+        for journalist_id, kind, url, loc, name, fetched_at, segment, offset, length in cur:
+            if current is None or current['journalist_id'] != journalist_id:
+                if current is not None:
+                    yield current
+                current = {'journalist_id': journalist_id, 'location': loc, 'name': name,
+                           'fetched_at': fetched_at, 'pages': {}}
+            if kind == 'profile':
+                current['url'] = url
+            current['location'] = current['location'] or loc
+            current['name'] = current['name'] or name
+            current['fetched_at'] = max(current['fetched_at'], fetched_at)
+            current['pages'][kind] = (segment, offset, length)
+        if current is not None:
+            yield current
+
+    def reindex(self) -> int:
+        """Rebuild index.db from the segment files"""
+        rows = 0
+        with self.conn:
+            self.conn.execute('DELETE FROM pages')
+            for path in self.segments():
+                for header, offset, length in scan_segment(path):
+                    journalist_id, kind = split_page_url(header['url'])
+                    self.conn.execute(
+                        'INSERT INTO pages (url, journalist_id, kind, location, name, fetched_at, segment, '
+                        'offset, length, raw_size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        (header['url'], journalist_id, kind, header.get('location'), header.get('name'),
+                         header['fetched_at'], path.name, offset, length, header.get('size', 0)))
+                    rows += 1
+        return rows
+
+    def stats(self) -> Dict:
+        count, raw, stored = self.conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(length), 0) FROM pages').fetchone()
+        journalists = self.conn.execute('SELECT COUNT(DISTINCT journalist_id) FROM pages').fetchone()[0]
+        return {'pages': count, 'journalists': journalists, 'raw_bytes': raw, 'stored_bytes': stored,
+                'segments': len(self.segments())}
+
+    def sync(self):
+        if self._segment is not None and self._unsynced:
+            os.fsync(self._segment.fileno())
+            self._unsynced = 0
+
+    def close(self):
+        if self._segment is not None:
+            self.sync()
+            self._segment.close()
+            self._segment = None
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compressed archive of fetched pages')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('stats', help='Pages, journalists and compression ratio')
+    get = sub.add_parser('get', help='Print the latest archived HTML for a URL')
+    get.add_argument('url')
+    sub.add_parser('reindex', help='Rebuild index.db from the segment files')
+    args = parser.parse_args()
+
+    archive = PageArchive()
+    try:
+        if args.command == 'stats':
+            s = archive.stats()
+            ratio = s['raw_bytes'] / s['stored_bytes'] if s['stored_bytes'] else 0
+            print(f"📦 {s['pages']:,} pages for {s['journalists']:,} journalists in {s['segments']} segments")
+            print(f"💾 {s['stored_bytes'] / 1024 ** 2:,.1f} MB stored, {ratio:.1f}x compression")
+        elif args.command == 'get':
+            html = archive.get(args.url)
+            if html is None:
+                print(f"❌ Not archived: {args.url}", file=sys.stderr)
+                sys.exit(1)
+            sys.stdout.write(html)
+        elif args.command == 'reindex':
+            print(f"✅ Indexed {archive.reindex():,} archived pages")
+    finally:
+        archive.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Capture a WebDriver page once and share one parsed tree across extractors"""
+from typing import Dict
+
+from extraction import extract_page, parse_html
+
+
+class PageStats:
+    """Counts WebDriver page_source round trips and HTML parses"""
+
+    def __init__(self):
+        self.bridge_calls = 0
+        self.parses = 0
+
+    def reset(self):
+        self.bridge_calls = 0
+        self.parses = 0
+
+    def summary(self) -> str:
+        return f"{self.bridge_calls} page_source calls, {self.parses} parses"
+
+
+class PageSnapshot:
+    """One page_source pull, parsed lazily at most once, extracted at most once"""
+
+    def __init__(self, driver, stats: PageStats = None):
+        self.driver = driver
+        self.stats = stats if stats is not None else PageStats()
+        self._html = None
+        self._tree = None
+        self._page = None
+
+    @property
+    def html(self) -> str:
+        if self._html is None:
+            self._html = self.driver.page_source
+            self.stats.bridge_calls += 1
+        return self._html
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            self._tree = parse_html(self.html)
+            self.stats.parses += 1
+        return self._tree
+
+    @property
+    def page(self) -> Dict:
+        """All sections, from a single walk of the shared tree"""
+        if self._page is None:
+            self._page = extract_page(self.tree)
+        return self._page
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Global scrape plan: one priority queue over every journalist in the scrape-state index.
+
+    python3 planner.py build [--refresh-days 30] [--recheck-days 180] [--limit 5000]
+    python3 planner.py show
+    python3 getjournalistdetails.py --plan        # consume muckrack/scrape_plan.json in order
+
+Journalists with sections still to fill come first, most complete profiles
+first (fewest pages for a finished record), stalest first within a tier.
+Complete profiles older than ``--refresh-days`` follow, stalest first, and only
+re-fetch VOLATILE_SECTIONS; the other sections never change once present.
+A section that was fetched and came back empty is not retried until
+``--recheck-days`` have passed.
+"""
+import argparse
+import heapq
+import json
+import time
+from datetime import datetime, timedelta
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from atomic_write import atomic_write
+from scrape_index import ALL_SECTIONS, SECTION_BITS, ScrapeIndex, name_from_path
+
+BASE_DIR = Path(__file__).parent.parent
+PLAN_FILE = BASE_DIR / 'muckrack' / 'scrape_plan.json'
+
+VOLATILE_SECTIONS = ('profile', 'portfolio')
+VOLATILE_MASK = sum(SECTION_BITS[s] for s in VOLATILE_SECTIONS)
+
+
+def section_names(mask: int) -> List[str]:
+    return [section for section, bit in SECTION_BITS.items() if mask & bit]
+
+
+def plan_entry(row: Tuple, refresh_before: str, recheck_before: str) -> Optional[Tuple[Tuple, Dict]]:
+    """(priority, plan item) for one index row, or None when nothing is worth fetching"""
+    journalist_id, url, location, path, sections, fetched, scraped_at = row
+    if not path:
+        return None
+    scraped_at = scraped_at or ''
+    missing = ALL_SECTIONS & ~sections
+    # Fetched but empty on the site: skip until the recheck window has passed
+    if scraped_at >= recheck_before:
+        missing &= ~fetched
+    if missing:
+        priority = (0, -bin(sections).count('1'), scraped_at)
+        todo = missing
+    elif scraped_at < refresh_before:
+        priority = (1, 0, scraped_at)
+        todo = VOLATILE_MASK
+    else:
+        return None
+    return priority, {'journalist_id': journalist_id, 'location': location, 'name': name_from_path(path),
+                      'url': url, 'sections': section_names(todo)}
+
+
+def build_plan(index: ScrapeIndex, refresh_days: float = 30, recheck_days: float = 180,
+               limit: Optional[int] = None) -> Dict:
+    now = datetime.now()
+    refresh_before = (now - timedelta(days=refresh_days)).isoformat()
+    recheck_before = (now - timedelta(days=recheck_days)).isoformat()
+    entries = (e for row in index.iter_all() if (e := plan_entry(row, refresh_before, recheck_before)))
+    key = itemgetter(0)
+    ranked = heapq.nsmallest(limit, entries, key=key) if limit else sorted(entries, key=key)
+    items = [item for _, item in ranked]
+    return {'created_at': now.isoformat(), 'refresh_days': refresh_days, 'recheck_days': recheck_days,
+            'fill': sum(1 for priority, _ in ranked if priority[0] == 0),
+            'refresh': sum(1 for priority, _ in ranked if priority[0] == 1),
+            'pages': sum(len(item['sections']) for item in items), 'items': items}
+
+
+def save_plan(plan: Dict, plan_file: Path = PLAN_FILE):
+    plan_file.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(plan_file, json.dumps(plan, ensure_ascii=False))
+
+
+def load_plan(plan_file: Path = PLAN_FILE) -> Dict:
+    with open(plan_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def pending_items(plan: Dict, index: ScrapeIndex) -> Iterator[Dict]:
+    """Plan items in order, minus journalists saved or verified since the plan was built"""
+    for item in plan['items']:
+        row = index.get(item['journalist_id'])
+        if row and max(row['scraped_at'] or '', row['verified_at'] or '') > plan['created_at']:
+            continue
+        yield item
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the global scrape plan')
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='Rank every journalist and write the plan file')
+    build.add_argument('--refresh-days', type=float, default=30, help='Re-fetch volatile sections after this age')
+    build.add_argument('--recheck-days', type=float, default=180, help='Retry sections that came back empty')
+    build.add_argument('--limit', type=int, default=None, help='Keep only the top N journalists')
+    build.add_argument('--out', default=str(PLAN_FILE))
+    show = sub.add_parser('show', help='Summarize a plan file')
+    show.add_argument('--plan', default=str(PLAN_FILE))
+    show.add_argument('--head', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        index = ScrapeIndex()
+        try:
+            start = time.perf_counter()
+            plan = build_plan(index, args.refresh_days, args.recheck_days, args.limit)
+        finally:
+            index.close()
+        save_plan(plan, Path(args.out))
+        print(f"🗺️  {len(plan['items']):,} journalists ({plan['fill']:,} to fill, {plan['refresh']:,} to refresh), "
+              f"{plan['pages']:,} pages, planned in {time.perf_counter() - start:.2f}s -> {args.out}")
+    elif args.command == 'show':
+        plan = load_plan(Path(args.plan))
+        print(f"🗺️  Plan from {plan['created_at']}: {len(plan['items']):,} journalists, {plan['pages']:,} pages")
+        per_section = {section: 0 for section in SECTION_BITS}
+        for item in plan['items']:
+            for section in item['sections']:
+                per_section[section] += 1
+        for section, count in per_section.items():
+            print(f"{section:12} {count:>10,}")
+        for item in plan['items'][:args.head]:
+            print(f"  {item['location']}/{item['name']}: {', '.join(item['sections'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,10 +7,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Set
 import time
 import random
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 
+from extraction import extract_profile
+
 SECTIONS = ['profile']
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / 'muckrack' / 'datamuckrack'
@@ -100,54 +101,7 @@ class ProfileScraper:
         return False
     
     def extract_profile_details(self) -> dict:
-        soup = BeautifulSoup(self.driver.page_source, 'lxml')
-        intro = soup.select_one('div.profile-section.profile-intro')
-        if not intro:
-            return {}
-        c = intro.select_one('div.mr-card-content')
-        if not c:
-            return {}
-        
-        pronouns = ''
-        if p := c.select_one('div.fs-6.text-muted.fw-light'):
-            pronouns = p.get_text(strip=True)
-        
-        intro_text = ''
-        if desc := c.select_one('div.fs-5.fs-md-6.my-5'):
-            intro_text = desc.get_text(strip=True)
-        
-        jobs = []
-        for li in c.select('ul.mr-person-job-items li'):
-            text = li.get_text(strip=True).replace('\uf1ad', '').strip()
-            a = li.select_one('a')
-            if ',' in text and a:
-                title = text.split(',')[0].strip()
-                href = a.get('href', '')
-                full_url = href if href.startswith('http') else f"https://muckrack.com{href}"
-                jobs.append({'title': title, 'outlet': a.get_text(strip=True), 'outletLink': full_url})
-        
-        covers = doesnt_cover = ''
-        for item in c.select('div.profile-details-item'):
-            txt = item.get_text()
-            if 'Covers:' in txt:
-                covers = txt.split('Covers:', 1)[1].strip()
-            elif "Doesn't Cover:" in txt:
-                doesnt_cover = txt.split("Doesn't Cover:", 1)[1].strip()
-        
-        return {
-            'avatar': (img.get('src', '') if (img := c.select_one('img[src*="profile/images"]')) else ''),
-            'name': (h1.get_text(strip=True) if (h1 := c.select_one('h1.profile-name')) else ''),
-            'pronouns': pronouns,
-            'verified': bool(c.select_one('small.profile-verified')),
-            'jobs': jobs,
-            'location': (s.get_text(strip=True) if (s := c.select_one('div.person-details-location span')) else ''),
-            'beats': [{'name': a.get_text(strip=True), 'link': f"https://muckrack.com{a.get('href', '')}"} for a in c.select('div.person-details-beats a')],
-            'asSeenIn': [{'name': a.get_text(strip=True), 'link': f"https://muckrack.com{a.get('href', '')}"} for a in c.select('div.profile-details-item a')],
-            'socialHandles': [{'handle': a.get_text(strip=True), 'link': a.get('href', '')} for a in c.select('a.tweet-url.username')],
-            'covers': covers,
-            'doesnt_cover': doesnt_cover,
-            'intro': intro_text
-        }
+        return extract_profile(self.driver.page_source)
     
     def get_missing_sections(self, name: str) -> Set[str]:
         data_file = DATA_DIR / self.location / name / f'{name}.json'
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Persisted profile-quality flags per saved JSON, keyed by file stat.
+
+corpus_scan.py stats every file and re-reads only those whose mtime or size
+changed since the last sweep; everything else is judged from these flags.
+Rows are keyed by the tree layout's (location, name), so the table only
+describes a MUCKRACK_STORE=tree corpus.
+"""
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Set, Tuple
+
+BASE_DIR = Path(__file__).parent.parent
+INDEX_DB = BASE_DIR / 'muckrack' / 'scrape_state.db'
+
+# Profile keys added after the first scrapes; missing_keys has one bit per field
+NEW_PROFILE_FIELDS = ('pronouns', 'intro', 'covers', 'doesnt_cover')
+QUALITY_FIELDS = ('profile', 'avatar', 'jobs', 'has_location', 'beats', 'as_seen_in', 'social',
+                  'pronouns', 'intro', 'covers', 'doesnt_cover', 'missing_keys')
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS quality (
+    location TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    url TEXT,
+    error TEXT,
+    {', '.join(f'{field} INTEGER' for field in QUALITY_FIELDS)},
+    PRIMARY KEY (location, name)
+);
+"""
+
+COLUMNS = ('location', 'name', 'is_dir', 'mtime_ns', 'size', 'url', 'error') + QUALITY_FIELDS
+
+
+def profile_quality(data: Dict) -> Dict:
+    """Flags and counts the hygiene checks need, derived from one saved record"""
+    profile = data.get('profile') or {}
+    missing_keys = 0
+    for bit, field in enumerate(NEW_PROFILE_FIELDS):
+        if field not in profile:
+            missing_keys |= 1 << bit
+    return {
+        'profile': int(bool(profile)),
+        'avatar': int(bool(profile.get('avatar'))),
+        'jobs': len(profile.get('jobs') or []),
+        'has_location': int(bool(profile.get('location'))),
+        'beats': len(profile.get('beats') or []),
+        'as_seen_in': len(profile.get('asSeenIn') or []),
+        'social': len(profile.get('socialHandles') or []),
+        'pronouns': int(bool(profile.get('pronouns'))),
+        'intro': int(bool(profile.get('intro'))),
+        'covers': int(bool(profile.get('covers'))),
+        'doesnt_cover': int(bool(profile.get('doesnt_cover'))),
+        'missing_keys': missing_keys,
+    }
+
+
+class QualityIndex:
+    """quality table in the scrape-state DB: (location, name) -> stat + flags"""
+
+    def __init__(self, db_path: Path = INDEX_DB):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def load_location(self, location: str) -> Dict[str, Tuple]:
+        """name -> (mtime_ns, size, url, error, quality or None)"""
+        cached = {}
+        cur = self.conn.execute(f'SELECT {", ".join(COLUMNS[1:])} FROM quality WHERE location = ?', (location,))
+        for row in cur:
+            name, _, mtime_ns, size, url, error = row[:6]
+            flags = row[6:]
+            quality = None if flags[0] is None else dict(zip(QUALITY_FIELDS, flags))
+            cached[name] = (mtime_ns, size, url, error, quality)
+        return cached
+
+    def upsert(self, location: str, rows: Iterable[Tuple]):
+        """rows of (name, is_dir, mtime_ns, size, url, error, quality or None)"""
+        placeholders = ', '.join('?' * len(COLUMNS))
+        with self.conn:
+            self.conn.executemany(
+                f'INSERT OR REPLACE INTO quality ({", ".join(COLUMNS)}) VALUES ({placeholders})',
+                ((location, name, int(is_dir), mtime_ns, size, url, error,
+                  *((quality or {}).get(f) for f in QUALITY_FIELDS))
+                 for name, is_dir, mtime_ns, size, url, error, quality in rows))
+
+    def forget(self, location: str, name: str):
+        with self.conn:
+            self.conn.execute('DELETE FROM quality WHERE location = ? AND name = ?', (location, name))
+
+    def prune(self, seen: Dict[str, Set[str]]) -> int:
+        """Drop rows for files that no longer exist; ``seen`` maps location -> names found"""
+        stale = [(location, name) for location, name in self.conn.execute('SELECT location, name FROM quality')
+                 if name not in seen.get(location, ())]
+        with self.conn:
+            self.conn.executemany('DELETE FROM quality WHERE location = ? AND name = ?', stale)
+        return len(stale)
+
+    def close(self):
+        self.conn.close()
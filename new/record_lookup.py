@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Saved record by journalist_id without walking datamuckrack/.
+
+The scrape-state index already maps journalist_id -> (path, content_hash) for
+every saved record; a lookup is one primary-key query there plus one file read
+(or one packed/sharded ``get``). Parsed records stay in an in-process LRU and
+are served from it while the indexed content hash still matches, so a record
+re-saved by another process is never returned stale.
+Returned dicts are shared with the cache: copy one before modifying it.
+
+    from record_lookup import lookup, lookup_many
+    lookup('joseph-goldstein')                  # dict or None
+    lookup_many(['joseph-goldstein', 'x'])      # {journalist_id: dict} for those found
+
+    python3 record_lookup.py get joseph-goldstein [more ids]
+    python3 record_lookup.py bench [--lookups 2000]
+"""
+import argparse
+import json
+import random
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from record_store import open_store
+from scrape_index import DATA_DIR, ScrapeIndex, journalist_id_from_url
+
+CACHE_SIZE = 4096
+
+
+class RecordLookup:
+    """journalist_id -> record through the scrape-state index, with a content-hash-checked LRU"""
+
+    def __init__(self, store=None, index: Optional[ScrapeIndex] = None, cache_size: int = CACHE_SIZE):
+        self.index = index or ScrapeIndex()
+        self.store = store or open_store(index=self.index)
+        self.index.ensure_built(self.store, getattr(self.store, 'data_dir', DATA_DIR))
+        self.cache_size = cache_size
+        # journalist_id -> (content_hash, data), least recently used first
+        self.cache: OrderedDict = OrderedDict()
+        self.hits = self.misses = 0
+
+    def lookup(self, journalist_id: str) -> Optional[Dict]:
+        return self.lookup_many([journalist_id]).get(journalist_id)
+
+    def lookup_many(self, journalist_ids: Iterable[str]) -> Dict[str, Dict]:
+        """{journalist_id: record} for every id that has a saved record; one index query per 500 ids"""
+        found = {}
+        for journalist_id, (path, digest) in self.index.content_hashes(journalist_ids).items():
+            cached = self.cache.get(journalist_id)
+            if cached is not None and digest and cached[0] == digest:
+                self.cache.move_to_end(journalist_id)
+                self.hits += 1
+                found[journalist_id] = cached[1]
+                continue
+            self.misses += 1
+            data = self._load(journalist_id, path)
+            if data is None:
+                continue
+            found[journalist_id] = data
+            if digest:
+                self.cache[journalist_id] = (digest, data)
+                self.cache.move_to_end(journalist_id)
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        return found
+
+    def _load(self, journalist_id: str, path: Optional[str]) -> Optional[Dict]:
+        if not path:
+            return None
+        if self.store.backend != 'tree':
+            return self.store.get(journalist_id)
+        # The indexed path is the file; no second index query through TreeStore.get
+        try:
+            with open(self.store.data_dir / path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def close(self):
+        self.store.close()
+        self.index.close()
+
+
+_default: Optional[RecordLookup] = None
+
+
+def _shared() -> RecordLookup:
+    global _default
+    if _default is None:
+        _default = RecordLookup()
+    return _default
+
+
+def lookup(journalist_id: str) -> Optional[Dict]:
+    """Saved record for one journalist_id, or None"""
+    return _shared().lookup(journalist_id)
+
+
+def lookup_many(journalist_ids: Iterable[str]) -> Dict[str, Dict]:
+    """Saved records for many journalist_ids at once"""
+    return _shared().lookup_many(journalist_ids)
+
+
+def feed_seq(index: ScrapeIndex) -> int:
+    """Latest change-feed sequence number; an index rebuilt now reflects at least this much"""
+    return index.conn.execute('SELECT COALESCE(MAX(seq), 0) FROM changes').fetchone()[0]
+
+
+def iter_located(store, index: ScrapeIndex, location: Optional[str] = None,
+                 chunk: int = 500) -> Iterator[Tuple[str, str, Dict]]:
+    """(location, journalist_id, record) once per journalist, optionally only those indexed under ``location``
+
+    A journalist saved under several locations or names (before registry.py
+    dedupe, or a sharded record listed under each catalog name) yields the
+    copy the scrape-state index points at, the same one lookups and the
+    change feed resolve to; the first copy seen when the indexed one is gone.
+    Indexed paths are read one query per ``chunk`` records.
+    """
+    seen = set()
+    # journalist_id -> (location, name) of a copy passed over for the indexed one
+    passed = {}
+
+    def settle(batch):
+        indexed = index.locate({journalist_id for journalist_id, _, _, _ in batch})
+        for journalist_id, loc, name, data in batch:
+            if journalist_id in seen:
+                continue
+            indexed_location, path = indexed.get(journalist_id, (None, None))
+            if path and path != store.key(loc, name, data):
+                # The indexed copy lives elsewhere; outside ``location`` the journalist is not wanted
+                if location is None or indexed_location == location:
+                    passed.setdefault(journalist_id, (loc, name))
+                continue
+            seen.add(journalist_id)
+            yield loc, journalist_id, data
+
+    batch = []
+    for loc, name, data in store.iter_records(location):
+        url = data.get('url') or data.get('link')
+        if not url:
+            continue
+        batch.append((journalist_id_from_url(url), loc, name, data))
+        if len(batch) >= chunk:
+            yield from settle(batch)
+            batch = []
+    yield from settle(batch)
+    for journalist_id, (loc, name) in passed.items():
+        if journalist_id not in seen and (data := store.load(loc, name)) is not None:
+            yield loc, journalist_id, data
+
+
+def iter_journalists(store, index: ScrapeIndex) -> Iterator[Tuple[str, Dict]]:
+    """(journalist_id, record) once per journalist across the whole store; see iter_located"""
+    for _, journalist_id, data in iter_located(store, index):
+        yield journalist_id, data
+
+
+def changed_records(index: ScrapeIndex, store, since: int,
+                    batch: int = 5000) -> Iterator[Tuple[int, int, Dict[str, Optional[Dict]]]]:
+    """(last seq, feed entries, {journalist_id: record, None when removed}) per batch of the change feed"""
+    records = RecordLookup(store, index)
+    while True:
+        rows = list(index.changes_since(since, batch))
+        if not rows:
+            return
+        since = rows[-1][0]
+        # The latest entry per journalist wins; a NULL hash means the record was removed
+        latest = {jid: digest for _, jid, _, _, digest, _ in rows}
+        found = records.lookup_many([jid for jid, digest in latest.items() if digest])
+        yield since, len(rows), {jid: found.get(jid) if digest else None for jid, digest in latest.items()}
+
+
+def bench(lookups: int) -> Dict[str, float]:
+    """Microseconds per lookup: cold (file read), warm (LRU) and batched, over random indexed ids"""
+    records = RecordLookup()
+    try:
+        ids = [jid for (jid,) in records.index.conn.execute(
+            'SELECT journalist_id FROM journalists WHERE path IS NOT NULL')]
+        ids = random.Random(7).sample(ids, min(lookups, len(ids)))
+        records.cache_size = max(len(ids), 1)
+        results = {'ids': len(ids)}
+        for label in ('cold_us', 'warm_us'):
+            start = time.perf_counter()
+            for journalist_id in ids:
+                records.lookup(journalist_id)
+            results[label] = (time.perf_counter() - start) / max(len(ids), 1) * 1e6
+        start = time.perf_counter()
+        records.lookup_many(ids)
+        results['batch_warm_us'] = (time.perf_counter() - start) / max(len(ids), 1) * 1e6
+    finally:
+        records.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Look up saved records by journalist_id')
+    sub = parser.add_subparsers(dest='command', required=True)
+    get = sub.add_parser('get', help='Print saved records')
+    get.add_argument('ids', nargs='+')
+    run_bench = sub.add_parser('bench', help='Time cold, warm and batched lookups')
+    run_bench.add_argument('--lookups', type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.command == 'get':
+        found = lookup_many(args.ids)
+        for journalist_id in args.ids:
+            if journalist_id in found:
+                print(json.dumps(found[journalist_id], indent=2, ensure_ascii=False))
+            else:
+                print(f"❌ {journalist_id}: no saved record")
+    elif args.command == 'bench':
+        results = bench(args.lookups)
+        print(f"🔎 {results['ids']:,} ids: cold {results['cold_us']:,.0f}µs, warm {results['warm_us']:,.0f}µs, "
+              f"batched {results['batch_warm_us']:,.0f}µs per lookup")
+
+
+if __name__ == '__main__':
+    main()
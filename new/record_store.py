@@ -0,0 +1,730 @@
+#!/usr/bin/env python3
+"""Pluggable storage for journalist records.
+
+Three backends share one API: ``put``/``load`` by (location, name), ``get`` by
+``journalist_id``, and a storage ``key`` the scrape-state index keeps as ``path``:
+
+    tree     datamuckrack/{location}/{name}/{name}.json, pretty-printed (legacy layout)
+    packed   one SQLite file, compact JSON in a TEXT column, primary key journalist_id;
+             outlets and beats are stored once in their own tables, records hold ids
+    sharded  records/{hash[:3]}/{journalist_id}.json: one file per journalist, 4096
+             hashed directories, and a (location, name) -> journalist_id catalog
+
+Two journalists with the same display name collide in the tree layout; the
+sharded layout keys files by journalist_id, so they cannot.
+
+Pick the backend with ``MUCKRACK_STORE=tree|packed|sharded`` (default ``tree``).
+
+    python3 record_store.py import            # tree -> packed
+    python3 record_store.py export [--location Us]   # packed -> tree
+    python3 record_store.py migrate           # tree -> sharded, streaming
+    python3 record_store.py find "Abbott, Alden"
+    python3 record_store.py interning         # bytes and load memory saved by interning
+    python3 record_store.py bench [--records 5000]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from atomic_write import WriteBatch, atomic_write_json
+from scrape_index import content_hash, index_row, journalist_id_from_url, section_mask
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / 'muckrack' / 'datamuckrack'
+STORE_DB = BASE_DIR / 'muckrack' / 'records.db'
+SHARD_DIR = BASE_DIR / 'muckrack' / 'records'
+SHARD_CHARS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    journalist_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    location TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_location ON records(location, name);
+CREATE TABLE IF NOT EXISTS outlets (
+    id INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    link TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS beats (
+    id INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    link TEXT NOT NULL
+);
+"""
+
+
+def record_key(location: str, name: str) -> str:
+    return f'{location}/{name}/{name}.json'
+
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog (
+    location TEXT NOT NULL,
+    name TEXT NOT NULL COLLATE NOCASE,
+    journalist_id TEXT NOT NULL,
+    PRIMARY KEY (location, name)
+);
+CREATE INDEX IF NOT EXISTS catalog_id ON catalog(journalist_id);
+CREATE INDEX IF NOT EXISTS catalog_name ON catalog(name);
+"""
+
+
+def shard_key(journalist_id: str) -> str:
+    """'abbott-alden' -> '3f1/abbott-alden.json'; at most 16**SHARD_CHARS directories"""
+    shard = hashlib.blake2b(journalist_id.encode('utf-8'), digest_size=8).hexdigest()[:SHARD_CHARS]
+    return f"{shard}/{quote(journalist_id, safe='')}.json"
+
+
+def record_id(data: Dict, key: str) -> str:
+    url = data.get('url') or data.get('link')
+    return journalist_id_from_url(url) if url else key
+
+
+class TreeStore:
+    """Legacy layout: one directory and one pretty-printed JSON file per journalist"""
+
+    backend = 'tree'
+
+    def __init__(self, data_dir: Path = DATA_DIR, index=None):
+        self.data_dir = data_dir
+        # journalist_id lookups go through the scrape-state index when one is given
+        self.index = index
+
+    def path(self, location: str, name: str) -> Path:
+        return self.data_dir / record_key(location, name)
+
+    def key(self, location: str, name: str, data: Dict) -> str:
+        return record_key(location, name)
+
+    def put(self, location: str, name: str, data: Dict, batch: Optional[WriteBatch] = None) -> str:
+        path = self.path(location, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(path, data, batch)
+        return record_key(location, name)
+
+    def put_many(self, records: Iterable[Tuple[str, str, Dict]]) -> int:
+        with WriteBatch() as batch:
+            return sum(1 for location, name, data in records if self.put(location, name, data, batch))
+
+    def load(self, location: str, name: str) -> Optional[Dict]:
+        try:
+            with open(self.path(location, name), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def size(self, location: str, name: str) -> int:
+        try:
+            return self.path(location, name).stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def delete(self, location: str, name: str):
+        path = self.path(location, name)
+        path.unlink(missing_ok=True)
+        if path.parent.exists() and not any(path.parent.iterdir()):
+            path.parent.rmdir()
+
+    def get(self, journalist_id: str) -> Optional[Dict]:
+        row = self.index.get(journalist_id) if self.index is not None else None
+        if not row or not row['path']:
+            return None
+        location, name = row['path'].split('/')[:2]
+        return self.load(location, name)
+
+    def locations(self):
+        if not self.data_dir.exists():
+            return []
+        return sorted(e.name for e in os.scandir(self.data_dir) if e.is_dir())
+
+    def iter_records(self, location: Optional[str] = None) -> Iterator[Tuple[str, str, Dict]]:
+        """(location, name, data) for every readable record, one location at a time"""
+        for loc in ([location] if location else self.locations()):
+            loc_dir = self.data_dir / loc
+            if not loc_dir.is_dir():
+                continue
+            with os.scandir(loc_dir) as entries:
+                for entry in sorted(entries, key=lambda e: e.name):
+                    if entry.is_dir() and (data := self.load(loc, entry.name)) is not None:
+                        yield loc, entry.name, data
+
+    def describe(self, key: str) -> str:
+        return f'file://{quote(str((self.data_dir / key).absolute()))}'
+
+    def close(self):
+        pass
+
+
+class Interner:
+    """One lookup table (outlets or beats): {name, link} pairs stored once, referenced by integer id
+
+    A pair is interned only when it matches the table exactly, so decoding always
+    gives back the original record; anything else stays inline.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, table: str):
+        self.conn = conn
+        self.table = table
+        self.reload()
+
+    def reload(self):
+        self.by_id: Dict[int, Tuple[str, str]] = {}
+        self.by_slug: Dict[str, Tuple[int, str, str]] = {}
+        for id_, slug, name, link in self.conn.execute(f'SELECT id, slug, name, link FROM {self.table}'):
+            self.by_id[id_] = (name, link)
+            self.by_slug[slug] = (id_, name, link)
+
+    def encode(self, name, link):
+        """Id for this pair, adding it to the table on first sight; None when it cannot be interned"""
+        if not isinstance(name, str) or not isinstance(link, str):
+            return None
+        slug = link.rstrip('/').rsplit('/', 1)[-1]
+        if not slug:
+            return None
+        known = self.by_slug.get(slug)
+        if known is None:
+            # Another process may have interned this slug since reload(); the table decides
+            self.conn.execute(f'INSERT INTO {self.table} (slug, name, link) VALUES (?, ?, ?) '
+                              f'ON CONFLICT (slug) DO NOTHING', (slug, name, link))
+            id_, stored_name, stored_link = self.conn.execute(
+                f'SELECT id, name, link FROM {self.table} WHERE slug = ?', (slug,)).fetchone()
+            if (stored_name, stored_link) == (name, link):
+                # Decoded records share these string objects instead of one copy each
+                stored_name, stored_link = name, link
+            known = self.by_slug[slug] = (id_, stored_name, stored_link)
+            self.by_id[id_] = (stored_name, stored_link)
+        id_, known_name, known_link = known
+        return id_ if (known_name, known_link) == (name, link) else None
+
+    def decode(self, id_: int) -> Tuple[str, str]:
+        """(name, link) for an id; ids interned by another process since reload() are read on demand"""
+        pair = self.by_id.get(id_)
+        if pair is None:
+            self.reload()
+            pair = self.by_id[id_]
+        return pair
+
+    def encode_pairs(self, items):
+        """[{name, link}, ...] -> ids where possible, other entries unchanged"""
+        encoded = []
+        for item in items:
+            id_ = self.encode(item.get('name'), item.get('link')) if isinstance(item, dict) and len(item) == 2 else None
+            encoded.append(item if id_ is None else id_)
+        return encoded
+
+    def decode_pairs(self, items):
+        decoded = []
+        for item in items:
+            if type(item) is int:
+                name, link = self.decode(item)
+                item = {'name': name, 'link': link}
+            decoded.append(item)
+        return decoded
+
+
+class PackedStore:
+    """All records in one SQLite file: compact JSON, keyed by journalist_id"""
+
+    backend = 'packed'
+
+    def __init__(self, db_path: Path = STORE_DB):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(str(db_path), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.outlets = Interner(self.conn, 'outlets')
+        self.beats = Interner(self.conn, 'beats')
+
+    def key(self, location: str, name: str, data: Dict) -> str:
+        return record_key(location, name)
+
+    def pack(self, data: Dict) -> str:
+        """Compact JSON with asSeenIn, beats and job outlets replaced by interned ids"""
+        profile = data.get('profile')
+        if isinstance(profile, dict):
+            profile = dict(profile)
+            if isinstance(profile.get('asSeenIn'), list):
+                profile['asSeenIn'] = self.outlets.encode_pairs(profile['asSeenIn'])
+            if isinstance(profile.get('beats'), list):
+                profile['beats'] = self.beats.encode_pairs(profile['beats'])
+            if isinstance(profile.get('jobs'), list):
+                profile['jobs'] = [self._pack_job(job) for job in profile['jobs']]
+            data = dict(data, profile=profile)
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+    def _pack_job(self, job):
+        if not isinstance(job, dict) or 'outlet' not in job or 'outletLink' not in job:
+            return job
+        keys = list(job)
+        # outletLink must directly follow outlet so the decoded key order is unchanged
+        if keys.index('outletLink') != keys.index('outlet') + 1:
+            return job
+        id_ = self.outlets.encode(job['outlet'], job['outletLink'])
+        if id_ is None:
+            return job
+        return {k: (id_ if k == 'outlet' else v) for k, v in job.items() if k != 'outletLink'}
+
+    def unpack(self, text: str) -> Dict:
+        """Stored JSON back to the legacy shape; rows written before interning pass through unchanged"""
+        data = json.loads(text)
+        profile = data.get('profile')
+        if isinstance(profile, dict):
+            if isinstance(profile.get('asSeenIn'), list):
+                profile['asSeenIn'] = self.outlets.decode_pairs(profile['asSeenIn'])
+            if isinstance(profile.get('beats'), list):
+                profile['beats'] = self.beats.decode_pairs(profile['beats'])
+            if isinstance(profile.get('jobs'), list):
+                profile['jobs'] = [self._unpack_job(job) for job in profile['jobs']]
+        return data
+
+    def _unpack_job(self, job):
+        if not isinstance(job, dict) or type(job.get('outlet')) is not int:
+            return job
+        unpacked = {}
+        for k, v in job.items():
+            if k == 'outlet':
+                unpacked['outlet'], unpacked['outletLink'] = self.outlets.decode(v)
+            else:
+                unpacked[k] = v
+        return unpacked
+
+    def _row(self, location: str, name: str, data: Dict) -> Tuple:
+        key = record_key(location, name)
+        return record_id(data, key), key, location, name, self.pack(data)
+
+    def _write(self, records: Iterable[Tuple[str, str, Dict]]) -> int:
+        count = 0
+        try:
+            with self.conn:
+                for location, name, data in records:
+                    row = self._row(location, name, data)
+                    # A journalist re-saved under a new path replaces the old row
+                    self.conn.execute('DELETE FROM records WHERE path = ? AND journalist_id != ?', (row[1], row[0]))
+                    self.conn.execute('INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?)', row)
+                    count += 1
+        except BaseException:
+            # Rolled back: drop ids interned in this transaction
+            self.outlets.reload()
+            self.beats.reload()
+            raise
+        return count
+
+    def put(self, location: str, name: str, data: Dict) -> str:
+        self._write([(location, name, data)])
+        return record_key(location, name)
+
+    def put_many(self, records: Iterable[Tuple[str, str, Dict]]) -> int:
+        return self._write(records)
+
+    def load(self, location: str, name: str) -> Optional[Dict]:
+        row = self.conn.execute('SELECT data FROM records WHERE path = ?',
+                                (record_key(location, name),)).fetchone()
+        return self.unpack(row[0]) if row else None
+
+    def size(self, location: str, name: str) -> int:
+        row = self.conn.execute('SELECT LENGTH(CAST(data AS BLOB)) FROM records WHERE path = ?',
+                                (record_key(location, name),)).fetchone()
+        return row[0] if row else 0
+
+    def delete(self, location: str, name: str):
+        with self.conn:
+            self.conn.execute('DELETE FROM records WHERE path = ?', (record_key(location, name),))
+
+    def get(self, journalist_id: str) -> Optional[Dict]:
+        row = self.conn.execute('SELECT data FROM records WHERE journalist_id = ?', (journalist_id,)).fetchone()
+        return self.unpack(row[0]) if row else None
+
+    def locations(self):
+        return [loc for (loc,) in self.conn.execute('SELECT DISTINCT location FROM records ORDER BY 1')]
+
+    def iter_records(self, location: Optional[str] = None) -> Iterator[Tuple[str, str, Dict]]:
+        where, params = ('WHERE location = ?', (location,)) if location else ('', ())
+        cur = self.conn.execute(f'SELECT location, name, data FROM records {where} ORDER BY location, name',
+                                params)
+        for loc, name, data in cur:
+            yield loc, name, self.unpack(data)
+
+    def describe(self, key: str) -> str:
+        return f'{self.db_path.absolute()}:{key}'
+
+    def close(self):
+        self.conn.close()
+
+
+def catalog_row(location: str, name: str, data: Dict) -> Optional[Tuple[str, str, str]]:
+    """(location, name, journalist_id) catalog entry for a sharded record
+
+    Callers that only know the id pass it as the name; that adds no entry.
+    """
+    journalist_id = journalist_id_from_url(data.get('url') or data.get('link'))
+    return None if name == journalist_id else (location, name, journalist_id)
+
+
+class ShardedStore:
+    """One file per journalist_id under hashed directories, plus a name -> id catalog"""
+
+    backend = 'sharded'
+
+    def __init__(self, root: Path = SHARD_DIR):
+        root.mkdir(parents=True, exist_ok=True)
+        self.root = root
+        self.conn = sqlite3.connect(str(root / 'catalog.db'), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(CATALOG_SCHEMA)
+
+    def key(self, location: str, name: str, data: Dict) -> str:
+        url = data.get('url') or data.get('link')
+        if not url:
+            raise ValueError(f'{location}/{name}: a sharded record needs a url')
+        return shard_key(journalist_id_from_url(url))
+
+    def _id(self, location: str, name: str) -> Optional[str]:
+        row = self.conn.execute('SELECT journalist_id FROM catalog WHERE location = ? AND name = ?',
+                                (location, name)).fetchone()
+        return row[0] if row else None
+
+    def put(self, location: str, name: str, data: Dict, batch: Optional[WriteBatch] = None) -> str:
+        key = self.key(location, name, data)
+        path = self.root / key
+        path.parent.mkdir(exist_ok=True)
+        atomic_write_json(path, data, batch)
+        row = catalog_row(location, name, data)
+        if row:
+            with self.conn:
+                self.conn.execute('INSERT OR REPLACE INTO catalog VALUES (?, ?, ?)', row)
+        return key
+
+    def put_many(self, records: Iterable[Tuple[str, str, Dict]]) -> int:
+        count = 0
+        # The batch's files are renamed before the catalog commit points at them
+        with self.conn, WriteBatch() as batch:
+            for location, name, data in records:
+                key = self.key(location, name, data)
+                (self.root / key).parent.mkdir(exist_ok=True)
+                atomic_write_json(self.root / key, data, batch)
+                if row := catalog_row(location, name, data):
+                    self.conn.execute('INSERT OR REPLACE INTO catalog VALUES (?, ?, ?)', row)
+                count += 1
+        return count
+
+    def load(self, location: str, name: str) -> Optional[Dict]:
+        # ``name`` may be a display name from the catalog or the journalist_id itself
+        return self.get(self._id(location, name) or name)
+
+    def get(self, journalist_id: str) -> Optional[Dict]:
+        try:
+            with open(self.root / shard_key(journalist_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def find(self, name: str) -> List[Tuple[str, str]]:
+        """(location, journalist_id) for every catalog entry with this name, case-insensitive"""
+        return self.conn.execute('SELECT location, journalist_id FROM catalog WHERE name = ? ORDER BY 1',
+                                 (name,)).fetchall()
+
+    def size(self, location: str, name: str) -> int:
+        journalist_id = self._id(location, name) or name
+        try:
+            return (self.root / shard_key(journalist_id)).stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def delete(self, location: str, name: str):
+        journalist_id = self._id(location, name) or name
+        with self.conn:
+            self.conn.execute('DELETE FROM catalog WHERE location = ? AND name = ?', (location, name))
+            remaining = self.conn.execute('SELECT 1 FROM catalog WHERE journalist_id = ?',
+                                          (journalist_id,)).fetchone()
+        if not remaining:
+            (self.root / shard_key(journalist_id)).unlink(missing_ok=True)
+
+    def locations(self):
+        return [loc for (loc,) in self.conn.execute('SELECT DISTINCT location FROM catalog ORDER BY 1')]
+
+    def iter_records(self, location: Optional[str] = None) -> Iterator[Tuple[str, str, Dict]]:
+        """(location, name, data) in catalog order; a journalist filed under several names repeats"""
+        where, params = ('WHERE location = ?', (location,)) if location else ('', ())
+        rows = self.conn.execute(f'SELECT location, name, journalist_id FROM catalog {where} ORDER BY location, name',
+                                 params).fetchall()
+        for loc, name, journalist_id in rows:
+            data = self.get(journalist_id)
+            if data is not None:
+                yield loc, name, data
+
+    def describe(self, key: str) -> str:
+        return f'file://{quote(str((self.root / key).absolute()))}'
+
+    def close(self):
+        self.conn.close()
+
+
+def save_record(store, index, location: str, name: str, data: Dict,
+                data_dir: Path = DATA_DIR) -> Tuple[str, bool]:
+    """Write ``data`` unless the index holds the same content hash for it; returns (key, written)
+
+    An unchanged record is not rewritten: only its ``verified_at`` moves in the
+    index. Written records carry ``content_hash`` and land in the change feed.
+    """
+    key = store.key(location, name, data)
+    data['content_hash'] = content_hash(data)
+    if index is not None and index.verify(record_id(data, key), key, data['content_hash']):
+        return key, False
+    store.put(location, name, data)
+    if index is not None:
+        index.record_saved(data, data_dir / key, location, data_dir)
+    return key, True
+
+
+def open_store(backend: Optional[str] = None, index=None):
+    backend = backend or os.environ.get('MUCKRACK_STORE', 'tree')
+    if backend == 'packed':
+        return PackedStore()
+    if backend == 'tree':
+        return TreeStore(index=index)
+    if backend == 'sharded':
+        return ShardedStore()
+    raise ValueError(f'Unknown record store backend: {backend}')
+
+
+def export_tree(store, data_dir: Path = DATA_DIR, location: Optional[str] = None) -> int:
+    """Write records back out as the legacy directory tree"""
+    return TreeStore(data_dir).put_many(store.iter_records(location))
+
+
+def copy_score(data: Dict) -> Tuple[int, str]:
+    """Rank copies of one journalist: most sections present, then the newest scrape"""
+    return bin(section_mask(data)).count('1'), data.get('scraped_at') or ''
+
+
+def import_packed(source, target: PackedStore, location: Optional[str] = None, chunk: int = 1000) -> Dict:
+    """Stream every record into the packed store; duplicates of one journalist_id keep the fullest copy"""
+    best: Dict[str, Tuple[int, str]] = {}
+    stats = {'records': 0, 'journalists': 0, 'duplicates': 0}
+    pending = []
+    for loc, name, data in source.iter_records(location):
+        stats['records'] += 1
+        journalist_id = record_id(data, record_key(loc, name))
+        score = copy_score(data)
+        if journalist_id in best:
+            stats['duplicates'] += 1
+            if score <= best[journalist_id]:
+                continue
+        best[journalist_id] = score
+        # A better copy later on replaces the row: records are keyed by journalist_id
+        pending.append((loc, name, data))
+        if len(pending) >= chunk:
+            target.put_many(pending)
+            pending = []
+    target.put_many(pending)
+    stats['journalists'] = len(best)
+    return stats
+
+
+def migrate_sharded(source, target: ShardedStore, index=None, location: Optional[str] = None) -> Dict:
+    """Stream every record into the sharded layout; duplicates of one journalist_id keep the fullest copy"""
+    best: Dict[str, Tuple[int, str]] = {}
+    stats = {'records': 0, 'journalists': 0, 'duplicates': 0, 'skipped': 0}
+    rows, catalog = [], []
+
+    def commit():
+        # Catalog and index rows only after their chunk's files are committed
+        batch.flush()
+        with target.conn:
+            target.conn.executemany('INSERT OR REPLACE INTO catalog VALUES (?, ?, ?)', catalog)
+        if index is not None:
+            index.record_rows(rows, feed=False)
+        rows.clear()
+        catalog.clear()
+
+    with WriteBatch() as batch:
+        for loc, name, data in source.iter_records(location):
+            stats['records'] += 1
+            url = data.get('url') or data.get('link')
+            if not url:
+                stats['skipped'] += 1
+                continue
+            journalist_id = journalist_id_from_url(url)
+            if entry := catalog_row(loc, name, data):
+                catalog.append(entry)
+            score = copy_score(data)
+            if journalist_id in best:
+                stats['duplicates'] += 1
+                if score <= best[journalist_id]:
+                    continue
+            best[journalist_id] = score
+            key = shard_key(journalist_id)
+            (target.root / key).parent.mkdir(exist_ok=True)
+            atomic_write_json(target.root / key, data, batch)
+            if index is not None and (row := index_row(data, key, loc)):
+                rows.append(row)
+            if len(catalog) >= 1000 or len(rows) >= 1000:
+                commit()
+        commit()
+    stats['journalists'] = len(best)
+    return stats
+
+
+def interning_report(store: PackedStore) -> Dict:
+    """Stored bytes and memory for loading every record, legacy JSON vs interned outlets/beats"""
+    import tracemalloc
+
+    packed = [text for (text,) in store.conn.execute('SELECT data FROM records')]
+    plain = [json.dumps(store.unpack(text), ensure_ascii=False, separators=(',', ':')) for text in packed]
+    report = {'records': len(packed), 'outlets': len(store.outlets.by_id), 'beats': len(store.beats.by_id),
+              'plain_bytes': sum(len(text.encode('utf-8')) for text in plain),
+              'packed_bytes': sum(len(text.encode('utf-8')) for text in packed)}
+    for label, texts, load in (('plain_mem', plain, json.loads), ('packed_mem', packed, store.unpack)):
+        tracemalloc.start()
+        loaded = [load(text) for text in texts]
+        report[label] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del loaded
+    return report
+
+
+def bench(records: int, lookups: int) -> Dict:
+    """Write, full-scan and point-lookup timings for both backends on synthetic records"""
+    import random
+    import shutil
+    import tempfile
+
+    from extraction import extract_page
+
+    fixtures = Path(__file__).parent / 'fixtures' / 'v1'
+    pages = [extract_page(p.read_text(encoding='utf-8')) for p in sorted(fixtures.glob('*.html'))
+             if p.name.startswith(('profile_', 'portfolio_', 'awards_'))]
+    locations = ['Us', 'Uk', 'India', 'Pakistan', 'Afghanistan']
+    corpus = []
+    for i in range(records):
+        data = dict(pages[i % len(pages)], url=f'https://muckrack.com/person-{i}', name=f'Person {i}')
+        corpus.append((locations[i % len(locations)], f'Person {i}', data))
+    ids = [f'person-{i}' for i in random.Random(7).sample(range(records), min(lookups, records))]
+
+    results = {}
+    tmp = Path(tempfile.mkdtemp(prefix='record_store_bench_'))
+    try:
+        from scrape_index import ScrapeIndex
+
+        index = ScrapeIndex(tmp / 'state.db')
+        stores = {'tree': TreeStore(tmp / 'tree', index), 'packed': PackedStore(tmp / 'records.db')}
+        for backend, store in stores.items():
+            start = time.perf_counter()
+            if backend == 'tree':
+                for location, name, data in corpus:
+                    key = store.put(location, name, data)
+                    index.record_saved(data, tmp / 'tree' / key, location, tmp / 'tree')
+            else:
+                for location, name, data in corpus:
+                    store.put(location, name, data)
+            write = time.perf_counter() - start
+
+            start = time.perf_counter()
+            scanned = sum(1 for _ in store.iter_records())
+            scan = time.perf_counter() - start
+
+            start = time.perf_counter()
+            found = sum(1 for journalist_id in ids if store.get(journalist_id) is not None)
+            lookup = time.perf_counter() - start
+
+            if backend == 'packed':
+                store.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            # Allocated blocks, so per-file and per-directory overhead counts
+            root = tmp / 'tree' if backend == 'tree' else tmp
+            pattern = '**/*' if backend == 'tree' else 'records.db*'
+            size = sum(f.stat().st_blocks * 512 for f in root.glob(pattern))
+            results[backend] = {'write_per_sec': records / write, 'scan_per_sec': scanned / scan,
+                                'lookup_per_sec': found / lookup, 'mb': size / 1024 ** 2}
+            store.close()
+        index.close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Journalist record store')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('import', help='Load datamuckrack/ into the packed store, one copy per journalist')
+    export = sub.add_parser('export', help='Write the packed store back out as datamuckrack/')
+    export.add_argument('--location')
+    export.add_argument('--data-dir', default=str(DATA_DIR))
+    run_migrate = sub.add_parser('migrate', help='Move datamuckrack/ into the sharded journalist_id layout')
+    run_migrate.add_argument('--location')
+    find = sub.add_parser('find', help='Look up a journalist by display name in the sharded catalog')
+    find.add_argument('name')
+    sub.add_parser('interning', help='Size and load-memory savings of interned outlets and beats')
+    run_bench = sub.add_parser('bench', help='Compare tree and packed backends')
+    run_bench.add_argument('--records', type=int, default=5000)
+    run_bench.add_argument('--lookups', type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        print(f"{'backend':8} {'write/s':>10} {'scan/s':>10} {'lookup/s':>10} {'size':>9}")
+        for backend, r in bench(args.records, args.lookups).items():
+            print(f"{backend:8} {r['write_per_sec']:>10,.0f} {r['scan_per_sec']:>10,.0f} "
+                  f"{r['lookup_per_sec']:>10,.0f} {r['mb']:>7.1f}MB")
+        return
+
+    if args.command in ('migrate', 'find'):
+        sharded = ShardedStore()
+        try:
+            if args.command == 'find':
+                for location, journalist_id in sharded.find(args.name):
+                    print(f"{location:24} {journalist_id:32} {sharded.root / shard_key(journalist_id)}")
+                return
+            from scrape_index import ScrapeIndex
+
+            index = ScrapeIndex()
+            try:
+                start = time.time()
+                stats = migrate_sharded(TreeStore(), sharded, index, args.location)
+            finally:
+                index.close()
+            print(f"🔀 Migrated {stats['records']:,} records -> {stats['journalists']:,} journalist files in "
+                  f"{time.time() - start:.1f}s ({stats['duplicates']:,} name/location duplicates, "
+                  f"{stats['skipped']:,} without a url)")
+        finally:
+            sharded.close()
+        return
+
+    packed = PackedStore()
+    try:
+        if args.command == 'interning':
+            r = interning_report(packed)
+            print(f"🔗 {r['records']:,} records share {r['outlets']:,} outlets and {r['beats']:,} beats")
+            print(f"💾 Stored: {r['plain_bytes'] / 1024 ** 2:,.1f} MB -> {r['packed_bytes'] / 1024 ** 2:,.1f} MB "
+                  f"({1 - r['packed_bytes'] / max(r['plain_bytes'], 1):.0%} smaller)")
+            print(f"🧠 Loaded: {r['plain_mem'] / 1024 ** 2:,.1f} MB -> {r['packed_mem'] / 1024 ** 2:,.1f} MB "
+                  f"({1 - r['packed_mem'] / max(r['plain_mem'], 1):.0%} less)")
+            return
+        start = time.time()
+        if args.command == 'import':
+            stats = import_packed(TreeStore(), packed)
+            print(f"📥 Packed {stats['records']:,} records -> {stats['journalists']:,} journalists into {STORE_DB} "
+                  f"in {time.time() - start:.1f}s ({stats['duplicates']:,} duplicate copies dropped, "
+                  f"the fullest kept)")
+        elif args.command == 'export':
+            count = export_tree(packed, Path(args.data_dir), args.location)
+            print(f"📤 Exported {count:,} records to {args.data_dir} in {time.time() - start:.1f}s")
+    finally:
+        packed.close()
+
+
+if __name__ == '__main__':
+    main()
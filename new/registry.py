@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Canonical journalist registry: one row per journalist_id with every location listing it.
+
+The location lists repeat the same muckrack.com/<id> under several beats and
+countries. The registry collapses them so each person is scheduled once, under
+its primary location (the first list it appears in), and stored as one record
+whose ``locations`` field names every list.
+
+    python3 registry.py build           # refresh from the location manifest
+    python3 registry.py report          # duplicate listings: fetches and bytes saved
+    python3 registry.py dedupe [--dry-run]   # merge duplicate saved records into one
+"""
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from location_lists import LocationLists
+from scrape_index import SECTION_BITS, ScrapeIndex, journalist_id_from_url, section_mask
+
+BASE_DIR = Path(__file__).parent.parent
+INDEX_DB = BASE_DIR / 'muckrack' / 'scrape_state.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS registry (
+    journalist_id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    name TEXT,
+    location TEXT NOT NULL,
+    locations TEXT NOT NULL,
+    listings INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS registry_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Pages the detail scraper fetches for a journalist with nothing saved yet
+PAGES_PER_JOURNALIST = len(SECTION_BITS)
+MERGE_KEYS = ('profile', 'biography', 'portfolio', 'portfolio_count', 'awards', 'interviews')
+
+
+def lists_signature(lists: LocationLists) -> str:
+    """Changes whenever any location list file changes"""
+    state = sorted((name, meta['mtime_ns'], meta['size']) for name, meta in lists.files.items())
+    return hashlib.blake2b(json.dumps(state).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class JournalistRegistry:
+    """registry table in the scrape-state DB: journalist_id -> url, name, primary and all locations"""
+
+    def __init__(self, db_path: Path = INDEX_DB):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def refresh(self, lists: LocationLists, force: bool = False) -> Optional[Dict]:
+        """Rebuild from the location lists when they changed since the last build"""
+        signature = lists_signature(lists)
+        row = self.conn.execute("SELECT value FROM registry_meta WHERE key = 'signature'").fetchone()
+        if row and row[0] == signature and not force:
+            return None
+        start = time.time()
+        entries: Dict[str, list] = {}
+        listings = 0
+        for ref in lists:
+            listings += 1
+            entry = entries.get(journalist_id_from_url(ref.url))
+            if entry is None:
+                entries[journalist_id_from_url(ref.url)] = [ref.url, ref.name, [ref.location]]
+            elif ref.location not in entry[2]:
+                entry[2].append(ref.location)
+        with self.conn:
+            self.conn.execute('DELETE FROM registry')
+            self.conn.executemany(
+                'INSERT INTO registry VALUES (?, ?, ?, ?, ?, ?)',
+                ((jid, url, name, locs[0], json.dumps(locs, ensure_ascii=False), len(locs))
+                 for jid, (url, name, locs) in entries.items()))
+            self.conn.execute("INSERT OR REPLACE INTO registry_meta VALUES ('signature', ?)", (signature,))
+            self.conn.execute("INSERT OR REPLACE INTO registry_meta VALUES ('listings', ?)", (str(listings),))
+        return {'listings': listings, 'unique': len(entries), 'seconds': time.time() - start}
+
+    def locations(self, journalist_id: str) -> List[str]:
+        row = self.conn.execute('SELECT locations FROM registry WHERE journalist_id = ?', (journalist_id,)).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def primary(self, journalist_id: str) -> Optional[str]:
+        row = self.conn.execute('SELECT location FROM registry WHERE journalist_id = ?', (journalist_id,)).fetchone()
+        return row[0] if row else None
+
+    def counts(self) -> Dict[str, int]:
+        unique, multi = self.conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(listings > 1), 0) FROM registry').fetchone()
+        row = self.conn.execute("SELECT value FROM registry_meta WHERE key = 'listings'").fetchone()
+        listings = int(row[0]) if row else unique
+        return {'listings': listings, 'unique': unique, 'duplicates': listings - unique, 'multi_location': multi}
+
+    def close(self):
+        self.conn.close()
+
+
+def _better(a: Dict, b: Dict) -> bool:
+    """True when record ``a`` should be kept over ``b``: more sections, then newer"""
+    return ((bin(section_mask(a)).count('1'), a.get('scraped_at') or '')
+            > (bin(section_mask(b)).count('1'), b.get('scraped_at') or ''))
+
+
+def dedupe(store, index: ScrapeIndex, registry: JournalistRegistry, dry_run: bool = False) -> Dict:
+    """Merge records saved more than once for one journalist_id into a single record with ``locations``"""
+    from record_store import record_id, record_key, save_record
+
+    copies: Dict[str, List] = {}
+    for location, name, data in store.iter_records():
+        jid = record_id(data, record_key(location, name))
+        copies.setdefault(jid, []).append((location, name))
+    stats = {'journalists': len(copies), 'merged': 0, 'removed': 0, 'bytes': 0}
+    for jid, keys in copies.items():
+        if len(keys) < 2:
+            continue
+        records = [(location, name, store.load(location, name)) for location, name in keys]
+        keep = records[0]
+        for record in records[1:]:
+            if _better(record[2], keep[2]):
+                keep = record
+        location, name, data = keep
+        others = [record for record in records if record[2] is not data]
+        for other_location, other_name, other in others:
+            # Fill sections the kept copy lacks from the duplicates
+            for key in MERGE_KEYS:
+                if not data.get(key) and other.get(key):
+                    data[key] = other[key]
+            stats['bytes'] += store.size(other_location, other_name)
+            stats['removed'] += 1
+        data['locations'] = _merge_locations(registry.locations(jid), (loc for loc, _ in keys))
+        if not dry_run:
+            # The merged record is on disk before any copy it drew sections from goes away
+            save_record(store, index, location, name, data)
+            for other_location, other_name, _ in others:
+                store.delete(other_location, other_name)
+        stats['merged'] += 1
+    return stats
+
+
+def _merge_locations(listed: List[str], saved: Iterable[str]) -> List[str]:
+    merged = list(listed)
+    for location in saved:
+        if location not in merged:
+            merged.append(location)
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Canonical journalist registry')
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='Refresh the registry from the location lists')
+    build.add_argument('--force', action='store_true')
+    sub.add_parser('report', help='Duplicate listings and what scheduling each person once saves')
+    run_dedupe = sub.add_parser('dedupe', help='Merge duplicate saved records')
+    run_dedupe.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    registry = JournalistRegistry()
+    try:
+        refreshed = registry.refresh(LocationLists(), force=getattr(args, 'force', False))
+        if refreshed:
+            print(f"🗂️  Registry: {refreshed['listings']:,} listings -> {refreshed['unique']:,} journalists "
+                  f"in {refreshed['seconds']:.1f}s")
+        if args.command == 'report':
+            counts = registry.counts()
+            print(f"📋 {counts['listings']:,} listings, {counts['unique']:,} unique journalists, "
+                  f"{counts['multi_location']:,} listed in more than one location")
+            print(f"⚡ Scheduling each once saves {counts['duplicates']:,} profile fetches "
+                  f"(up to {counts['duplicates'] * PAGES_PER_JOURNALIST:,} detail pages)")
+        elif args.command == 'dedupe':
+            from record_store import open_store
+
+            index = ScrapeIndex()
+            store = open_store(index=index)
+            try:
+                stats = dedupe(store, index, registry, args.dry_run)
+            finally:
+                store.close()
+                index.close()
+            print(f"🧹 {stats['merged']:,} journalists saved more than once: {stats['removed']:,} duplicate "
+                  f"records, {stats['bytes'] / 1024 ** 2:,.1f} MB{' [dry run]' if args.dry_run else ' removed'}")
+    finally:
+        registry.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Offline reparse: re-derive datamuckrack JSON from saved pages across all cores.
+
+    python3 reparse.py --archive                      # muckrack/page_archive/
+    python3 reparse.py --pages-dir saved_pages/       # loose HTML files
+    python3 reparse.py --archive --location Us --workers 8 --chunk 64
+
+Pages are grouped per journalist and sent to a process pool in chunks; each
+worker reads, decompresses and extracts its chunk and hands back finished
+records. The parent is the only writer and applies chunks in submission
+order, so output is deterministic whatever the worker count. Records go
+through the configured store (``MUCKRACK_STORE``), which each worker also
+opens to read the record it merges into.
+
+Loose HTML files are matched by name: ``{kind}_{journalist_id}.html``,
+``{journalist_id}/{kind}.html`` or ``{journalist_id}.html`` (profile page).
+Their location and name come from the scrape-state index.
+"""
+import argparse
+import os
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from page_archive import ARCHIVE_DIR, PAGE_KINDS, PageArchive, read_record
+from record_store import PackedStore, ShardedStore, TreeStore, open_store
+from scrape_index import ScrapeIndex, content_hash, index_row, name_from_path
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / 'muckrack' / 'datamuckrack'
+
+# backend -> (store class, attribute holding the path a worker reopens it from)
+STORES = {'tree': (TreeStore, 'data_dir'), 'packed': (PackedStore, 'db_path'), 'sharded': (ShardedStore, 'root')}
+
+# The store a worker process reads existing records from; opened once per process
+_worker_store = None
+
+
+def scan_pages_dir(pages_dir: Path) -> Iterator[Dict]:
+    """Group loose HTML files by journalist_id without reading them"""
+    grouped = defaultdict(dict)
+    for root, _, files in os.walk(pages_dir):
+        parent = os.path.basename(root)
+        for filename in files:
+            if not filename.endswith('.html'):
+                continue
+            stem = filename[:-5]
+            kind, sep, journalist_id = stem.partition('_')
+            if not (sep and kind in PAGE_KINDS):
+                if stem in PAGE_KINDS and root != str(pages_dir):
+                    kind, journalist_id = stem, parent
+                else:
+                    kind, journalist_id = 'profile', stem
+            grouped[journalist_id][kind] = os.path.join(root, filename)
+    for journalist_id in sorted(grouped):
+        yield {'journalist_id': journalist_id, 'location': None, 'name': None,
+               'url': f'https://muckrack.com/{journalist_id}', 'fetched_at': None,
+               'pages': grouped[journalist_id]}
+
+
+def scan_archive(archive: PageArchive, location: Optional[str] = None) -> Iterator[Dict]:
+    """Newest archived page of each kind per journalist, as (segment path, offset, length) refs"""
+    for entry in archive.iter_latest(location):
+        entry['pages'] = {kind: (str(archive.segment_path(segment)), offset, length)
+                          for kind, (segment, offset, length) in entry['pages'].items()}
+        entry.setdefault('url', f"https://muckrack.com/{entry['journalist_id']}")
+        yield entry
+
+
+def _read_page(ref) -> str:
+    if isinstance(ref, str):
+        with open(ref, 'r', encoding='utf-8') as f:
+            return f.read()
+    return read_record(Path(ref[0]), ref[1], ref[2])[1]
+
+
+def merge_record(existing: Optional[Dict], entry: Dict, sections: Dict) -> Dict:
+    """Overlay freshly extracted sections on the saved record, like scrape_journalist()"""
+    data = existing if existing is not None else {'name': entry['name'], 'link': entry['url']}
+    data.update(sections)
+    data['url'] = data.get('url') or entry['url']
+    data.setdefault('profile', {})
+    data.setdefault('biography', '')
+    data.setdefault('portfolio', [])
+    data.setdefault('portfolio_count', len(data['portfolio']))
+    data.setdefault('awards', [])
+    data.setdefault('interviews', [])
+    if entry.get('fetched_at'):
+        data['scraped_at'] = entry['fetched_at']
+    return data
+
+
+def _open_worker_store(backend: str, path: str):
+    global _worker_store
+    cls, _ = STORES[backend]
+    _worker_store = cls(Path(path))
+
+
+def _reparse_chunk(entries: List[Dict]) -> Dict:
+    """Worker: extract a chunk of journalists and return merged records with their index rows"""
+    from extraction import extract_journalist
+
+    start = time.perf_counter()
+    outputs, pages = [], 0
+    for entry in entries:
+        sections = extract_journalist({kind: _read_page(ref) for kind, ref in entry['pages'].items()})
+        pages += len(entry['pages'])
+        location, name = entry['location'], entry['name']
+        data = merge_record(_worker_store.load(location, name), entry, sections)
+        data['content_hash'] = content_hash(data)
+        key = _worker_store.key(location, name, data)
+        outputs.append((location, name, data, index_row(data, key, location)))
+    return {'pid': os.getpid(), 'outputs': outputs, 'pages': pages,
+            'seconds': time.perf_counter() - start}
+
+
+def _chunks(entries: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    chunk = []
+    for entry in entries:
+        chunk.append(entry)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def reparse(entries: Iterator[Dict], index: ScrapeIndex, store, location: Optional[str] = None, workers: Optional[int] = None, chunk_size: int = 64,
+            dry_run: bool = False) -> Dict:
+    """Extract ``entries`` in a process pool and write results through one ordered writer"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    stats = {'journalists': 0, 'pages': 0, 'unresolved': 0, 'unchanged': 0, 'seconds': 0.0, 'workers': {}}
+
+    def resolved():
+        for entry in entries:
+            # Location and name decide the output path; fall back to the index
+            if not entry['location'] or not entry['name']:
+                row = index.get(entry['journalist_id'])
+                if row and row['path']:
+                    entry['location'] = entry['location'] or row['location']
+                    entry['name'] = entry['name'] or name_from_path(row['path'])
+                    entry['url'] = row['url']
+            if not entry['location'] or not entry['name']:
+                stats['unresolved'] += 1
+            elif location is None or entry['location'] == location:
+                yield entry
+
+    def write(result):
+        rows = [row for _, _, _, row in result['outputs'] if row]
+        # Same key and content hash as indexed: the stored record is already current
+        indexed = index.content_hashes(row[0] for row in rows)
+        current = {row[4] for row in rows if indexed.get(row[0]) == (row[4], row[8])}
+        # put_many commits the chunk's records before the index points at them
+        store.put_many((loc, name, data) for loc, name, data, row in result['outputs']
+                       if not (row and row[4] in current))
+        index.record_rows(row for row in rows if row[4] not in current)
+        stats['unchanged'] += len(current)
+
+    start = time.perf_counter()
+    per_worker = stats['workers']
+    attr = STORES[store.backend][1]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker_store,
+                             initargs=(store.backend, str(getattr(store, attr)))) as pool:
+        pending = deque()
+        chunks = _chunks(resolved(), chunk_size)
+        while True:
+            # Keep a bounded number of chunks in flight so memory stays flat
+            while len(pending) < workers * 2:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.append(pool.submit(_reparse_chunk, chunk))
+            if not pending:
+                break
+            result = pending.popleft().result()
+            if not dry_run:
+                write(result)
+            w = per_worker.setdefault(result['pid'], {'journalists': 0, 'pages': 0, 'seconds': 0.0})
+            w['journalists'] += len(result['outputs'])
+            w['pages'] += result['pages']
+            w['seconds'] += result['seconds']
+            stats['journalists'] += len(result['outputs'])
+            stats['pages'] += result['pages']
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-derive datamuckrack/ from saved pages, no fetching')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--archive', nargs='?', const=str(ARCHIVE_DIR), help='Page archive directory')
+    source.add_argument('--pages-dir', help='Directory of saved HTML pages')
+    parser.add_argument('--location')
+    parser.add_argument('--data-dir', default=str(DATA_DIR), help='Record tree, when MUCKRACK_STORE=tree')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk', type=int, default=64, help='Journalists per worker batch')
+    parser.add_argument('--dry-run', action='store_true', help='Parse everything, write nothing')
+    args = parser.parse_args()
+
+    index = ScrapeIndex()
+    store = open_store(index=index)
+    if store.backend == 'tree':
+        store = TreeStore(Path(args.data_dir), index)
+    archive = PageArchive(Path(args.archive)) if args.archive else None
+    try:
+        if archive is not None:
+            entries = scan_archive(archive, args.location)
+        else:
+            entries = scan_pages_dir(Path(args.pages_dir))
+        stats = reparse(entries, index, store, args.location, args.workers, args.chunk, args.dry_run)
+    finally:
+        if archive is not None:
+            archive.close()
+        store.close()
+        index.close()
+
+    elapsed = stats['seconds'] or 1e-9
+    print(f"{'worker':>8} {'journalists':>12} {'pages':>8} {'busy s':>8} {'pages/s':>9}")
+    for pid, w in sorted(stats['workers'].items()):
+        rate = w['pages'] / w['seconds'] if w['seconds'] else 0
+        print(f"{pid:>8} {w['journalists']:>12,} {w['pages']:>8,} {w['seconds']:>8.1f} {rate:>9.0f}")
+    print(f"\n✅ {stats['journalists']:,} journalists, {stats['pages']:,} pages in {elapsed:.1f}s "
+          f"({stats['pages'] / elapsed:,.0f} pages/s overall, {stats['unchanged']:,} unchanged, "
+          f"{stats['unresolved']} without location/name)"
+          f"{' [dry run]' if args.dry_run else ''}")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,8 @@ from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 
+from atomic_write import atomic_write
+
 BASE_DIR = Path(__file__).parent.parent
 OUTPUT_DIR = BASE_DIR / 'journalistv2' / 'locations'
 CHECKPOINT_FILE = BASE_DIR / 'checkpoints' / 'checkpointsJournalistUrl.json'
@@ -90,7 +92,7 @@ def load_checkpoint():
 
 def save_checkpoint(completed):
     """Save checkpoint"""
-    CHECKPOINT_FILE.write_text(json.dumps({'completed': completed}, indent=2))
+    atomic_write(CHECKPOINT_FILE, json.dumps({'completed': completed}, indent=2))
 
 def main():
     """Main scraper"""
@@ -124,7 +126,7 @@ def main():
                 'total_journalists': len(journalists),
                 'journalists': journalists
             }
-            output_file.write_text(json.dumps(data, indent=2))
+            atomic_write(output_file, json.dumps(data, indent=2))
             
             print(f"  💾 Saved {len(journalists)} journalists to file://{output_file}")
             print(f"  ✅ Completed {name}\n")
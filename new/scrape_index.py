@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""Persistent scrape-state index keyed by journalist_id"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / 'muckrack' / 'datamuckrack'
+INDEX_DB = BASE_DIR / 'muckrack' / 'scrape_state.db'
+
+# One bit per scraper section, same names as getjournalistdetails.SECTIONS
+SECTION_BITS = {'profile': 1, 'portfolio': 2, 'bio': 4, 'awards': 8, 'interviews': 16}
+ALL_SECTIONS = sum(SECTION_BITS.values())
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journalists (
+    journalist_id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    name TEXT,
+    location TEXT,
+    path TEXT,
+    sections INTEGER NOT NULL DEFAULT 0,
+    scraped_at TEXT,
+    fetched INTEGER NOT NULL DEFAULT 0,
+    content_hash TEXT,
+    verified_at TEXT
+);
+CREATE INDEX IF NOT EXISTS journalists_location ON journalists(location);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    journalist_id TEXT NOT NULL,
+    location TEXT,
+    path TEXT,
+    content_hash TEXT,
+    changed_at TEXT NOT NULL
+);
+"""
+
+# Added after the first release; ALTERed into older databases on open
+LATE_COLUMNS = {'fetched': 'INTEGER NOT NULL DEFAULT 0', 'content_hash': 'TEXT', 'verified_at': 'TEXT'}
+
+UPSERT = ('INSERT OR REPLACE INTO journalists '
+          '(journalist_id, url, name, location, path, sections, scraped_at, fetched, content_hash, verified_at) '
+          'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)')
+FEED = 'INSERT INTO changes (journalist_id, location, path, content_hash, changed_at) VALUES (?, ?, ?, ?, ?)'
+
+# Bookkeeping keys that change on every save without the content changing
+VOLATILE_KEYS = ('scraped_at', 'updated_at', 'content_hash')
+
+# Record key written by the detail scraper for each section, even when the page was empty
+SECTION_KEYS = {'profile': 'profile', 'portfolio': 'portfolio', 'bio': 'biography', 'awards': 'awards',
+                'interviews': 'interviews'}
+
+
+def journalist_id_from_url(url: str) -> str:
+    """https://muckrack.com/joseph-goldstein -> joseph-goldstein"""
+    return url.rstrip('/').split('/')[-1]
+
+
+def name_from_path(path: str) -> str:
+    """Name the stores load a record by: '{location}/{name}/{name}.json' -> name, '3f1/{id}.json' -> id"""
+    parts = path.split('/')
+    return parts[1] if len(parts) == 3 else unquote(Path(path).stem)
+
+
+def section_mask(data: Dict) -> int:
+    """Bitmask of the sections present in a saved journalist record"""
+    mask = 0
+    profile = data.get('profile') or {}
+    if profile.get('name'):
+        mask |= SECTION_BITS['profile']
+    if (data.get('biography') or '').strip():
+        mask |= SECTION_BITS['bio']
+    if data.get('portfolio'):
+        mask |= SECTION_BITS['portfolio']
+    if data.get('awards'):
+        mask |= SECTION_BITS['awards']
+    if data.get('interviews'):
+        mask |= SECTION_BITS['interviews']
+    return mask
+
+
+def fetched_mask(data: Dict) -> int:
+    """Bitmask of the sections that were fetched at least once, empty or not"""
+    return sum(bit for section, bit in SECTION_BITS.items() if SECTION_KEYS[section] in data)
+
+
+def content_hash(data: Dict) -> str:
+    """Stable digest of a record's content, ignoring VOLATILE_KEYS and key order"""
+    content = {k: v for k, v in data.items() if k not in VOLATILE_KEYS}
+    canonical = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def missing_sections(mask: int) -> Set[str]:
+    """Section names whose bit is not set in ``mask``"""
+    return {section for section, bit in SECTION_BITS.items() if not mask & bit}
+
+
+def index_row(data: Dict, rel_path: str, location: str) -> Optional[Tuple]:
+    """Table row for a saved record; built in worker processes for batch upserts"""
+    url = data.get('url') or data.get('link')
+    if not url:
+        return None
+    return (
+        journalist_id_from_url(url),
+        url,
+        (data.get('profile') or {}).get('name') or data.get('name', ''),
+        location,
+        rel_path,
+        section_mask(data),
+        data.get('scraped_at') or data.get('updated_at', ''),
+        fetched_mask(data),
+        content_hash(data),
+        data.get('scraped_at') or data.get('updated_at', '')
+    )
+
+
+def _scan_location(args: Tuple[str, str]):
+    """Worker: parse every profile of one location directory"""
+    data_dir, location = args
+    rows, errors = [], 0
+    with os.scandir(os.path.join(data_dir, location)) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            rel_path = f'{location}/{entry.name}/{entry.name}.json'
+            try:
+                with open(os.path.join(data_dir, rel_path), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                continue
+            except ValueError:
+                errors += 1
+                continue
+            row = index_row(data, rel_path, location)
+            if row:
+                rows.append(row)
+    return rows, errors
+
+
+class ScrapeIndex:
+    """SQLite table of every saved journalist, updated on save"""
+
+    def __init__(self, db_path: Path = INDEX_DB):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(str(db_path), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(journalists)')}
+        with self.conn:
+            for column, decl in LATE_COLUMNS.items():
+                if column not in columns:
+                    # Empty until the next rebuild
+                    self.conn.execute(f'ALTER TABLE journalists ADD COLUMN {column} {decl}')
+
+    def is_empty(self) -> bool:
+        return self.conn.execute('SELECT 1 FROM journalists LIMIT 1').fetchone() is None
+
+    def record_saved(self, data: Dict, path: Path, location: str, data_dir: Path = DATA_DIR):
+        """Upsert one journalist right after its JSON was written, and log it to the change feed"""
+        try:
+            rel_path = str(Path(path).relative_to(data_dir))
+        except ValueError:
+            rel_path = str(path)
+        row = index_row(data, rel_path, location)
+        if not row:
+            return
+        self.record_rows([row])
+
+    def record_rows(self, rows, feed: bool = True):
+        """Upsert a batch of ``index_row()`` rows in one transaction"""
+        rows = list(rows)
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(UPSERT, rows)
+            if feed:
+                self.conn.executemany(FEED, ((row[0], row[3], row[4], row[8], now) for row in rows))
+
+    def verify(self, journalist_id: str, path: str, digest: str) -> bool:
+        """True, and stamp verified_at, when the indexed copy at ``path`` already has ``digest``"""
+        with self.conn:
+            cur = self.conn.execute(
+                'UPDATE journalists SET verified_at = ? WHERE journalist_id = ? AND path = ? AND content_hash = ?',
+                (datetime.now().isoformat(), journalist_id, path, digest))
+        return cur.rowcount > 0
+
+    def content_hashes(self, journalist_ids) -> Dict[str, Tuple[str, str]]:
+        """journalist_id -> (path, content_hash) for the given ids"""
+        found = {}
+        ids = list(journalist_ids)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            found.update((jid, (path, digest)) for jid, path, digest in self.conn.execute(
+                f'SELECT journalist_id, path, content_hash FROM journalists '
+                f'WHERE journalist_id IN ({", ".join("?" * len(chunk))})', chunk))
+        return found
+
+    def locate(self, journalist_ids) -> Dict[str, Tuple[str, str]]:
+        """journalist_id -> (location, path) of the indexed copy, for the given ids"""
+        found = {}
+        ids = list(journalist_ids)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            found.update((jid, (location, path)) for jid, location, path in self.conn.execute(
+                f'SELECT journalist_id, location, path FROM journalists '
+                f'WHERE journalist_id IN ({", ".join("?" * len(chunk))})', chunk))
+        return found
+
+    def forget(self, url: str):
+        """Drop a journalist whose record was removed, so the next run scrapes it again"""
+        journalist_id = journalist_id_from_url(url)
+        with self.conn:
+            cur = self.conn.execute('DELETE FROM journalists WHERE journalist_id = ?', (journalist_id,))
+            if cur.rowcount:
+                # A NULL hash tells feed consumers the record is gone
+                self.conn.execute(FEED, (journalist_id, None, None, None, datetime.now().isoformat()))
+
+    def changes_since(self, seq: int = 0, limit: Optional[int] = None) -> Iterator[Tuple[int, str, str, str, str, str]]:
+        """(seq, journalist_id, location, path, content_hash, changed_at) after ``seq``, oldest first"""
+        yield from self.conn.execute(
+            'SELECT seq, journalist_id, location, path, content_hash, changed_at FROM changes '
+            'WHERE seq > ? ORDER BY seq LIMIT ?', (seq, -1 if limit is None else limit))
+
+    def scraped_urls(self) -> Set[str]:
+        return {url for (url,) in self.conn.execute('SELECT url FROM journalists')}
+
+    def get(self, journalist_id: str) -> Optional[Dict]:
+        cur = self.conn.execute('SELECT * FROM journalists WHERE journalist_id = ?', (journalist_id,))
+        row = cur.fetchone()
+        if not row:
+            return None
+        return dict(zip([c[0] for c in cur.description], row))
+
+    def iter_location(self, location: str) -> Iterator[Tuple[str, str, str, int]]:
+        """(journalist_id, url, path, sections) for every journalist of a location"""
+        yield from self.conn.execute(
+            'SELECT journalist_id, url, path, sections FROM journalists WHERE location = ?', (location,))
+
+    def iter_all(self) -> Iterator[Tuple[str, str, str, str, int, int, str]]:
+        """(journalist_id, url, location, path, sections, fetched, checked_at) for every journalist
+
+        ``checked_at`` is the later of the last content change and the last
+        fetch that found the content unchanged.
+        """
+        yield from self.conn.execute(
+            "SELECT journalist_id, url, location, path, sections, fetched, "
+            "MAX(COALESCE(scraped_at, ''), COALESCE(verified_at, '')) FROM journalists")
+
+    def locations(self) -> List[str]:
+        return [loc for (loc,) in self.conn.execute('SELECT DISTINCT location FROM journalists ORDER BY 1')]
+
+    def missing_matrix(self) -> Dict[str, Dict[str, int]]:
+        """location -> {'total': n, section: journalists missing it}, aggregated in SQLite"""
+        sums = ', '.join(f'SUM((sections & {bit}) = 0)' for bit in SECTION_BITS.values())
+        matrix = {}
+        for location, total, *missing in self.conn.execute(
+                f'SELECT location, COUNT(*), {sums} FROM journalists GROUP BY location ORDER BY location'):
+            matrix[location] = {'total': total, **dict(zip(SECTION_BITS, missing))}
+        return matrix
+
+    def ensure_built(self, store=None, data_dir: Path = DATA_DIR) -> Optional[Dict]:
+        """Populate an empty index from the packed store or the directory tree"""
+        if not self.is_empty():
+            return None
+        start = time.time()
+        if getattr(store, 'backend', 'tree') != 'tree':
+            rows = [row for location, name, data in store.iter_records()
+                    if (row := index_row(data, store.key(location, name, data), location))]
+            self.record_rows(rows, feed=False)
+            return {'indexed': len(rows), 'errors': 0, 'seconds': time.time() - start}
+        if data_dir.exists() and any(data_dir.iterdir()):
+            return self.rebuild(data_dir)
+        return None
+
+    def rebuild(self, data_dir: Path = DATA_DIR, workers: Optional[int] = None) -> Dict:
+        """Reconstruct the table from the directory tree, one worker per location"""
+        from concurrent.futures import ProcessPoolExecutor
+
+        start = time.time()
+        locations = [e.name for e in os.scandir(data_dir) if e.is_dir()] if data_dir.exists() else []
+        total = errors = 0
+        with self.conn:
+            self.conn.execute('DELETE FROM journalists')
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for rows, errs in pool.map(_scan_location, [(str(data_dir), loc) for loc in locations]):
+                    self.conn.executemany(UPSERT, rows)
+                    total += len(rows)
+                    errors += errs
+        return {'indexed': total, 'errors': errors, 'locations': len(locations),
+                'seconds': time.time() - start}
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scrape-state index')
+    sub = parser.add_subparsers(dest='command', required=True)
+    rebuild = sub.add_parser('rebuild', help='Rebuild the index from datamuckrack/')
+    rebuild.add_argument('--workers', type=int, default=None)
+    sub.add_parser('stats', help='Show index counts per location')
+    sub.add_parser('matrix', help='Journalists missing each section, per location')
+    changes = sub.add_parser('changes', help='Print the changed-record feed as JSON lines')
+    changes.add_argument('--since', type=int, default=0, help='Last seq already consumed')
+    changes.add_argument('--limit', type=int, default=None)
+    args = parser.parse_args()
+
+    index = ScrapeIndex()
+    try:
+        if args.command == 'rebuild':
+            print(f"🔍 Rebuilding {INDEX_DB} from {DATA_DIR}...")
+            result = index.rebuild(workers=args.workers)
+            print(f"✅ Indexed {result['indexed']:,} journalists across {result['locations']} locations "
+                  f"in {result['seconds']:.1f}s ({result['errors']} unreadable files)")
+        elif args.command == 'stats':
+            rows = index.conn.execute(
+                'SELECT location, COUNT(*) FROM journalists GROUP BY location ORDER BY 2 DESC').fetchall()
+            for location, count in rows:
+                print(f"{location:30} {count:>10,}")
+            print(f"{'TOTAL':30} {sum(c for _, c in rows):>10,}")
+        elif args.command == 'matrix':
+            matrix = index.missing_matrix()
+            columns = ['total', *SECTION_BITS]
+            print(f"{'location':30}" + ''.join(f"{c:>12}" for c in columns))
+            for location, counts in matrix.items():
+                print(f"{location:30}" + ''.join(f"{counts[c]:>12,}" for c in columns))
+            print(f"{'TOTAL':30}" + ''.join(f"{sum(m[c] for m in matrix.values()):>12,}" for c in columns))
+        elif args.command == 'changes':
+            keys = ('seq', 'journalist_id', 'location', 'path', 'content_hash', 'changed_at')
+            for row in index.changes_since(args.since, args.limit):
+                print(json.dumps(dict(zip(keys, row)), ensure_ascii=False))
+    finally:
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
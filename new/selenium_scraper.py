@@ -7,14 +7,14 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Set
 import time
 import random
-import re
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from extraction import extract_bio, extract_page
+
 SECTIONS = ['profile', 'portfolio', 'bio', 'awards', 'interviews']
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / 'muckrack' / 'datamuckrack'
@@ -65,110 +65,6 @@ class JournalistScraper:
         except:
             return None
     
-    def parse_profile(self, soup):
-        intro = soup.select_one('div.profile-section.profile-intro')
-        if not intro:
-            return {}
-        c = intro.select_one('div.mr-card-content')
-        if not c:
-            return {}
-        
-        pronouns = (p.get_text(strip=True) if (p := c.select_one('div.fs-6.text-muted.fw-light')) else '')
-        intro_text = (desc.get_text(strip=True) if (desc := c.select_one('div.fs-5.fs-md-6.my-5')) else '')
-        
-        social_handles = []
-        if intro_text:
-            for handle in re.findall(r'@(\\w+)', intro_text):
-                social_handles.append({'handle': f'@{handle}', 'link': f'https://twitter.com/{handle.lower()}'})
-        
-        jobs = []
-        for li in c.select('ul.mr-person-job-items li'):
-            text = li.get_text(strip=True).replace('\\uf1ad', '').strip()
-            a = li.select_one('a')
-            if ',' in text and a:
-                title = text.split(',')[0].strip()
-                href = a.get('href', '')
-                full_url = href if href.startswith('http') else f"https://muckrack.com{href}"
-                jobs.append({'title': title, 'outlet': a.get_text(strip=True), 'outletLink': full_url})
-        
-        covers = doesnt_cover = ''
-        for item in c.select('div.profile-details-item'):
-            txt = item.get_text()
-            if 'Covers:' in txt:
-                covers = txt.split('Covers:', 1)[1].strip()
-            elif "Doesn't Cover:" in txt:
-                doesnt_cover = txt.split("Doesn't Cover:", 1)[1].strip()
-        
-        return {
-            'avatar': (img.get('src', '') if (img := c.select_one('img[src*="profile/images"]')) else ''),
-            'name': (h1.get_text(strip=True) if (h1 := c.select_one('h1.profile-name')) else ''),
-            'pronouns': pronouns,
-            'verified': bool(c.select_one('small.profile-verified')),
-            'jobs': jobs,
-            'location': (s.get_text(strip=True) if (s := c.select_one('div.person-details-location span')) else ''),
-            'beats': [{'name': a.get_text(strip=True), 'link': f"https://muckrack.com{a.get('href', '')}"} for a in c.select('div.person-details-beats a')],
-            'asSeenIn': [{'name': a.get_text(strip=True), 'link': f"https://muckrack.com{a.get('href', '')}"} for a in c.select('div.profile-details-item a')],
-            'socialHandles': social_handles,
-            'covers': covers,
-            'doesnt_cover': doesnt_cover,
-            'intro': intro_text
-        }
-    
-    def parse_bio(self, soup):
-        bio_div = soup.select_one('div.profile-section.profile-bio div.mr-card-content')
-        if not bio_div:
-            return ''
-        return '\\n\\n'.join([p.get_text(strip=True) for p in bio_div.select('p') if p.get_text(strip=True)])
-    
-    def parse_articles(self, soup):
-        articles = []
-        for item in soup.select('div.portfolio-item-container'):
-            article = {}
-            if h3 := item.select_one('h3.portfolio-item-title'):
-                article['title'] = h3.get_text(strip=True)
-            if link := item.select_one('a.portfolio-item-hover'):
-                article['link'] = link.get('href', '')
-            article['date'] = (date_span.get_text(strip=True) if (date_span := item.select_one('span.date')) else '')
-            article['description'] = (p.get_text(strip=True) if (p := item.select_one('div.preview-contents p')) else '')
-            article['image'] = (img.get('src', '') if (img := item.select_one('img')) else '')
-            article['outlet'] = ''
-            if pub_div := item.select_one('div.portfolio-item-publication a'):
-                for cls in pub_div.get('class', []):
-                    if 'sprite-group-thumbnails-' in cls:
-                        article['outlet'] = cls.replace('sprite-group-thumbnails-', '').title()
-                        break
-            if article.get('title'):
-                articles.append(article)
-        return articles
-    
-    def parse_awards(self, soup):
-        awards = []
-        for item in soup.select('div.profile-award'):
-            award = {}
-            if h4 := item.select_one('h4.item-header'):
-                award['title'] = h4.get_text(strip=True)
-            if h5 := item.select_one('h5'):
-                text = h5.get_text(strip=True)
-                parts = text.split('-', 1)
-                award['year'] = parts[0].strip() if len(parts) == 2 else text
-                award['award_name'] = parts[1].strip() if len(parts) == 2 else ''
-            award['description'] = (p.get_text(strip=True) if (p := item.select_one('p.mt-4')) else '')
-            if award:
-                awards.append(award)
-        return awards
-    
-    def parse_interviews(self, soup):
-        interviews = []
-        for item in soup.select('div.profile-interview-answer'):
-            interview = {}
-            if h4 := item.select_one('h4'):
-                interview['question'] = h4.get_text(strip=True)
-            if answer_div := item.select_one('div.interview-answer'):
-                interview['answer'] = answer_div.get_text(strip=True)
-            if interview:
-                interviews.append(interview)
-        return interviews
-    
     def get_missing_sections(self, name: str) -> Set[str]:
         data_file = DATA_DIR / self.location / name / f'{name}.json'
         existing = set()
@@ -210,17 +106,17 @@ class JournalistScraper:
             if not html:
                 raise Exception("Failed to fetch")
             
-            soup = BeautifulSoup(html, 'lxml')
+            page = extract_page(html)
             
             if 'profile' in missing:
-                data['profile'] = self.parse_profile(soup)
+                data['profile'] = page['profile']
             if 'bio' in missing:
-                bio = self.parse_bio(soup)
+                bio = page['biography']
                 if not bio or len(bio) < 100:
                     time.sleep(random.uniform(0.5, 1))
                     bio_html = self.fetch(f'https://muckrack.com/{journalist_id}/bio')
                     if bio_html:
-                        full_bio = self.parse_bio(BeautifulSoup(bio_html, 'lxml'))
+                        full_bio = extract_bio(bio_html)
                         if full_bio:
                             bio = full_bio
                 data['biography'] = bio
@@ -228,18 +124,18 @@ class JournalistScraper:
                 time.sleep(random.uniform(0.5, 1))
                 port_html = self.fetch(f'https://muckrack.com/{journalist_id}/portfolio')
                 if port_html:
-                    data['portfolio'] = self.parse_articles(BeautifulSoup(port_html, 'lxml'))
+                    data['portfolio'] = extract_page(port_html)['portfolio']
                     data['portfolio_count'] = len(data['portfolio'])
             if 'awards' in missing:
                 time.sleep(random.uniform(0.5, 1))
                 award_html = self.fetch(f'https://muckrack.com/{journalist_id}/awards')
                 if award_html:
-                    data['awards'] = self.parse_awards(BeautifulSoup(award_html, 'lxml'))
+                    data['awards'] = extract_page(award_html)['awards']
             if 'interviews' in missing:
                 time.sleep(random.uniform(0.5, 1))
                 int_html = self.fetch(f'https://muckrack.com/{journalist_id}/interview')
                 if int_html:
-                    data['interviews'] = self.parse_interviews(BeautifulSoup(int_html, 'lxml'))
+                    data['interviews'] = extract_page(int_html)['interviews']
             
             data.setdefault('profile', {})
             data.setdefault('biography', '')
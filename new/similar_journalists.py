@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""Similar journalists: MinHash signatures over beats and outlets, LSH buckets.
+
+A journalist's features are the beat slugs and outlet slugs (asSeenIn, the
+full as-seen-in list and job outlets) that facet_index.py indexes. Each
+feature set gets a 64-value MinHash signature; two signatures agree on a
+value with probability equal to the sets' Jaccard similarity. The signature
+is cut into 32 bands of 2 values and each band hashed to a bucket, so
+journalists sharing a bucket are the candidates and only those are scored,
+by exact Jaccard. A pair at Jaccard 0.2 shares a bucket ~75% of the time,
+at 0.4 over 99%; pairs with one beat in common and little else rarely do.
+
+Signatures, features and buckets persist in muckrack/similar.db and follow
+the scrape-state change feed like the other indexes. ``batch`` stores the
+top-k neighbours of every journalist, computed across a process pool.
+
+    python3 similar_journalists.py rebuild
+    python3 similar_journalists.py update                 # apply the change feed
+    python3 similar_journalists.py similar joseph-goldstein [--k 10]
+    python3 similar_journalists.py batch [--k 20] [--workers 4]
+    python3 similar_journalists.py neighbours joseph-goldstein
+    python3 similar_journalists.py bench [--journalists 66000]
+"""
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import random
+import sqlite3
+import time
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from facet_index import record_terms
+from scrape_index import ScrapeIndex
+
+BASE_DIR = Path(__file__).parent.parent
+SIMILAR_DB = BASE_DIR / 'muckrack' / 'similar.db'
+
+PERMUTATIONS = 64
+BANDS = 32
+ROWS = PERMUTATIONS // BANDS
+# Candidates read per bucket, lowest doc numbers (earliest indexed) first. A bucket this large
+# means one very common beat or outlet won both of a band's hashes; the cap bounds query time,
+# and journalists past it are missed through that band only, not through the other 31
+MAX_BUCKET = 2000
+# Universal hashing h(x) = (a * x + b) mod p; fixed seed so signatures stay comparable across runs
+PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)
+HASHES = [(_rng.randrange(1, PRIME), _rng.randrange(0, PRIME)) for _ in range(PERMUTATIONS)]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sim_docs (
+    doc INTEGER PRIMARY KEY,
+    journalist_id TEXT NOT NULL UNIQUE,
+    features TEXT NOT NULL,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sim_buckets (
+    bucket INTEGER NOT NULL,
+    doc INTEGER NOT NULL,
+    PRIMARY KEY (bucket, doc)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sim_neighbours (
+    doc INTEGER PRIMARY KEY,
+    neighbours TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sim_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def record_features(data: Dict) -> Set[str]:
+    """'beat:{slug}' and 'outlet:{slug}' features of one record; location is left out"""
+    return {f'{facet}:{term}' for facet, term in record_terms(data) if facet != 'location'}
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def signature(features: Iterable[str]) -> List[int]:
+    """MinHash signature: per hash function, the minimum over the feature hashes"""
+    values = [_hash64(feature) for feature in features]
+    return [min((a * x + b) % PRIME for x in values) for a, b in HASHES]
+
+
+def buckets(sig: List[int]) -> List[int]:
+    """One signed 64-bit bucket per band; the band number is part of the key"""
+    raw = array('Q', sig).tobytes()
+    width = ROWS * 8
+    return [int.from_bytes(hashlib.blake2b(bytes([band]) + raw[band * width:(band + 1) * width],
+                                           digest_size=8).digest(), 'little', signed=True)
+            for band in range(BANDS)]
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared) if a or b else 0.0
+
+
+class SimilarityIndex:
+    """Signatures, LSH buckets and stored neighbour lists, in their own SQLite file"""
+
+    def __init__(self, db_path: Path = SIMILAR_DB):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(str(db_path), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        # doc -> (journalist_id, features), filled as candidates are scored
+        self._docs: Dict[int, Tuple[str, Set[str]]] = {}
+
+    # Building
+
+    def rebuild(self, records: Iterable[Tuple[str, Dict]], seq: int = 0, chunk: int = 5000) -> Dict:
+        """Replace the index with ``(journalist_id, data)`` records; those without beats or outlets are skipped"""
+        start = time.perf_counter()
+        count = 0
+        with self.conn:
+            for table in ('sim_docs', 'sim_buckets', 'sim_neighbours'):
+                self.conn.execute(f'DELETE FROM {table}')
+            rows = []
+            for journalist_id, data in records:
+                features = record_features(data)
+                if features:
+                    rows.append((count, journalist_id, features))
+                    count += 1
+                if len(rows) >= chunk:
+                    self._insert(rows)
+                    rows = []
+            self._insert(rows)
+            self._set_seq(seq)
+        self._docs.clear()
+        return {'journalists': count, 'seconds': time.perf_counter() - start}
+
+    def _insert(self, rows: List[Tuple[int, str, Set[str]]]):
+        signed = [(doc, journalist_id, features, signature(features)) for doc, journalist_id, features in rows]
+        self.conn.executemany('INSERT INTO sim_docs VALUES (?, ?, ?, ?)',
+                              ((doc, journalist_id, json.dumps(sorted(features)), array('Q', sig).tobytes())
+                               for doc, journalist_id, features, sig in signed))
+        self.conn.executemany('INSERT OR IGNORE INTO sim_buckets VALUES (?, ?)',
+                              ((bucket, doc) for doc, _, _, sig in signed for bucket in buckets(sig)))
+
+    def apply(self, changed: Dict[str, Optional[Dict]], seq: int) -> int:
+        """Re-sign changed journalists (``None`` = removed) and record the feed position
+
+        Stored neighbour lists are left as they are until the next ``batch``.
+        """
+        with self.conn:
+            rows = []
+            next_doc = self.conn.execute('SELECT COALESCE(MAX(doc) + 1, 0) FROM sim_docs').fetchone()[0]
+            for journalist_id, data in changed.items():
+                row = self.conn.execute('SELECT doc, signature FROM sim_docs WHERE journalist_id = ?',
+                                        (journalist_id,)).fetchone()
+                if row:
+                    doc = row[0]
+                    self.conn.executemany('DELETE FROM sim_buckets WHERE bucket = ? AND doc = ?',
+                                          ((bucket, doc) for bucket in buckets(list(array('Q', row[1])))))
+                    self.conn.execute('DELETE FROM sim_docs WHERE doc = ?', (doc,))
+                    self._docs.pop(doc, None)
+                else:
+                    doc, next_doc = next_doc, next_doc + 1
+                features = record_features(data) if data is not None else set()
+                if features:
+                    rows.append((doc, journalist_id, features))
+                else:
+                    self.conn.execute('DELETE FROM sim_neighbours WHERE doc = ?', (doc,))
+            self._insert(rows)
+            self._set_seq(seq)
+        return len(changed)
+
+    def seq(self) -> int:
+        row = self.conn.execute("SELECT value FROM sim_meta WHERE key = 'seq'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _set_seq(self, seq: int):
+        self.conn.execute("INSERT OR REPLACE INTO sim_meta VALUES ('seq', ?)", (str(seq),))
+
+    # Querying
+
+    def _load(self, docs: Iterable[int]):
+        missing = [doc for doc in docs if doc not in self._docs]
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            for doc, journalist_id, features in self.conn.execute(
+                    f'SELECT doc, journalist_id, features FROM sim_docs '
+                    f'WHERE doc IN ({", ".join("?" * len(chunk))})', chunk):
+                self._docs[doc] = (journalist_id, set(json.loads(features)))
+
+    def candidates(self, sig: List[int]) -> Set[int]:
+        """Docs sharing at least one band bucket with ``sig``, at most MAX_BUCKET per bucket"""
+        found = set()
+        for bucket in buckets(sig):
+            found.update(doc for (doc,) in self.conn.execute(
+                'SELECT doc FROM sim_buckets WHERE bucket = ? ORDER BY doc LIMIT ?', (bucket, MAX_BUCKET)))
+        return found
+
+    def similar_to(self, features: Set[str], k: int = 10, exclude: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Top ``k`` (journalist_id, Jaccard) for a feature set, most similar first"""
+        if not features:
+            return []
+        found = self.candidates(signature(features))
+        found.discard(exclude)
+        self._load(found)
+        docs = self._docs
+        scored = ((jaccard(features, docs[doc][1]), docs[doc][0]) for doc in found if doc in docs)
+        return [(journalist_id, score) for score, journalist_id in
+                heapq.nsmallest(k, scored, key=lambda item: (-item[0], item[1]))]
+
+    def similar(self, journalist_id: str, k: int = 10) -> Optional[List[Tuple[str, float]]]:
+        """Top ``k`` similar journalists, or None when ``journalist_id`` is not indexed"""
+        row = self.conn.execute('SELECT doc, features FROM sim_docs WHERE journalist_id = ?',
+                                (journalist_id,)).fetchone()
+        if row is None:
+            return None
+        return self.similar_to(set(json.loads(row[1])), k, exclude=row[0])
+
+    def neighbours(self, journalist_id: str) -> Optional[List[Tuple[str, float]]]:
+        """Neighbour list stored by the last ``batch``"""
+        row = self.conn.execute('SELECT n.neighbours FROM sim_neighbours n JOIN sim_docs d ON d.doc = n.doc '
+                                'WHERE d.journalist_id = ?', (journalist_id,)).fetchone()
+        return [tuple(item) for item in json.loads(row[0])] if row else None
+
+    def close(self):
+        self.conn.close()
+
+
+_worker_index: Optional[SimilarityIndex] = None
+
+
+def _neighbours_chunk(args: Tuple[str, List[Tuple[int, str]], int]) -> Dict:
+    """Worker: top-k lists for a chunk of docs; one read-only index per process keeps its feature cache"""
+    global _worker_index
+    db_path, docs, k = args
+    if _worker_index is None or str(_worker_index.db_path) != db_path:
+        _worker_index = SimilarityIndex(Path(db_path))
+    start = time.perf_counter()
+    results = [(doc, json.dumps(_worker_index.similar_to(set(json.loads(features)), k, exclude=doc)))
+               for doc, features in docs]
+    return {'pid': os.getpid(), 'results': results, 'seconds': time.perf_counter() - start}
+
+
+def batch(similar: SimilarityIndex, k: int = 20, workers: Optional[int] = None, chunk_size: int = 500) -> Dict:
+    """Store the top-k neighbours of every indexed journalist, computed in a process pool"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    stats = {'journalists': 0, 'seconds': 0.0, 'workers': {}}
+    start = time.perf_counter()
+
+    def chunks() -> Iterator[List[Tuple[int, str]]]:
+        # Keyset pages, read only as the pool needs them; no cursor stays open across the writes
+        last = -1
+        while True:
+            rows = similar.conn.execute('SELECT doc, features FROM sim_docs WHERE doc > ? ORDER BY doc LIMIT ?',
+                                        (last, chunk_size)).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield rows
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        remaining = chunks()
+        while True:
+            # A bounded number of chunks in flight; the parent is the only writer
+            while len(pending) < workers * 2:
+                chunk = next(remaining, None)
+                if chunk is None:
+                    break
+                pending.append(pool.submit(_neighbours_chunk, (str(similar.db_path), chunk, k)))
+            if not pending:
+                break
+            result = pending.popleft().result()
+            with similar.conn:
+                similar.conn.executemany('INSERT OR REPLACE INTO sim_neighbours VALUES (?, ?)', result['results'])
+            w = stats['workers'].setdefault(result['pid'], {'journalists': 0, 'seconds': 0.0})
+            w['journalists'] += len(result['results'])
+            w['seconds'] += result['seconds']
+            stats['journalists'] += len(result['results'])
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+def rebuild(similar: SimilarityIndex, store, index: ScrapeIndex) -> Dict:
+    """Re-index every journalist in ``store`` once; changes logged meanwhile are re-applied by the next update"""
+    from record_lookup import feed_seq, iter_journalists
+
+    return similar.rebuild(iter_journalists(store, index), feed_seq(index))
+
+
+def update(similar: SimilarityIndex, store, index: ScrapeIndex, batch_size: int = 5000) -> Dict:
+    """Apply the change feed since the last applied sequence number"""
+    from record_lookup import changed_records
+
+    stats = {'changes': 0, 'changed': 0}
+    for seq, entries, changed in changed_records(index, store, similar.seq(), batch_size):
+        stats['changed'] += similar.apply(changed, seq)
+        stats['changes'] += entries
+    return stats
+
+
+def bench(journalists: int, queries: int = 200, k: int = 10) -> Dict:
+    """Build over synthetic desks of related beats/outlets; time queries and check recall against brute force"""
+    import tempfile
+
+    rng = random.Random(7)
+    beats = [f'beat{i}' for i in range(150)]
+    outlets = [f'outlet{i}' for i in range(5000)]
+    # Journalists on the same desk draw from the same small pool, so true neighbours exist
+    desks = [(rng.sample(beats, 6), rng.sample(outlets, 15)) for _ in range(max(journalists // 40, 1))]
+
+    def profile():
+        desk_beats, desk_outlets = rng.choice(desks)
+        return {'profile': {
+            'beats': [{'name': b, 'link': f'https://muckrack.com/beat/{b}'}
+                      for b in rng.sample(desk_beats, 3) + rng.sample(beats, rng.randint(0, 1))],
+            'asSeenIn': [{'name': o, 'link': f'https://muckrack.com/media-outlet/{o}'}
+                         for o in rng.sample(desk_outlets, 6) + rng.sample(outlets, rng.randint(0, 2))],
+            'jobs': [{'title': 'Reporter', 'outlet': o, 'outletLink': f'https://muckrack.com/media-outlet/{o}'}
+                     for o in rng.sample(desk_outlets, 1)]}}
+
+    records = [(f'person-{i}', profile()) for i in range(journalists)]
+    with tempfile.TemporaryDirectory(prefix='similar_bench_') as tmp:
+        similar = SimilarityIndex(Path(tmp) / 'similar.db')
+        built = similar.rebuild(iter(records))
+        sample = rng.sample(records, min(queries, len(records)))
+        start = time.perf_counter()
+        found = [similar.similar(journalist_id, k) for journalist_id, _ in sample]
+        cold_ms = (time.perf_counter() - start) / len(sample) * 1000
+        start = time.perf_counter()
+        for journalist_id, _ in sample:
+            similar.similar(journalist_id, k)
+        warm_ms = (time.perf_counter() - start) / len(sample) * 1000
+        # Recall: share of the exact top-k scores that LSH returns, on a few queries
+        features = [(journalist_id, record_features(data)) for journalist_id, data in records]
+        hit = total = 0
+        for (journalist_id, data), result in list(zip(sample, found))[:20]:
+            mine = record_features(data)
+            exact = sorted((jaccard(mine, other) for other_id, other in features if other_id != journalist_id),
+                           reverse=True)[:k]
+            got = sorted((score for _, score in result), reverse=True)
+            hit += sum(1 for a, b in zip(exact, got) if b >= a - 1e-9)
+            total += len(exact)
+        similar.close()
+    return {'journalists': built['journalists'], 'build_s': built['seconds'], 'cold_ms': cold_ms,
+            'warm_ms': warm_ms, 'recall': hit / max(total, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Similar journalists by beats and outlets (MinHash / LSH)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('rebuild', help='Sign every saved record')
+    sub.add_parser('update', help='Apply the scrape-state change feed')
+    run_similar = sub.add_parser('similar', help='Most similar journalists to one journalist_id')
+    run_similar.add_argument('journalist_id')
+    run_similar.add_argument('--k', type=int, default=10)
+    run_batch = sub.add_parser('batch', help='Store neighbour lists for everyone (process pool)')
+    run_batch.add_argument('--k', type=int, default=20)
+    run_batch.add_argument('--workers', type=int, default=None)
+    run_neighbours = sub.add_parser('neighbours', help='Stored neighbour list of one journalist_id')
+    run_neighbours.add_argument('journalist_id')
+    run_bench = sub.add_parser('bench', help='Query latency and recall on a synthetic corpus')
+    run_bench.add_argument('--journalists', type=int, default=66000)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        r = bench(args.journalists)
+        print(f"🧪 {r['journalists']:,} journalists signed in {r['build_s']:.1f}s")
+        print(f"   top-10: {r['cold_ms']:.2f} ms cold, {r['warm_ms']:.2f} ms warm, recall {r['recall']:.0%}")
+        return
+    similar = SimilarityIndex()
+    try:
+        if args.command in ('similar', 'neighbours'):
+            start = time.perf_counter()
+            found = (similar.similar(args.journalist_id, args.k) if args.command == 'similar'
+                     else similar.neighbours(args.journalist_id))
+            if found is None:
+                raise SystemExit(f"❌ {args.journalist_id}: not indexed"
+                                 f"{'' if args.command == 'similar' else ' or no batch run yet'}")
+            print(f"👥 {len(found)} similar journalists in {(time.perf_counter() - start) * 1000:.1f} ms")
+            for journalist_id, score in found:
+                print(f"  {score:5.2f}  https://muckrack.com/{journalist_id}")
+        elif args.command == 'batch':
+            result = batch(similar, args.k, args.workers)
+            print(f"👥 {result['journalists']:,} neighbour lists in {result['seconds']:.1f}s "
+                  f"across {len(result['workers'])} workers")
+        else:
+            from record_store import open_store
+
+            index = ScrapeIndex()
+            store = open_store(index=index)
+            try:
+                index.ensure_built(store)
+                result = rebuild(similar, store, index) if args.command == 'rebuild' else update(similar, store, index)
+            finally:
+                store.close()
+                index.close()
+            if args.command == 'rebuild':
+                print(f"🗂️  {result['journalists']:,} journalists signed in {result['seconds']:.1f}s")
+            else:
+                print(f"🔄 {result['changes']:,} changes -> {result['changed']:,} journalists re-signed")
+    finally:
+        similar.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""pytest: analytics export writes one row per journalist, with every location listing it"""
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+import pyarrow.parquet as pq
+
+from analytics_export import export, query
+
+
+def test_a_journalist_saved_under_two_locations_is_exported_once(tmp_path: Path, saved, record):
+    saved.save('Pakistan', 'Jane Doe', record('jane-doe', ['politics']))
+    # Saved last: the index points at this copy
+    saved.save('Us', 'Jane Doe', record('jane-doe', ['politics', 'elections'], locations=['Us', 'Pakistan']))
+    saved.save('Us', 'Bob', record('bob', ['politics']))
+    out = tmp_path / 'analytics'
+
+    result = export(saved.store, saved.index, out)
+
+    assert result['journalists'] == 2
+    assert result['rows']['beats'] == 3
+    journalists = pq.read_table(out / 'journalists.parquet').to_pylist()
+    assert sorted((row['journalist_id'], row['location']) for row in journalists) == [('bob', 'Us'), ('jane-doe', 'Us')]
+    assert sorted(query(out, beat='politics')['journalist_id'].to_pylist()) == ['bob', 'jane-doe']
+    assert query(out, location='Pakistan')['journalist_id'].to_pylist() == ['jane-doe']
+
+    # --location keeps the journalists indexed there
+    assert export(saved.store, saved.index, out, location='Pakistan')['journalists'] == 0
+    assert export(saved.store, saved.index, out, location='Us')['journalists'] == 2
@@ -0,0 +1,52 @@
+"""pytest: atomic writes leave the old file or the new one, and batches commit all or nothing"""
+from pathlib import Path
+
+import pytest
+
+from atomic_write import WriteBatch, atomic_write, atomic_write_json
+
+
+def leftovers(directory: Path):
+    return sorted(p.name for p in directory.iterdir() if p.name.endswith('.tmp'))
+
+
+def test_atomic_write_replaces_the_file_and_leaves_no_temp_file(tmp_path: Path):
+    target = tmp_path / 'ann.json'
+    target.write_text('old')
+    atomic_write(target, 'new')
+    assert target.read_text() == 'new'
+    assert leftovers(tmp_path) == []
+
+
+def test_batched_files_appear_only_when_the_batch_is_flushed(tmp_path: Path):
+    with WriteBatch() as batch:
+        atomic_write_json(tmp_path / 'ann.json', {'name': 'Ann'}, batch)
+        atomic_write_json(tmp_path / 'ann.json', {'name': 'Ann B.'}, batch)
+        atomic_write_json(tmp_path / 'bob.json', {'name': 'Bob'}, batch)
+        assert not (tmp_path / 'ann.json').exists()
+        # A second write of the same target reuses its temp file
+        assert len(batch.pending) == 2
+    assert '"Ann B."' in (tmp_path / 'ann.json').read_text()
+    assert (tmp_path / 'bob.json').exists()
+    assert leftovers(tmp_path) == []
+
+
+def test_a_full_batch_flushes_on_its_own(tmp_path: Path):
+    batch = WriteBatch(size=2)
+    atomic_write(tmp_path / 'a', 'a', batch)
+    assert not (tmp_path / 'a').exists()
+    atomic_write(tmp_path / 'b', 'b', batch)
+    assert (tmp_path / 'a').read_text() == 'a' and (tmp_path / 'b').read_text() == 'b'
+    assert batch.pending == {}
+
+
+def test_an_exception_inside_a_batch_discards_it_and_keeps_the_old_files(tmp_path: Path):
+    (tmp_path / 'ann.json').write_text('old')
+    with pytest.raises(KeyboardInterrupt):
+        with WriteBatch() as batch:
+            atomic_write(tmp_path / 'ann.json', 'new', batch)
+            atomic_write(tmp_path / 'bob.json', 'new', batch)
+            raise KeyboardInterrupt
+    assert (tmp_path / 'ann.json').read_text() == 'old'
+    assert not (tmp_path / 'bob.json').exists()
+    assert leftovers(tmp_path) == []
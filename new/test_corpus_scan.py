@@ -0,0 +1,23 @@
+"""pytest: the hygiene sweep reads the tree layout and refuses other store backends"""
+import pytest
+
+from corpus_scan import missing_fields, scan
+
+
+def test_scan_reports_missing_fields_in_a_tree_store(saved, record, monkeypatch):
+    saved.save('Us', 'Ann', record('ann'))
+    monkeypatch.delenv('MUCKRACK_STORE', raising=False)
+
+    result = scan({'missing_fields': missing_fields}, data_dir=saved.data_dir, workers=1)
+
+    assert result['files'] == 1
+    assert [f['name'] for f in result['findings']['missing_fields']] == ['Ann']
+
+
+@pytest.mark.parametrize('backend', ['packed', 'sharded'])
+def test_scan_refuses_to_sweep_another_backend(saved, record, monkeypatch, backend):
+    saved.save('Us', 'Ann', record('ann'))
+    monkeypatch.setenv('MUCKRACK_STORE', backend)
+
+    with pytest.raises(RuntimeError, match='MUCKRACK_STORE=tree'):
+        scan({'missing_fields': missing_fields}, data_dir=saved.data_dir, workers=1)
@@ -0,0 +1,19 @@
+"""pytest: the profile card is read from the profile-intro section only"""
+from extraction import extract_page
+
+SIDEBAR = ('<div class="mr-card"><div class="mr-card-content">'
+           '<h1 class="profile-name">Related Journalist</h1></div></div>')
+INTRO = ('<div class="profile-section profile-intro mr-card"><div class="mr-card-content">'
+         '<h1 class="profile-name">Ann Smith</h1></div></div>')
+
+
+def page(*sections):
+    return f'<html><body>{"".join(sections)}</body></html>'
+
+
+def test_a_card_before_the_intro_section_is_not_the_profile():
+    assert extract_page(page(SIDEBAR, INTRO))['profile']['name'] == 'Ann Smith'
+
+
+def test_a_page_without_an_intro_section_has_no_profile():
+    assert extract_page(page(SIDEBAR))['profile'] == {}
@@ -0,0 +1,73 @@
+"""pytest: facet query grammar checked against a brute-force scan, and cached bitmaps across apply"""
+import random
+from pathlib import Path
+
+import pytest
+
+from facet_index import FacetIndex, _tokenize, record_terms
+
+
+def test_tokenize_handles_operators_parentheses_and_quoted_values():
+    assert _tokenize('beat:pakistan AND (outlet:washpost OR outlet:"new york times") NOT location:london') == [
+        ('term', ('beat', 'pakistan')), ('op', 'AND'), ('(', '('), ('term', ('outlet', 'washpost')),
+        ('op', 'OR'), ('term', ('outlet', 'new york times')), (')', ')'), ('op', 'NOT'),
+        ('term', ('location', 'london'))]
+
+
+@pytest.mark.parametrize('expression', ['beat:a AND', '(beat:a', 'beat:a)', 'nonsense', 'color:red'])
+def test_query_rejects_malformed_expressions(tmp_path: Path, record, expression):
+    facets = FacetIndex(tmp_path / 'facets.db')
+    facets.rebuild([('ann', record('ann', ['a']))])
+    with pytest.raises(ValueError):
+        facets.query(expression)
+    facets.close()
+
+
+def corpus(record, count: int, seed: int = 3):
+    rng = random.Random(seed)
+    return {f'p{i}': record(f'p{i}', rng.sample('abcde', rng.randint(0, 2)), rng.sample('wxyz', rng.randint(0, 2)),
+                            rng.choice([None, 'London', 'Karachi']))
+            for i in range(count)}
+
+
+# Expression, and the same test over one record's (facet, term) keys
+QUERIES = [
+    ('beat:a', lambda t: ('beat', 'a') in t),
+    ('beat:a beat:b', lambda t: ('beat', 'a') in t and ('beat', 'b') in t),
+    ('beat:a OR outlet:w AND NOT location:london',
+     lambda t: ('beat', 'a') in t or (('outlet', 'w') in t and ('location', 'london') not in t)),
+    ('(beat:a OR beat:b) AND NOT (outlet:w OR location:"Karachi")',
+     lambda t: (('beat', 'a') in t or ('beat', 'b') in t) and not (('outlet', 'w') in t or ('location', 'karachi') in t)),
+    ('NOT NOT beat:c', lambda t: ('beat', 'c') in t),
+]
+
+
+def brute_force(records, test):
+    return sorted(jid for jid, data in records.items() if data is not None and test(record_terms(data)))
+
+
+@pytest.mark.parametrize('expression,test', QUERIES)
+def test_query_matches_a_brute_force_scan(tmp_path: Path, record, expression, test):
+    records = corpus(record, 200)
+    facets = FacetIndex(tmp_path / 'facets.db')
+    facets.rebuild(records.items())
+    assert sorted(facets.journalist_ids(facets.query(expression))) == brute_force(records, test)
+    facets.close()
+
+
+def test_apply_refreshes_cached_bitmaps_to_match_a_brute_force_scan(tmp_path: Path, record):
+    records = corpus(record, 200)
+    facets = FacetIndex(tmp_path / 'facets.db')
+    facets.rebuild(records.items())
+    # Cached bitmaps must follow the update too
+    for expression, _ in QUERIES:
+        facets.query(expression)
+    changed = {'p1': record('p1', ['e'], ['z'], 'Karachi'), 'p2': None, 'new': record('new', ['a'], ['w'])}
+    facets.apply(changed, seq=7)
+    records.update(changed)
+
+    assert facets.seq() == 7
+    for expression, test in QUERIES:
+        assert sorted(facets.journalist_ids(facets.query(expression))) == brute_force(records, test)
+    assert 'p2' not in facets.journalist_ids(facets.query('NOT beat:zzz'))
+    facets.close()
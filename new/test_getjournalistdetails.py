@@ -0,0 +1,76 @@
+"""pytest: a plan run across interleaved locations, with a fake browser"""
+import time
+from pathlib import Path
+
+import pytest
+
+import getjournalistdetails
+from failure_log import FailureLog
+from getjournalistdetails import JournalistScraper, run_plan
+from planner import save_plan
+from record_store import TreeStore
+from scrape_index import ScrapeIndex
+
+PAGE = '<html><body><h1 class="profile-name">Someone</h1>' + '<p>filler</p>' * 1000 + '</body></html>'
+
+
+class FakeDriver:
+    """Serves PAGE; like a real session, every call fails once quit"""
+
+    def __init__(self, started):
+        started.append(self)
+        self.quit_called = False
+        self.fetched = []
+
+    def get(self, url):
+        if self.quit_called:
+            raise Exception('invalid session id')
+        self.fetched.append(url)
+
+    @property
+    def page_source(self):
+        if self.quit_called:
+            raise Exception('invalid session id')
+        return PAGE
+
+    def execute_script(self, script):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def scraper_env(tmp_path: Path, monkeypatch):
+    started = []
+    monkeypatch.setattr(getjournalistdetails, 'CHECKPOINT_DIR', tmp_path / 'checkpoints')
+    monkeypatch.setattr(getjournalistdetails, 'DATA_DIR', tmp_path / 'datamuckrack')
+    monkeypatch.setattr(getjournalistdetails, 'FailureLog', lambda: FailureLog(tmp_path / 'failures.db'))
+    monkeypatch.setattr(JournalistScraper, 'init_driver', lambda self: setattr(self, 'driver', FakeDriver(started)))
+    monkeypatch.setattr(JournalistScraper, 'wait_for', lambda self, selector: None)
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    (tmp_path / 'checkpoints').mkdir()
+    index = ScrapeIndex(tmp_path / 'scrape_state.db')
+    yield tmp_path, index, TreeStore(tmp_path / 'datamuckrack', index), started
+    index.close()
+
+
+def test_plan_run_keeps_one_browser_across_interleaved_locations(scraper_env):
+    tmp_path, index, store, started = scraper_env
+    items = [{'journalist_id': slug, 'location': location, 'name': slug.title(),
+              'url': f'https://muckrack.com/{slug}', 'sections': ['profile']}
+             for slug, location in [('ann', 'Usa'), ('bob', 'Uk'), ('cat', 'Usa'), ('dan', 'Uk')]]
+    plan_file = tmp_path / 'scrape_plan.json'
+    save_plan({'created_at': '2000-01-01T00:00:00', 'pages': 4, 'items': items}, plan_file)
+
+    run_plan(plan_file, index, None, store)
+
+    assert len(started) == 1 and started[0].quit_called
+    assert started[0].fetched == [item['url'] for item in items]
+    assert {(location, name) for location, name, _ in store.iter_records()} == {
+        ('Usa', 'Ann'), ('Uk', 'Bob'), ('Usa', 'Cat'), ('Uk', 'Dan')}
+    failures = FailureLog(tmp_path / 'failures.db')
+    assert failures.conn.execute('SELECT COUNT(*) FROM failures').fetchone()[0] == 0
+    failures.close()
+    # Each location's checkpoint got its own journalists
+    assert (tmp_path / 'checkpoints' / 'Usa_details_checkpoint.log').read_text().split() == ['"Ann"', '"Cat"']
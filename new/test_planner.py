@@ -0,0 +1,67 @@
+"""pytest: plan priorities, the empty-section recheck window and skipping work done since planning"""
+from datetime import datetime
+
+import pytest
+
+from planner import VOLATILE_SECTIONS, build_plan, pending_items, plan_entry
+from scrape_index import ALL_SECTIONS, SECTION_BITS
+
+REFRESH_BEFORE = '2024-06-01'
+RECHECK_BEFORE = '2024-01-01'
+
+
+def row(sections, scraped_at, fetched=0, path='Us/Ann/Ann.json'):
+    return ('ann', 'https://muckrack.com/ann', 'Us', path, sections, fetched, scraped_at)
+
+
+def entry(*args, **kwargs):
+    return plan_entry(row(*args, **kwargs), REFRESH_BEFORE, RECHECK_BEFORE)
+
+
+def test_incomplete_profiles_come_first_fullest_then_stalest():
+    profile_only = entry(SECTION_BITS['profile'], '2024-07-01')
+    almost = entry(ALL_SECTIONS & ~SECTION_BITS['awards'], '2024-07-01')
+    almost_stale = entry(ALL_SECTIONS & ~SECTION_BITS['awards'], '2023-01-01')
+    stale_complete = entry(ALL_SECTIONS, '2023-01-01')
+
+    ranked = sorted([profile_only, stale_complete, almost, almost_stale], key=lambda e: e[0])
+    assert ranked == [almost_stale, almost, profile_only, stale_complete]
+    assert almost[1]['sections'] == ['awards']
+    assert almost[1]['name'] == 'Ann'
+
+
+def test_complete_profiles_refresh_only_volatile_sections_once_stale():
+    assert entry(ALL_SECTIONS, '2024-07-01') is None
+    priority, item = entry(ALL_SECTIONS, '2024-03-01')
+    assert priority[0] == 1 and item['sections'] == list(VOLATILE_SECTIONS)
+
+
+@pytest.mark.parametrize('scraped_at,expected', [
+    ('2024-07-01', None),                       # fetched empty within the window, nothing stale
+    ('2024-03-01', list(VOLATILE_SECTIONS)),    # still within the window, but due a refresh
+    ('2023-06-01', ['awards']),                 # window passed: the empty section is retried
+])
+def test_a_section_fetched_empty_waits_for_the_recheck_window(scraped_at, expected):
+    found = entry(ALL_SECTIONS & ~SECTION_BITS['awards'], scraped_at, fetched=ALL_SECTIONS)
+    assert (found[1]['sections'] if found else None) == expected
+
+
+def test_a_journalist_without_a_saved_record_is_not_planned():
+    assert entry(0, '', path=None) is None
+
+
+def test_build_plan_ranks_the_index_and_pending_items_skips_work_done_since(saved, record):
+    saved.save('Us', 'Ann', record('ann', bio='Covers floods', scraped_at='2020-01-01'))
+    saved.save('Us', 'Bob', record('bob', scraped_at='2020-01-01'))
+    saved.save('Uk', 'Cat', dict(record('cat', bio='Covers courts', titles=['Courts']), scraped_at='2020-01-01',
+                                 awards=[{'title': 'Prize'}], interviews=[{'question': 'q'}]))
+
+    plan = build_plan(saved.index, refresh_days=30, recheck_days=180)
+    assert [item['journalist_id'] for item in plan['items']] == ['ann', 'bob', 'cat']
+    assert (plan['fill'], plan['refresh']) == (2, 1)
+    assert [item['journalist_id'] for item in build_plan(saved.index, limit=1)['items']] == ['ann']
+
+    # Bob is saved again after the plan was made, Cat found unchanged: only Ann is left to do
+    saved.save('Us', 'Bob', record('bob', bio='Covers sport', scraped_at=datetime.now().isoformat()))
+    saved.index.verify('cat', 'Uk/Cat/Cat.json', saved.index.get('cat')['content_hash'])
+    assert [item['journalist_id'] for item in pending_items(plan, saved.index)] == ['ann']
@@ -0,0 +1,87 @@
+"""pytest: the rebuild/update contract shared by facet_index, text_search and similar_journalists"""
+from pathlib import Path
+
+import pytest
+
+import facet_index
+import similar_journalists
+import text_search
+from record_lookup import feed_seq
+
+# name -> (index class, module with rebuild/update, journalist_ids the index finds for a topic)
+ENGINES = {
+    'facets': (facet_index.FacetIndex, facet_index,
+               lambda engine, topic: engine.journalist_ids(engine.query(f'beat:{topic}'))),
+    'text': (text_search.TextSearch, text_search,
+             lambda engine, topic: [jid for jid, _, _ in engine.search(topic)[0]]),
+    'similar': (similar_journalists.SimilarityIndex, similar_journalists,
+                lambda engine, topic: [jid for jid, score in engine.similar_to({f'beat:{topic}'}, 100) if score]),
+}
+BACKENDS = ['tree', 'packed', 'sharded']
+
+
+@pytest.fixture(params=sorted(ENGINES))
+def engine(tmp_path: Path, request):
+    cls, module, find = ENGINES[request.param]
+    opened = []
+
+    def open_engine(name='engine.db'):
+        opened.append(cls(tmp_path / name))
+        return opened[-1]
+
+    yield open_engine, module, lambda engine, topic: sorted(find(engine, topic))
+    for index in opened:
+        index.close()
+
+
+def covering(record, slug, topic):
+    """A journalist with ``topic`` as their one beat and in their biography"""
+    return record(slug, [topic], bio=f'Covers {topic}')
+
+
+@pytest.mark.parametrize('saved', BACKENDS, indirect=True)
+def test_rebuild_indexes_the_copy_the_scrape_index_points_at(engine, saved, record):
+    open_engine, module, find = engine
+    saved.save('Pakistan', 'Ann', covering(record, 'ann', 'floods'))
+    # Same journalist under a second location, saved last: the index points here
+    saved.save('Us', 'Ann', covering(record, 'ann', 'elections'))
+    saved.save('Us', 'Bob', covering(record, 'bob', 'elections'))
+
+    index = open_engine()
+    assert module.rebuild(index, saved.store, saved.index)['journalists'] == 2
+    assert find(index, 'elections') == ['ann', 'bob']
+    assert find(index, 'floods') == []
+
+
+@pytest.mark.parametrize('saved', ['sharded'], indirect=True)
+def test_rebuild_indexes_a_journalist_filed_under_two_names_once(engine, saved, record):
+    open_engine, module, find = engine
+    saved.save('Us', 'Ann Smith', covering(record, 'ann', 'elections'))
+    saved.save('Uk', 'Ann B. Smith', dict(covering(record, 'ann', 'elections'), awards=[{'title': 'Prize'}]))
+    assert len(saved.store.find('Ann Smith') + saved.store.find('Ann B. Smith')) == 2
+
+    index = open_engine()
+    assert module.rebuild(index, saved.store, saved.index)['journalists'] == 1
+    assert find(index, 'elections') == ['ann']
+
+
+@pytest.mark.parametrize('saved', BACKENDS, indirect=True)
+def test_update_follows_an_edit_a_deletion_and_a_new_journalist(engine, saved, record):
+    open_engine, module, find = engine
+    for slug, topic in [('ann', 'floods'), ('bob', 'floods'), ('cat', 'courts')]:
+        saved.save('Us', slug.title(), covering(record, slug, topic))
+    index = open_engine()
+    module.rebuild(index, saved.store, saved.index)
+
+    saved.save('Us', 'Ann', covering(record, 'ann', 'elections'))
+    saved.remove('Us', 'Bob')
+    saved.save('Uk', 'Dan', covering(record, 'dan', 'floods'))
+    module.update(index, saved.store, saved.index)
+
+    assert index.seq() == feed_seq(saved.index)
+    fresh = open_engine('fresh.db')
+    module.rebuild(fresh, saved.store, saved.index)
+    for topic, expected in [('floods', ['dan']), ('elections', ['ann']), ('courts', ['cat'])]:
+        assert find(index, topic) == find(fresh, topic) == expected
+    # Nothing new in the feed: a second update changes nothing
+    assert module.update(index, saved.store, saved.index)['changed'] == 0
@@ -0,0 +1,38 @@
+"""pytest: record store imports"""
+from pathlib import Path
+
+from record_store import PackedStore, ShardedStore, TreeStore, import_packed, migrate_sharded
+
+
+def test_import_packed_keeps_the_fullest_copy_and_counts_duplicates(tmp_path: Path):
+    tree = TreeStore(tmp_path / 'datamuckrack')
+    tree.put('Pakistan', 'Ann', {'url': 'https://muckrack.com/ann', 'profile': {'name': 'Ann'},
+                                 'biography': 'Covers floods', 'scraped_at': '2024-01-01'})
+    tree.put('Us', 'Ann', {'url': 'https://muckrack.com/ann', 'profile': {'name': 'Ann'},
+                           'scraped_at': '2025-01-01'})
+    tree.put('Us', 'Bob', {'url': 'https://muckrack.com/bob', 'profile': {'name': 'Bob'}})
+    packed = PackedStore(tmp_path / 'records.db')
+
+    assert import_packed(tree, packed) == {'records': 3, 'journalists': 2, 'duplicates': 1}
+    assert packed.get('ann')['biography'] == 'Covers floods'
+    assert packed.get('bob') is not None
+    packed.close()
+
+
+def test_sharded_catalog_rule_is_the_same_for_put_put_many_and_migrate(tmp_path: Path):
+    ann = {'url': 'https://muckrack.com/ann', 'profile': {'name': 'Ann'}}
+    tree = TreeStore(tmp_path / 'datamuckrack')
+    tree.put('Pakistan', 'Ann', dict(ann, biography='Covers floods'))
+    tree.put('Us', 'Ann', ann)
+    sharded = ShardedStore(tmp_path / 'records')
+
+    stats = migrate_sharded(tree, sharded)
+    assert (stats['journalists'], stats['duplicates']) == (1, 1)
+    assert sharded.find('ann') == [('Pakistan', 'ann'), ('Us', 'ann')]
+    assert sharded.get('ann')['biography'] == 'Covers floods'
+
+    # A name equal to the journalist_id adds no catalog entry, one record or many
+    sharded.put('Uk', 'ann', ann)
+    sharded.put_many([('Uk', 'ann', ann)])
+    assert sharded.conn.execute('SELECT COUNT(*) FROM catalog').fetchone()[0] == 2
+    sharded.close()
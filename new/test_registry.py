@@ -0,0 +1,55 @@
+"""pytest: registry dedupe merges copies of one journalist and saves before it deletes"""
+from pathlib import Path
+
+import pytest
+
+from registry import JournalistRegistry, dedupe
+
+
+@pytest.fixture
+def saved_twice(saved, tmp_path: Path):
+    """Ann under Pakistan with profile and bio, and under Us with a newer portfolio only"""
+    url = 'https://muckrack.com/ann'
+    saved.save('Pakistan', 'Ann', {'name': 'Ann', 'url': url, 'profile': {'name': 'Ann'},
+                                   'biography': 'Covers floods', 'scraped_at': '2024-01-01'})
+    saved.save('Us', 'Ann', {'name': 'Ann', 'url': url, 'portfolio': [{'title': 'Floods'}], 'scraped_at': '2024-06-01'})
+    saved.save('Us', 'Bob', {'name': 'Bob', 'url': 'https://muckrack.com/bob'})
+    registry = JournalistRegistry(tmp_path / 'scrape_state.db')
+    yield saved.data_dir, saved.store, saved.index, registry
+    registry.close()
+
+
+def test_dry_run_reports_without_touching_the_store(saved_twice):
+    data_dir, store, index, registry = saved_twice
+    before = sorted(p.relative_to(data_dir) for p in data_dir.rglob('*.json'))
+
+    stats = dedupe(store, index, registry, dry_run=True)
+
+    assert (stats['journalists'], stats['merged'], stats['removed']) == (2, 1, 1)
+    assert stats['bytes'] > 0
+    assert sorted(p.relative_to(data_dir) for p in data_dir.rglob('*.json')) == before
+
+
+def test_dedupe_keeps_the_fullest_copy_and_fills_it_from_the_others(saved_twice):
+    data_dir, store, index, registry = saved_twice
+
+    stats = dedupe(store, index, registry)
+
+    assert (stats['merged'], stats['removed']) == (1, 1)
+    assert store.load('Us', 'Ann') is None
+    kept = store.load('Pakistan', 'Ann')
+    assert kept['biography'] == 'Covers floods' and kept['portfolio'] == [{'title': 'Floods'}]
+    assert kept['locations'] == ['Pakistan', 'Us']
+    assert index.get('ann')['path'] == 'Pakistan/Ann/Ann.json'
+
+
+def test_an_interrupted_dedupe_has_already_saved_the_merged_record(saved_twice, monkeypatch):
+    data_dir, store, index, registry = saved_twice
+
+    def interrupted(location, name):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(store, 'delete', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        dedupe(store, index, registry)
+
+    assert store.load('Pakistan', 'Ann')['portfolio'] == [{'title': 'Floods'}]
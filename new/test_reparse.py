@@ -0,0 +1,37 @@
+"""pytest: reparse writes through the configured store and keeps the index in step with it"""
+from pathlib import Path
+
+import pytest
+
+from reparse import reparse, scan_pages_dir
+from record_store import shard_key
+
+BIO_PAGE = ('<html><body><div class="profile-section profile-bio"><div class="mr-card-content">'
+            '<p>Covers floods and the monsoon.</p></div></div></body></html>')
+
+
+@pytest.mark.parametrize('saved', ['tree', 'packed', 'sharded'], indirect=True)
+def test_reparse_merges_into_the_stored_record_under_its_store_key(tmp_path: Path, saved):
+    store, index, backend = saved.store, saved.index, saved.store.backend
+    saved.save('Pakistan', 'Ann Smith', {'name': 'Ann Smith', 'url': 'https://muckrack.com/ann',
+                                         'profile': {'name': 'Ann Smith'}})
+    pages_dir = tmp_path / 'pages'
+    pages_dir.mkdir()
+    (pages_dir / 'bio_ann.html').write_text(BIO_PAGE, encoding='utf-8')
+
+    stats = reparse(scan_pages_dir(pages_dir), index, store, workers=1)
+
+    assert (stats['journalists'], stats['unresolved']) == (1, 0)
+    data = store.get('ann') if backend != 'tree' else store.load('Pakistan', 'Ann Smith')
+    assert data['biography'] == 'Covers floods and the monsoon.'
+    assert data['profile'] == {'name': 'Ann Smith'}
+    key = shard_key('ann') if backend == 'sharded' else 'Pakistan/Ann Smith/Ann Smith.json'
+    assert index.get('ann')['path'] == key
+    assert index.content_hashes(['ann'])['ann'][1] == data['content_hash']
+    if backend != 'tree':
+        assert not (tmp_path / 'datamuckrack').exists()
+
+    # Unchanged on a second pass: nothing rewritten, nothing new in the change feed
+    seq = index.conn.execute('SELECT MAX(seq) FROM changes').fetchone()[0]
+    assert reparse(scan_pages_dir(pages_dir), index, store, workers=1)['unchanged'] == 1
+    assert index.conn.execute('SELECT MAX(seq) FROM changes').fetchone()[0] == seq
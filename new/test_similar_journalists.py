@@ -0,0 +1,44 @@
+"""pytest: MinHash signatures, exact top-k scoring and LSH bucket upkeep"""
+from pathlib import Path
+
+from similar_journalists import BANDS, SimilarityIndex, jaccard, record_features, signature
+
+
+def test_signature_agreement_estimates_jaccard():
+    a = {f'beat:{i}' for i in range(40)}
+    b = {f'beat:{i}' for i in range(20, 60)}
+    agree = sum(x == y for x, y in zip(signature(a), signature(b))) / 64
+    assert abs(agree - jaccard(a, b)) < 0.2
+    assert signature(a) == signature(set(sorted(a)))
+
+
+def test_similar_returns_exact_jaccard_best_first(tmp_path: Path, record):
+    records = [('ann', record('ann', ['elections', 'courts'], ['washpost', 'nytimes'])),
+               ('bob', record('bob', ['elections', 'courts'], ['washpost', 'nytimes'])),
+               ('cat', record('cat', ['elections', 'courts'], ['washpost'])),
+               ('dan', record('dan', ['sport'], ['espn'])),
+               ('eve', {'profile': {}})]
+    similar = SimilarityIndex(tmp_path / 'similar.db')
+    assert similar.rebuild(records)['journalists'] == 4
+    features = dict((jid, record_features(data)) for jid, data in records)
+    assert similar.similar('ann', 2) == [('bob', 1.0), ('cat', jaccard(features['ann'], features['cat']))]
+    assert similar.similar('eve') is None
+    similar.close()
+
+
+def test_apply_keeps_one_bucket_per_band_and_drops_stale_features(tmp_path: Path, record):
+    similar = SimilarityIndex(tmp_path / 'similar.db')
+    similar.rebuild([('ann', record('ann', ['elections'], ['washpost'])),
+                     ('bob', record('bob', ['elections'], ['washpost'])),
+                     ('cat', record('cat', ['sport'], ['espn']))])
+    similar.similar('ann')  # fills the feature cache the update has to invalidate
+    similar.apply({'bob': record('bob', ['sport'], ['espn']), 'cat': None,
+                   'dan': record('dan', ['elections'], ['washpost'])}, 4)
+
+    assert similar.seq() == 4
+    assert similar.similar('ann') == [('dan', 1.0)]
+    assert similar.similar('bob') == []
+    assert similar.similar('cat') is None
+    # 3 journalists, one bucket per band each
+    assert similar.conn.execute('SELECT COUNT(*) FROM sim_buckets').fetchone()[0] == 3 * BANDS
+    similar.close()
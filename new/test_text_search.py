@@ -0,0 +1,31 @@
+"""pytest: BM25 field weights, FTS5 query errors and the opt-in ranking cap"""
+from pathlib import Path
+
+import pytest
+
+from text_search import TextSearch
+
+
+def ids(search, query, **kwargs):
+    return [jid for jid, _, _ in search.search(query, **kwargs)[0]]
+
+
+def test_field_weights_rank_a_title_hit_above_a_biography_hit(tmp_path: Path, record):
+    search = TextSearch(tmp_path / 'text_search.db')
+    search.rebuild([('bio', record('bio', bio='Writes about elections and more')),
+                    ('title', record('title', bio='Writes about more', titles=['Elections in Sindh']))])
+    assert ids(search, 'election') == ['title', 'bio']
+    assert ids(search, 'titles:elections') == ['title']
+    with pytest.raises(ValueError):
+        search.search('"unterminated')
+    search.close()
+
+
+def test_cap_ranks_only_the_first_matches_and_says_so(tmp_path: Path, record):
+    search = TextSearch(tmp_path / 'text_search.db')
+    search.rebuild([(f'p{i}', record(f'p{i}', bio='floods ' * (i + 1))) for i in range(5)])
+    hits, capped = search.search('floods')
+    assert (len(hits), capped) == (5, False)
+    hits, capped = search.search('floods', cap=2)
+    assert capped and {jid for jid, _, _ in hits} == {'p0', 'p1'}
+    search.close()
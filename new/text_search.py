@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Full-text search over portfolio titles, intros and biographies (SQLite FTS5, BM25).
+
+One FTS5 row per journalist with a column per field; ``bm25()`` ranks with
+per-column weights so a hit in a portfolio title counts more than one in the
+intro, and the intro more than the biography:
+
+    name 4.0  titles 3.0  intro 2.0  bio 1.0  descriptions 0.5
+
+Text is tokenized by ``unicode61`` with Porter stemming ("elections" matches
+"election"). The query language is FTS5's own: words are ANDed, and
+``OR``, ``NOT``, "exact phrases", ``prefix*`` and ``titles:word`` work too.
+
+    python3 text_search.py rebuild
+    python3 text_search.py update                 # apply the change feed
+    python3 text_search.py search 'climate "border security"' [--head 10] [--cap 15000]
+"""
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from scrape_index import ScrapeIndex
+
+BASE_DIR = Path(__file__).parent.parent
+SEARCH_DB = BASE_DIR / 'muckrack' / 'text_search.db'
+
+# FTS column -> BM25 weight; order matches the table definition
+FIELD_WEIGHTS = {'name': 4.0, 'titles': 3.0, 'intro': 2.0, 'bio': 1.0, 'descriptions': 0.5}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS search_docs (
+    doc INTEGER PRIMARY KEY,
+    journalist_id TEXT NOT NULL UNIQUE
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(
+    {', '.join(FIELD_WEIGHTS)}, tokenize = 'porter unicode61', prefix = '2 3'
+);
+CREATE TABLE IF NOT EXISTS search_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+RANK = f"bm25(search, {', '.join(str(w) for w in FIELD_WEIGHTS.values())})"
+MAX_ROWID = 2 ** 63 - 1
+
+
+def _text(value) -> str:
+    return value.strip() if isinstance(value, str) else ''
+
+
+def record_fields(data: Dict) -> Tuple[str, ...]:
+    """Column values for one record, in FIELD_WEIGHTS order"""
+    profile = data.get('profile') if isinstance(data.get('profile'), dict) else {}
+    portfolio = [item for item in data.get('portfolio') or [] if isinstance(item, dict)]
+    return (_text(profile.get('name') or data.get('name')),
+            '\n'.join(_text(item.get('title')) for item in portfolio),
+            _text(profile.get('intro')),
+            _text(data.get('biography')),
+            '\n'.join(_text(item.get('description')) for item in portfolio))
+
+
+class TextSearch:
+    """FTS5 index keyed by a doc number per journalist_id, in its own SQLite file"""
+
+    def __init__(self, db_path: Path = SEARCH_DB):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def rebuild(self, records: Iterable[Tuple[str, Dict]], seq: int = 0, chunk: int = 1000) -> Dict:
+        """Replace the index with ``(journalist_id, data)`` records, streamed in chunks"""
+        start = time.perf_counter()
+        count = 0
+        with self.conn:
+            self.conn.execute('DELETE FROM search_docs')
+            self.conn.execute('DELETE FROM search')
+            rows = []
+            for doc, (journalist_id, data) in enumerate(records):
+                rows.append((doc, journalist_id, record_fields(data)))
+                if len(rows) >= chunk:
+                    self._insert(rows)
+                    count += len(rows)
+                    rows = []
+            self._insert(rows)
+            count += len(rows)
+            self._set_seq(seq)
+        # Merge the b-tree segments written chunk by chunk
+        self.conn.execute("INSERT INTO search(search) VALUES ('optimize')")
+        self.conn.commit()
+        return {'journalists': count, 'seconds': time.perf_counter() - start}
+
+    def _insert(self, rows: List[Tuple[int, str, Tuple[str, ...]]]):
+        self.conn.executemany('INSERT INTO search_docs VALUES (?, ?)', ((doc, jid) for doc, jid, _ in rows))
+        self.conn.executemany(f'INSERT INTO search (rowid, {", ".join(FIELD_WEIGHTS)}) VALUES '
+                              f'(?, {", ".join("?" * len(FIELD_WEIGHTS))})',
+                              ((doc, *fields) for doc, _, fields in rows))
+
+    def apply(self, changed: Dict[str, Optional[Dict]], seq: int) -> int:
+        """Re-index changed journalists (``None`` = removed) and record the feed position"""
+        with self.conn:
+            for journalist_id, data in changed.items():
+                row = self.conn.execute('SELECT doc FROM search_docs WHERE journalist_id = ?',
+                                        (journalist_id,)).fetchone()
+                if row:
+                    self.conn.execute('DELETE FROM search WHERE rowid = ?', row)
+                    if data is None:
+                        self.conn.execute('DELETE FROM search_docs WHERE doc = ?', row)
+                        continue
+                    doc = row[0]
+                elif data is None:
+                    continue
+                else:
+                    doc = self.conn.execute('INSERT INTO search_docs (journalist_id) VALUES (?)',
+                                            (journalist_id,)).lastrowid
+                self.conn.execute(f'INSERT INTO search (rowid, {", ".join(FIELD_WEIGHTS)}) VALUES '
+                                  f'(?, {", ".join("?" * len(FIELD_WEIGHTS))})', (doc, *record_fields(data)))
+            self._set_seq(seq)
+        return len(changed)
+
+    def seq(self) -> int:
+        row = self.conn.execute("SELECT value FROM search_meta WHERE key = 'seq'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _set_seq(self, seq: int):
+        self.conn.execute("INSERT OR REPLACE INTO search_meta VALUES ('seq', ?)", (str(seq),))
+
+    def search(self, query: str, limit: int = 20,
+               cap: Optional[int] = None) -> Tuple[List[Tuple[str, float, str]], bool]:
+        """([(journalist_id, score, snippet)] best first, whether ranking was capped)
+
+        Lower BM25 scores rank higher, so they are negated. Every match is
+        ranked; BM25 costs ~2µs per matching journalist. With ``cap``, a query
+        matching more journalists than that ranks only its first ``cap``
+        matches in doc order (arbitrary, but bounded), for latency-bound callers.
+        """
+        try:
+            bound = None
+            if cap is not None:
+                bound = self.conn.execute('SELECT rowid FROM search WHERE search MATCH ? ORDER BY rowid '
+                                          'LIMIT 1 OFFSET ?', (query, cap)).fetchone()
+            ranked = self.conn.execute(
+                f'SELECT rowid, {RANK} FROM search WHERE search MATCH ? AND rowid < ? ORDER BY 2 LIMIT ?',
+                (query, bound[0] if bound else MAX_ROWID, limit)).fetchall()
+            # bm25() first scans every match of each phrase for its IDF, so snippets are fetched
+            # per kept row without it; FTS5 seeks straight to a rowid it is given
+            hits = []
+            for doc, score in ranked:
+                row = self.conn.execute(
+                    "SELECT d.journalist_id, snippet(search, -1, '[', ']', '…', 12) FROM search "
+                    "JOIN search_docs d ON d.doc = search.rowid WHERE search MATCH ? AND search.rowid = ?",
+                    (query, doc)).fetchone()
+                if row:
+                    hits.append((row[0], -score, row[1]))
+        except sqlite3.OperationalError as e:
+            raise ValueError(f'Bad search query {query!r}: {e}') from None
+        return hits, bound is not None
+
+    def close(self):
+        self.conn.close()
+
+
+def rebuild(search: TextSearch, store, index: ScrapeIndex) -> Dict:
+    """Re-index every journalist in ``store`` once; changes logged meanwhile are re-applied by the next update"""
+    from record_lookup import feed_seq, iter_journalists
+
+    return search.rebuild(iter_journalists(store, index), feed_seq(index))
+
+
+def update(search: TextSearch, store, index: ScrapeIndex, batch: int = 5000) -> Dict:
+    """Apply the change feed since the last applied sequence number"""
+    from record_lookup import changed_records
+
+    stats = {'changes': 0, 'changed': 0}
+    for seq, entries, changed in changed_records(index, store, search.seq(), batch):
+        stats['changed'] += search.apply(changed, seq)
+        stats['changes'] += entries
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Full-text search over journalist records')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('rebuild', help='Index every saved record')
+    sub.add_parser('update', help='Apply the scrape-state change feed')
+    run_search = sub.add_parser('search', help='Best-matching journalists for an FTS5 query')
+    run_search.add_argument('query')
+    run_search.add_argument('--head', type=int, default=10)
+    run_search.add_argument('--cap', type=int, help='Rank only the first N matches (faster, approximate)')
+    args = parser.parse_args()
+
+    search = TextSearch()
+    try:
+        if args.command == 'search':
+            start = time.perf_counter()
+            try:
+                hits, capped = search.search(args.query, args.head, args.cap)
+            except ValueError as e:
+                raise SystemExit(f"❌ {e}")
+            print(f"🔍 {len(hits)} results in {(time.perf_counter() - start) * 1000:.1f} ms")
+            if capped:
+                print(f"⚠️  Ranked the first {args.cap:,} matches only; drop --cap for the full ranking")
+            for journalist_id, score, snippet in hits:
+                print(f"{score:7.2f}  https://muckrack.com/{journalist_id}")
+                print(f"         {' '.join(snippet.split())}")
+            return
+        from record_store import open_store
+
+        index = ScrapeIndex()
+        store = open_store(index=index)
+        try:
+            index.ensure_built(store)
+            result = rebuild(search, store, index) if args.command == 'rebuild' else update(search, store, index)
+        finally:
+            store.close()
+            index.close()
+        if args.command == 'rebuild':
+            print(f"🗂️  {result['journalists']:,} journalists indexed in {result['seconds']:.1f}s")
+        else:
+            print(f"🔄 {result['changes']:,} changes -> {result['changed']:,} journalists re-indexed")
+    finally:
+        search.close()
+
+
+if __name__ == '__main__':
+    main()